@@ -4,12 +4,18 @@ from fastapi.responses import FileResponse, JSONResponse
 from typing import Optional, List
 from pathlib import Path
 from datetime import datetime, timedelta
+import hashlib
 import os
 import logging
 
 from app.config import settings
 from app.models.schemas import MapInfo, MapListResponse, UpdateResponse, GFSRun, GFSRunListResponse, ModelInfo, ModelListResponse
 from app.services.map_generator import MapGenerator
+from app.services.map_manifest import MapManifest, get_map_manifest, parse_map_filename
+from app.services.response_cache import get_map_listing_cache
+from app.services.tile_renderer import get_tile_renderer
+from app.services.field_export import get_field_exporter
+from app.services.point_cube import get_point_cube
 from app.models.model_registry import ModelRegistry
 
 router = APIRouter()
@@ -125,7 +131,9 @@ async def get_maps(
     model: Optional[str] = Query(None, description="Filter by model (e.g., 'GFS', 'AIGFS')"),
     variable: Optional[str] = Query(None, description="Filter by variable"),
     forecast_hour: Optional[int] = Query(None, description="Filter by forecast hour"),
-    run_time: Optional[str] = Query(None, description="Filter by run time (ISO format: 2026-01-24T00:00:00Z)")
+    run_time: Optional[str] = Query(None, description="Filter by run time (ISO format: 2026-01-24T00:00:00Z)"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
 ):
     """
     Get list of available maps.
@@ -133,6 +141,10 @@ async def get_maps(
     Supports filtering by model, variable, forecast_hour, and run_time.
     If run_time is provided, only maps from that specific model run are returned.
     If no model specified, returns maps from all enabled models.
+    
+    The common request (one model's whole run) is served from the published,
+    pre-compressed listing with a strong ETag; other filters are queried
+    from the manifest.
     """
     # Validate model if provided
     if model:
@@ -151,10 +163,7 @@ async def get_maps(
     # Cache for configured duration - maps list changes as new maps are generated
     response.headers["Cache-Control"] = f"public, max-age={settings.cache_maps_list_seconds}"
     
-    images_path = Path(settings.storage_path)
-    
-    if not images_path.exists():
-        return MapListResponse(maps=[])
+    manifest = get_map_manifest()
     
     # Convert ISO run_time to filename format if provided
     run_time_filter = None
@@ -167,70 +176,47 @@ async def get_maps(
     else:
         # If no run_time specified, default to latest run FOR THE REQUESTED MODEL
         # This prevents cross-model run time conflicts (e.g., HRRR 19Z vs GFS 12Z)
-        all_runs_by_model = {}  # {model: [run_times]}
-        
-        for image_file in images_path.glob("*.png"):
-            try:
-                parts = image_file.stem.split("_")
-                if len(parts) >= 3:
-                    file_model = parts[0].upper()
-                    file_run_time = f"{parts[1]}_{parts[2]}"
-                    
-                    if file_model not in all_runs_by_model:
-                        all_runs_by_model[file_model] = set()
-                    all_runs_by_model[file_model].add(file_run_time)
-            except (ValueError, IndexError):
-                continue
-        
-        # Select latest run for the requested model (or first available model if no filter)
-        target_model = model.upper() if model else None
-        
-        if target_model and target_model in all_runs_by_model:
-            # Get latest run for this specific model
-            sorted_runs = sorted(all_runs_by_model[target_model], reverse=True)
-            run_time_filter = sorted_runs[0]
-            logger.debug(f"No run_time specified, defaulting to latest {target_model} run: {run_time_filter}")
-        elif not target_model and all_runs_by_model:
-            # No model filter - use the globally latest run
-            all_runs = set()
-            for runs in all_runs_by_model.values():
-                all_runs.update(runs)
-            sorted_runs = sorted(all_runs, reverse=True)
-            run_time_filter = sorted_runs[0]
-            logger.debug(f"No run_time or model specified, defaulting to globally latest run: {run_time_filter}")
-    
-    maps = []
-    for image_file in images_path.glob("*.png"):
-        # Parse map info from filename
-        # Format: {model}_{run_time}_{variable}_{forecast_hour}.png
-        try:
-            parts = image_file.stem.split("_")
-            if len(parts) >= 4:
-                file_run_time = f"{parts[1]}_{parts[2]}"
-                
-                map_info = MapInfo(
-                    id=image_file.stem,
-                    model=parts[0].upper(),
-                    run_time=file_run_time,
-                    forecast_hour=int(parts[-1]),
-                    variable="_".join(parts[3:-1]),
-                    image_url=f"/images/{image_file.name}",  # Static files mounted at root /images, not under /api
-                    created_at=datetime.fromtimestamp(image_file.stat().st_mtime).isoformat()
-                )
-                
-                # Apply filters
-                if model and map_info.model.upper() != model.upper():
-                    continue
-                if variable and map_info.variable != variable:
-                    continue
-                if forecast_hour is not None and map_info.forecast_hour != forecast_hour:
-                    continue
-                if run_time_filter and file_run_time != run_time_filter:
-                    continue
-                
-                maps.append(map_info)
-        except (ValueError, IndexError):
-            continue
+        run_time_filter = manifest.latest_run(model)
+        if run_time_filter is None:
+            return MapListResponse(maps=[])
+        logger.debug(f"No run_time specified, defaulting to latest {model or 'global'} run: {run_time_filter}")
+    
+    if model and variable is None and forecast_hour is None:
+        published = get_map_listing_cache().get(model, run_time_filter, accept_encoding or "")
+        if published is None:
+            return MapListResponse(maps=[])
+        body_path, meta, encoding = published
+        etag = f'"{meta["etag"]}-{encoding}"' if encoding else f'"{meta["etag"]}"'
+        headers = {
+            "Cache-Control": response.headers["Cache-Control"],
+            "Vary": "Accept-Encoding",
+        }
+        if settings.enable_etag:
+            headers["ETag"] = etag
+            client_tags = {tag.strip() for tag in (if_none_match or "").split(",")}
+            if etag in client_tags or "*" in client_tags:
+                return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return FileResponse(path=str(body_path), media_type="application/json", headers=headers)
+    
+    maps = [
+        MapInfo(
+            id=row['id'],
+            model=row['model'],
+            run_time=row['run_time'],
+            forecast_hour=row['forecast_hour'],
+            variable=row['variable'],
+            image_url=f"/images/{row['filename']}",  # Static files mounted at root /images, not under /api
+            created_at=MapManifest.created_at(row)
+        )
+        for row in manifest.query(
+            model=model,
+            run_time=run_time_filter,
+            variable=variable,
+            forecast_hour=forecast_hour
+        )
+    ]
     
     return MapListResponse(maps=maps)
 
@@ -238,7 +224,8 @@ async def get_maps(
 @router.get("/runs", response_model=GFSRunListResponse)
 async def get_runs(
     response: Response,
-    model: Optional[str] = Query("GFS", description="Filter by model (default: GFS)")
+    model: Optional[str] = Query("GFS", description="Filter by model (default: GFS)"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get list of available GFS model runs.
@@ -249,36 +236,15 @@ async def get_runs(
     # Cache for configured duration - runs list changes as new runs are generated
     response.headers["Cache-Control"] = f"public, max-age={settings.cache_runs_list_seconds}"
     
-    images_path = Path(settings.storage_path)
-    
-    if not images_path.exists():
-        return GFSRunListResponse(runs=[], total_runs=0)
-    
-    # Parse all image filenames to extract unique run times
-    image_files = list(images_path.glob(f"{model.lower()}_*.png"))
+    # Runs with map counts, newest first, straight from the manifest index
+    run_data = {
+        row['run_time']: {'count': row['count'], 'latest_mtime': row['latest_mtime']}
+        for row in get_map_manifest().runs(model)
+    }
     
-    if not image_files:
+    if not run_data:
         return GFSRunListResponse(runs=[], total_runs=0)
     
-    # Extract unique run times and count maps per run
-    run_data = {}  # {run_time_str: {'count': int, 'latest_mtime': float}}
-    
-    for img in image_files:
-        try:
-            parts = img.stem.split('_')
-            if len(parts) >= 3:
-                run_time_str = f"{parts[1]}_{parts[2]}"  # e.g., "20260124_00"
-                
-                if run_time_str not in run_data:
-                    run_data[run_time_str] = {'count': 0, 'latest_mtime': 0}
-                
-                run_data[run_time_str]['count'] += 1
-                mtime = img.stat().st_mtime
-                if mtime > run_data[run_time_str]['latest_mtime']:
-                    run_data[run_time_str]['latest_mtime'] = mtime
-        except Exception:
-            continue
-    
     # Sort run times (newest first) and convert to GFSRun objects
     sorted_runs = sorted(run_data.keys(), reverse=True)
     
@@ -309,37 +275,151 @@ async def get_runs(
             logger.warning(f"Failed to parse run {run_time_str}: {e}")
             continue
     
-    return GFSRunListResponse(runs=runs, total_runs=len(runs))
+    # age_hours moves with the clock, so this body is built per request (from
+    # the manifest, which is cheap) and only revalidated by ETag
+    body = GFSRunListResponse(runs=runs, total_runs=len(runs)).model_dump_json().encode()
+    headers = {"Cache-Control": response.headers["Cache-Control"]}
+    if settings.enable_etag:
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        headers["ETag"] = etag
+        if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/maps/{map_id}", response_model=MapInfo)
 async def get_map(map_id: str):
     """Get specific map metadata"""
-    images_path = Path(settings.storage_path)
-    image_file = images_path / f"{map_id}.png"
+    manifest = get_map_manifest()
+    row = manifest.get(map_id)
     
+    if row is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    
+    image_file = Path(settings.storage_path) / row['filename']
     if not image_file.exists():
+        # Deleted outside the scheduler; drop the stale entry
+        manifest.remove(map_id)
         raise HTTPException(status_code=404, detail="Map not found")
     
-    # Parse map info from filename
-    try:
-        parts = map_id.split("_")
-        if len(parts) >= 4:
-            stat = image_file.stat()
-            return MapInfo(
-                id=map_id,
-                model=parts[0].upper(),
-                run_time=f"{parts[1]}_{parts[2]}",
-                forecast_hour=int(parts[-1]),
-                variable="_".join(parts[3:-1]),
-                image_url=f"/images/{image_file.name}",  # Static files mounted at root /images, not under /api
-                created_at=datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                file_size=stat.st_size
-            )
-    except (ValueError, IndexError):
-        pass
+    return MapInfo(
+        id=map_id,
+        model=row['model'],
+        run_time=row['run_time'],
+        forecast_hour=row['forecast_hour'],
+        variable=row['variable'],
+        image_url=f"/images/{row['filename']}",  # Static files mounted at root /images, not under /api
+        created_at=MapManifest.created_at(row),
+        file_size=row['file_size']
+    )
+
+
+@router.get("/maps/{map_id}/tiles")
+async def get_map_tiles(map_id: str):
+    """
+    TileJSON for a map's XYZ tile pyramid (tile_output mode).
     
-    raise HTTPException(status_code=404, detail="Invalid map ID format")
+    Returns the data-layer URL template plus the shared basemap and border
+    overlay templates; clients stack basemap, data, overlay.
+    """
+    info = parse_map_filename(map_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    
+    tilejson = get_tile_renderer().tilejson(
+        info['model'], info['run_time'], info['variable'], info['forecast_hour']
+    )
+    if tilejson is None:
+        raise HTTPException(status_code=404, detail="No tiles for this map")
+    return JSONResponse(tilejson, headers={"Cache-Control": "public, max-age=300"})
+
+
+@router.get("/fields/{model}/{run_time}/{forecast_hour}")
+async def get_field_index(model: str, run_time: str, forecast_hour: int):
+    """
+    Quantised fields exported for one forecast hour (field_export mode).
+    
+    Each entry gives dtype, scale/offset (value = offset + scale * q),
+    nodata, grid (lat0/dlat/lon0/dlon, rows south to north) and the URL of
+    the raw array.
+    """
+    index = get_field_exporter().index(model, run_time, forecast_hour)
+    if index is None:
+        raise HTTPException(status_code=404, detail="No exported fields for this hour")
+    for field, meta in index.items():
+        meta['url'] = f"{settings.api_prefix}/fields/{model.lower()}/{run_time}/{forecast_hour}/{field}"
+    return JSONResponse(index, headers={"Cache-Control": f"public, max-age={settings.cache_maps_list_seconds}"})
+
+
+@router.get("/fields/{model}/{run_time}/{forecast_hour}/{field}")
+async def get_field(
+    model: str,
+    run_time: str,
+    forecast_hour: int,
+    field: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """Raw quantised array of one field (gzip-encoded when the client accepts it)."""
+    exporter = get_field_exporter()
+    meta = (exporter.index(model, run_time, forecast_hour) or {}).get(field)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Field not found")
+    
+    accepted = {token.split(";")[0].strip().lower() for token in (accept_encoding or "").split(",")}
+    encoding = 'gzip' if 'gzip' in accepted else None
+    path = exporter.field_path(model, run_time, forecast_hour, field, encoding)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Field not found")
+    
+    etag = f'"{meta["etag"]}-{encoding}"' if encoding else f'"{meta["etag"]}"'
+    headers = {
+        "Cache-Control": f"public, max-age={settings.cache_maps_list_seconds}",
+        "Vary": "Accept-Encoding",
+        "X-Field-Dtype": meta['dtype'],
+        "X-Field-Shape": f"{meta['shape'][0]},{meta['shape'][1]}",
+    }
+    if settings.enable_etag:
+        headers["ETag"] = etag
+        client_tags = {tag.strip() for tag in (if_none_match or "").split(",")}
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(path=str(path), media_type="application/octet-stream", headers=headers)
+
+
+@router.get("/point")
+async def get_point_forecast(
+    model: str = Query(..., description="Model ID (e.g. GFS, HRRR)"),
+    run_time: Optional[str] = Query(None, description="Run (YYYYMMDD_HH); latest with a point cube if omitted"),
+    station: Optional[str] = Query(None, description="Catalog station ID"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180)
+):
+    """
+    Meteogram for a station or the nearest sampled point to lat/lon.
+    
+    Served from the run's pre-sampled point cube; no GRIB data is read.
+    Values are in the stored units listed per field; hours not generated
+    yet are omitted.
+    """
+    cube = get_point_cube()
+    run_time = run_time or cube.latest_run(model)
+    if run_time is None:
+        raise HTTPException(status_code=404, detail=f"No point data for model {model}")
+    try:
+        result = cube.series(model, run_time, station_id=station, lat=lat, lon=lon)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Run or station not found")
+    
+    run_dt = parse_run_time_from_filename(run_time)
+    result['valid_times'] = [
+        (run_dt + timedelta(hours=fh)).strftime("%Y-%m-%dT%H:%M:%SZ") for fh in result['forecast_hours']
+    ]
+    return JSONResponse(result, headers={"Cache-Control": f"public, max-age={settings.cache_maps_list_seconds}"})
 
 
 @router.get("/images/{filename}")
@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     nomads_use_filter: bool = True  # Use NOMADS filter to download only needed variables/region
     nomads_timeout: int = 120  # Timeout in seconds for NOMADS downloads
     nomads_max_retries: int = 3  # Number of retries for failed downloads
+    nomads_max_connections_per_host: int = 4  # Concurrent downloads per host (shared keep-alive pool)
+    download_chunk_bytes: int = 1024 * 1024  # Streaming chunk / write buffer size for GRIB downloads
+    availability_listing: bool = True  # Poll availability with one S3/NOMADS listing per run instead of per-hour probes
+    adaptive_polling: bool = True  # Time availability polls from learned per-model publish latency
+    poll_min_seconds: int = 10  # Poll interval once the next hour is due
+    poll_max_seconds: int = 600  # Longest sleep between polls while waiting for a due hour
     
     # Storage
     storage_path: str = "/opt/twf_models/backend/app/static/images"  # Absolute path for production
@@ -44,6 +50,9 @@ class Settings(BaseSettings):
     # HRRR-specific: Hourly forecasts (short-range high-resolution model)
     hrrr_forecast_hours: str = "0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48"  # 1h increments to f48
     progressive_generation: bool = True  # Generate by forecast hour (f000 first) vs by variable
+    pipelined_generation: bool = True  # Workers prefetch the next forecast hour's data while rendering the current one
+    pipeline_chunk_hours: int = 3  # Max consecutive forecast hours handed to one pipelined worker
+    fingerprint_inputs: bool = True  # Re-render maps whose GRIB inputs changed (.idx byte ranges), not just missing ones
     
     # Map Generation
     map_width: int = 1920
@@ -54,6 +63,15 @@ class Settings(BaseSettings):
     map_region_bounds: Optional[dict] = None  # Will be set for PNW
     station_overlays: bool = True  # Show station values on maps
     station_priority: int = 2  # 1=major cities only, 2=+secondary, 3=all stations
+    station_index_disk_cache: bool = True  # Persist station -> grid index tables across restarts
+    tile_output: bool = False  # Also write each map's data layer as a Web-Mercator XYZ tile pyramid
+    tile_min_zoom: int = 4  # Lowest tile zoom level rendered
+    tile_max_zoom: int = 10  # Highest tile zoom level rendered
+    reproject_cache: bool = True  # Regrid fields into the map projection with cached (.npz) weights before contouring
+    reproject_step_px: int = 3  # Figure pixels between points of the regridded grid used for contour/streamplot
+    raster_renderer: bool = False  # Draw temp/precip/snowfall/radar data layers as a NumPy-classified raster instead of contourf
+    field_export: bool = False  # Also write quantised gridded fields per forecast hour for client-side rendering
+    point_cube: bool = True  # Sample stations per forecast hour into a per-run cube for the point forecast API
     
     # Logging
     log_level: str = "INFO"
@@ -83,6 +101,14 @@ class Settings(BaseSettings):
         """Parse HRRR-specific forecast hours string into list"""
         return [int(h.strip()) for h in self.hrrr_forecast_hours.split(",")]
     
+    def forecast_hours_for_model(self, model_id: str) -> List[int]:
+        """Forecast hours configured for a model (HRRR and AIGFS have their own lists)"""
+        if model_id.upper() == "HRRR":
+            return self.hrrr_forecast_hours_list
+        if model_id.upper() == "AIGFS":
+            return self.aigfs_forecast_hours_list
+        return self.forecast_hours_list
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins string into list"""
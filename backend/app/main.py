@@ -33,6 +33,11 @@ images_path = Path(settings.storage_path)
 images_path.mkdir(parents=True, exist_ok=True)
 app.mount("/images", StaticFiles(directory=str(images_path)), name="images")
 
+# Mount XYZ tile pyramids (tile_output mode)
+tiles_path = images_path.parent / "tiles"
+tiles_path.mkdir(parents=True, exist_ok=True)
+app.mount("/tiles", StaticFiles(directory=str(tiles_path)), name="tiles")
+
 
 @app.get("/")
 async def root():
@@ -7,8 +7,10 @@ import logging
 import time
 import s3fs
 import gc
+import itertools
+import queue
 import threading
-from multiprocessing import Pool
+from multiprocessing import Manager, Pool
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -24,7 +26,16 @@ if parent_dir not in sys.path:
 
 from app.config import settings
 from app.services.map_generator import MapGenerator
+from app.services.map_manifest import get_map_manifest
+from app.services.response_cache import get_map_listing_cache
+from app.services.run_ledger import get_run_ledger
+from app.services.tile_renderer import get_tile_renderer
+from app.services.field_export import get_field_exporter
+from app.services.point_cube import get_point_cube
+from app.services.availability import get_availability_probe
+from app.services.availability_watcher import AvailabilityWatcher
 from app.services.model_factory import ModelFactory
+from app.services.station_catalog import StationCatalog
 from app.models.model_registry import ModelRegistry
 from app.models.variable_requirements import VariableRegistry
 
@@ -97,6 +108,20 @@ def calculate_optimal_workers():
 
 _GLOBAL_POOL_SIZE = calculate_optimal_workers()
 
+# Worker processes are recycled after this many forecast hours. Pools are
+# long-lived (one per model run), so recycling is kept rare enough that
+# warm-up is not paid repeatedly, but still bounds matplotlib/cfgrib memory growth.
+_WORKER_MAX_TASKS_PER_CHILD = 20
+
+# An hour whose result has not come back this long after a worker started its
+# task (per hour of a pipelined chunk) is treated as lost: a worker killed
+# mid-task (e.g. by the OOM killer) fires neither pool callback. Tasks still
+# queued behind busy workers are not timed.
+_HOUR_RESULT_TIMEOUT_SECONDS = 20 * 60
+
+# Once the run is over, hours still rendering get at least this long to finish
+_IN_FLIGHT_GRACE_SECONDS = 5 * 60
+
 def allocate_workers_per_model(total_workers: int, enabled_models: dict) -> dict:
     """
     Allocate workers across models based on their characteristics.
@@ -159,14 +184,282 @@ def allocate_workers_per_model(total_workers: int, enabled_models: dict) -> dict
     
     return allocation
 
+def _init_worker():
+    """
+    Pool initializer: pay per-process warm-up once, before the first forecast hour.
+    
+    Builds the projected base-map geometry cache and loads the station
+    catalog so the first map rendered in each worker does not include
+    Natural Earth loading/projection or station JSON parsing.
+    """
+    MapGenerator().warm_base_map_cache(settings.map_region)
+    
+    if settings.station_overlays:
+        try:
+            StationCatalog.shared().get_table()
+        except Exception as e:
+            logger.warning(f"Could not pre-load station catalog: {e}")
+
+
+def _report_started(progress):
+    """
+    Tell the progressive loop that a worker has picked up a task, so the
+    task's result deadline counts from now rather than from submission.
+    
+    Args:
+        progress: () outside progressive runs, else (started queue, task id)
+    """
+    if not progress:
+        return
+    started_queue, task_id = progress
+    try:
+        started_queue.put((task_id, time.time()))
+    except Exception as e:
+        logger.warning(f"Could not report task {task_id} start: {e}")
+
+
+_F000_SKIP_VARS = ['wind_speed', 'precip', 'mslp_precip', 'radar', 'radar_reflectivity']
+
+
+def _expected_variables(variables, forecast_hour):
+    """Variables a forecast hour should have maps for (f000 has no accumulations/rates)"""
+    if forecast_hour == 0:
+        return [v for v in variables if v not in _F000_SKIP_VARS]
+    return list(variables)
+
+
+def _variables_for_hour(model_id, forecast_hour, variables, child_logger):
+    """Variables to render for one hour after model-capability and f000 filtering"""
+    model_config = ModelRegistry.get(model_id)
+    variables_to_generate = VariableRegistry.filter_by_model_capabilities(
+        variables,
+        model_config
+    )
+    
+    # Skip f000-specific exclusions
+    if forecast_hour == 0:
+        variables_to_generate = _expected_variables(variables_to_generate, forecast_hour)
+        child_logger.info(f"  ⊙ Skipping f000-unavailable vars: {_F000_SKIP_VARS}")
+    
+    return variables_to_generate
+
+
+def _build_hour_dataset(data_fetcher, run_time, forecast_hour, variables_to_generate, child_logger):
+    """
+    Fetch and fully decode the dataset for one forecast hour.
+    
+    Values are loaded eagerly so the decode cost is paid here (possibly on a
+    prefetch thread) rather than lazily inside the first render.
+    """
+    # **SINGLE CALL to build complete dataset with ALL derived fields**
+    # This is where ALL data fetching and derived field computation happens
+    child_logger.info(f"  📥 Building dataset for {len(variables_to_generate)} variables...")
+    ds = data_fetcher.build_dataset_for_maps(
+        run_time=run_time,
+        forecast_hour=forecast_hour,
+        variables=variables_to_generate,
+        subset_region=True
+    )
+    ds = ds.load()
+    child_logger.info(f"  ✓ Dataset ready with {len(ds.data_vars)} fields")
+    return ds
+
+
+def _style_fingerprints(variables):
+    """Current style fingerprint of each variable's map (cheap, no data access)"""
+    map_generator = MapGenerator()
+    return {var: map_generator.style_fingerprint(var) for var in variables}
+
+
+def _stale_variables(data_fetcher, map_generator, model_id, run_time, forecast_hour, variables, child_logger):
+    """
+    Work out which maps of one hour need rendering.
+    
+    A rendered map is kept while both fingerprints recorded with it still
+    match: its style (colour tables, map settings, render version) and its
+    GRIB inputs. Maps rendered before fingerprints were recorded, and inputs
+    the fetcher cannot fingerprint, fall back to "rendered once is done".
+    
+    Returns:
+        (variables to render, {variable: (input_fingerprint, style_fingerprint)})
+    """
+    run_str = run_time.strftime("%Y%m%d_%H")
+    done = get_run_ledger().done_fingerprints(model_id, run_str, forecast_hour)
+    
+    inputs = {}
+    if settings.fingerprint_inputs:
+        try:
+            inputs = data_fetcher.input_fingerprints(run_time, forecast_hour, variables)
+        except Exception as e:
+            child_logger.warning(f"  ⚠️  Could not fingerprint inputs: {e}")
+    
+    fingerprints = {}
+    stale = []
+    for var in variables:
+        style = map_generator.style_fingerprint(var)
+        fingerprints[var] = (inputs.get(var), style)
+        if var not in done:
+            stale.append(var)
+            continue
+        stored_input, stored_style = done[var]
+        if stored_style is not None and stored_style != style:
+            child_logger.info(f"  ↻ {var} style changed, re-rendering")
+            stale.append(var)
+        elif stored_input is not None and var in inputs and stored_input != inputs[var]:
+            child_logger.info(f"  ↻ {var} inputs changed, re-rendering")
+            stale.append(var)
+        else:
+            child_logger.info(f"  ⊙ {var} already exists, skipping")
+    return stale, fingerprints
+
+
+def _missing_hour_outputs(model_id, run_str, forecast_hour):
+    """
+    Enabled per-hour outputs besides the maps (field export, point cube) not
+    written yet for an hour. They carry no ledger fingerprint, so switching
+    one on mid-run is caught here instead.
+    """
+    missing = []
+    if settings.field_export and get_field_exporter().index(model_id, run_str, forecast_hour) is None:
+        missing.append('field export')
+    if settings.point_cube and not get_point_cube().has_hour(model_id, run_str, forecast_hour):
+        missing.append('point cube')
+    return missing
+
+
+def _write_hour_outputs(ds, model_id, run_time, forecast_hour, child_logger):
+    """Field export and point-cube sampling of a built hour (each non-fatal)"""
+    if settings.field_export:
+        try:
+            exported = get_field_exporter().export(ds, model_id, run_time.strftime("%Y%m%d_%H"), forecast_hour)
+            child_logger.info(f"  📦 Exported {len(exported)} quantised fields")
+        except Exception as e:
+            child_logger.warning(f"  ⚠️  Field export failed: {e}")
+    if settings.point_cube:
+        try:
+            sampled = get_point_cube().write_hour(ds, model_id, run_time.strftime("%Y%m%d_%H"), forecast_hour)
+            child_logger.info(f"  📍 Sampled {sampled} fields into point cube")
+        except Exception as e:
+            child_logger.warning(f"  ⚠️  Point cube update failed: {e}")
+
+
+def _prepare_hour(data_fetcher, map_generator, model_id, run_time, forecast_hour, variables, child_logger):
+    """
+    Plan and build one forecast hour.
+    
+    When every map is current but the field export or point cube is missing
+    for the hour, the dataset is still built for them and then released.
+    
+    Returns:
+        (dataset or None if every map is current, variables to render, fingerprints)
+    """
+    stale, fingerprints = _stale_variables(
+        data_fetcher, map_generator, model_id, run_time, forecast_hour, variables, child_logger
+    )
+    if not stale:
+        missing = _missing_hour_outputs(model_id, run_time.strftime("%Y%m%d_%H"), forecast_hour)
+        if missing:
+            child_logger.info(f"  ↻ Maps current, backfilling {', '.join(missing)}")
+            ds = _build_hour_dataset(data_fetcher, run_time, forecast_hour, variables, child_logger)
+            _write_hour_outputs(ds, model_id, run_time, forecast_hour, child_logger)
+            ds.close()
+        return None, stale, fingerprints
+    ds = _build_hour_dataset(data_fetcher, run_time, forecast_hour, stale, child_logger)
+    _write_hour_outputs(ds, model_id, run_time, forecast_hour, child_logger)
+    return ds, stale, fingerprints
+
+
+def _render_hour_maps(map_generator, ds, model_id, run_time, forecast_hour, variables_to_generate, child_logger,
+                      fingerprints=None):
+    """
+    Render maps for one forecast hour from a built dataset.
+    
+    Args:
+        variables_to_generate: Variables to render (already filtered to stale maps)
+        fingerprints: {variable: (input_fingerprint, style_fingerprint)} recorded
+                      in the run ledger with each finished map
+    
+    Returns:
+        forecast_hour if every map rendered, else None
+    """
+    if ds is None:
+        child_logger.info(f"✅ {model_id} f{forecast_hour:03d}: All maps current, nothing to render")
+        return forecast_hour
+    
+    run_str = run_time.strftime("%Y%m%d_%H")
+    ledger = get_run_ledger()
+    fingerprints = fingerprints or {}
+    
+    # Generate all maps - MapGenerator NEVER fetches, just renders
+    success_count = 0
+    failed_variables = []
+    
+    for variable in variables_to_generate:
+        ledger.mark_running(model_id, run_str, forecast_hour, variable)
+        started = time.time()
+        try:
+            # MapGenerator is PURE - only renders from ds
+            filepath = map_generator.generate_map(
+                ds=ds,
+                variable=variable,
+                model=model_id,  # Pass model_id as string
+                run_time=run_time,
+                forecast_hour=forecast_hour
+            )
+            input_fingerprint, style_fingerprint = fingerprints.get(variable, (None, None))
+            ledger.mark_done(
+                model_id, run_str, forecast_hour, variable,
+                duration_s=time.time() - started,
+                nbytes=Path(filepath).stat().st_size,
+                input_fingerprint=input_fingerprint,
+                style_fingerprint=style_fingerprint
+            )
+            child_logger.info(f"  ✓ {variable}")
+            success_count += 1
+        except Exception as e:
+            ledger.mark_failed(
+                model_id, run_str, forecast_hour, variable,
+                error=str(e), duration_s=time.time() - started
+            )
+            child_logger.error(f"  ✗ {variable}: {e}")
+            failed_variables.append(variable)
+    
+    # Release the processed fields shared by this hour's maps
+    map_generator.clear_field_cache()
+    
+    # Clear matplotlib state after all maps for this forecast hour
+    # This prevents memory accumulation across variables
+    try:
+        import matplotlib.pyplot as plt
+        plt.clf()
+        plt.cla()
+        plt.close('all')
+    except Exception:
+        pass  # Non-critical
+    
+    # Cleanup
+    ds.close()
+    del ds
+    gc.collect()
+    
+    # Only mark as complete if ALL maps exist
+    if success_count == len(variables_to_generate):
+        child_logger.info(f"✅ {model_id} f{forecast_hour:03d}: Complete ({success_count} maps)")
+        return forecast_hour
+    else:
+        child_logger.warning(f"⚠️  {model_id} f{forecast_hour:03d}: Incomplete ({success_count}/{len(variables_to_generate)}). Failed: {failed_variables}")
+        return None
+
+
 def generate_maps_for_hour(args):
     """
     Generate maps for a specific hour - model agnostic.
     
-    **CRITICAL: This is the ONLY place that calls build_dataset_for_maps().**
+    **CRITICAL: This (and generate_maps_for_hours) is the ONLY place that calls build_dataset_for_maps().**
     MapGenerator NEVER calls fetcher methods.
     """
-    model_id, run_time, forecast_hour, variables = args
+    model_id, run_time, forecast_hour, variables, *progress = args
+    _report_started(progress)
     
     # Configure logging for the child process
     child_logger = logging.getLogger(f"{model_id}-f{forecast_hour:03d}")
@@ -178,98 +471,115 @@ def generate_maps_for_hour(args):
         data_fetcher = ModelFactory.create_fetcher(model_id)
         map_generator = MapGenerator()  # Pure, no fetchers inside
         
-        # Filter variables based on model capabilities
-        model_config = ModelRegistry.get(model_id)
-        variables_to_generate = VariableRegistry.filter_by_model_capabilities(
-            variables,
-            model_config
-        )
-        
-        # Skip f000-specific exclusions
-        if forecast_hour == 0:
-            skip_vars = ['wind_speed', 'precip', 'mslp_precip', 'radar', 'radar_reflectivity']
-            variables_to_generate = [v for v in variables_to_generate if v not in skip_vars]
-            if skip_vars:
-                child_logger.info(f"  ⊙ Skipping f000-unavailable vars: {skip_vars}")
-        
+        variables_to_generate = _variables_for_hour(model_id, forecast_hour, variables, child_logger)
         if not variables_to_generate:
             child_logger.info(f"  ⊙ No variables to generate for {model_id} f{forecast_hour:03d}")
             return forecast_hour
         
-        # **SINGLE CALL to build complete dataset with ALL derived fields**
-        # This is where ALL data fetching and derived field computation happens
-        child_logger.info(f"  📥 Building dataset for {len(variables_to_generate)} variables...")
-        ds = data_fetcher.build_dataset_for_maps(
-            run_time=run_time,
-            forecast_hour=forecast_hour,
-            variables=variables_to_generate,
-            subset_region=True
+        ds, stale, fingerprints = _prepare_hour(
+            data_fetcher, map_generator, model_id, run_time, forecast_hour, variables_to_generate, child_logger
+        )
+        return _render_hour_maps(
+            map_generator, ds, model_id, run_time, forecast_hour, stale, child_logger, fingerprints
         )
-        child_logger.info(f"  ✓ Dataset ready with {len(ds.data_vars)} fields")
-        
-        # Check which maps already exist for this run
-        run_str = run_time.strftime("%Y%m%d_%H")
-        images_path = Path(settings.storage_path)
-        existing_maps = set()
-        
-        if images_path.exists():
-            for var in variables_to_generate:
-                expected_filename = f"{model_id.lower()}_{run_str}_{var}_{forecast_hour}.png"
-                if (images_path / expected_filename).exists():
-                    existing_maps.add(var)
-                    child_logger.info(f"  ⊙ {var} already exists, skipping")
         
-        # Generate all maps - MapGenerator NEVER fetches, just renders
-        success_count = 0
-        failed_variables = []
+    except Exception as e:
+        child_logger.error(f"❌ Worker failed for f{forecast_hour:03d}: {e}")
+        return None
+
+
+def generate_maps_for_hours(args):
+    """
+    Generate maps for a run of consecutive forecast hours in one worker, pipelined.
+    
+    While fH is being rendered (CPU-bound matplotlib), the dataset for the
+    next hour is fetched and decoded on a background thread, so network and
+    GRIB decode latency overlap with rendering. At most two hours' datasets
+    are held in memory at once. Bucketed accumulations also benefit: the next
+    hour resumes from the running sum this worker has just stored.
+    
+    Returns:
+        List of (forecast_hour, result) with result as from generate_maps_for_hour
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    model_id, run_time, forecast_hours, variables, *progress = args
+    _report_started(progress)
+    chunk_logger = logging.getLogger(f"{model_id}-f{forecast_hours[0]:03d}-f{forecast_hours[-1]:03d}")
+    chunk_logger.info(f"🚀 Worker starting pipelined {model_id} {[f'f{fh:03d}' for fh in forecast_hours]}")
+    
+    try:
+        data_fetcher = ModelFactory.create_fetcher(model_id)
+        map_generator = MapGenerator()  # Pure, no fetchers inside
+    except Exception as e:
+        chunk_logger.error(f"❌ Worker setup failed: {e}")
+        return [(fh, None) for fh in forecast_hours]
+    
+    loggers = {fh: logging.getLogger(f"{model_id}-f{fh:03d}") for fh in forecast_hours}
+    hour_variables = {
+        fh: _variables_for_hour(model_id, fh, variables, loggers[fh]) for fh in forecast_hours
+    }
+    
+    def _build(fh):
+        return _prepare_hour(data_fetcher, map_generator, model_id, run_time, fh, hour_variables[fh], loggers[fh])
+    
+    results = []
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") as prefetcher:
+        futures = {}
+        hours = [fh for fh in forecast_hours if hour_variables[fh]]
+        for fh in forecast_hours:
+            if not hour_variables[fh]:
+                loggers[fh].info(f"  ⊙ No variables to generate for {model_id} f{fh:03d}")
+        if hours:
+            futures[hours[0]] = prefetcher.submit(_build, hours[0])
         
-        for variable in variables_to_generate:
-            # Skip if already exists
-            if variable in existing_maps:
-                success_count += 1
+        for fh in forecast_hours:
+            if fh not in futures:
+                results.append((fh, fh))
                 continue
+            try:
+                ds, stale, fingerprints = futures.pop(fh).result()
+                built = True
+            except Exception as e:
+                loggers[fh].error(f"❌ Worker failed for f{fh:03d}: {e}")
+                built = False
             
+            # Start the next hour's fetch before rendering this one
+            next_hours = [h for h in hours if h > fh]
+            if next_hours:
+                loggers[next_hours[0]].info(f"  ⏩ Prefetching f{next_hours[0]:03d} while rendering f{fh:03d}")
+                futures[next_hours[0]] = prefetcher.submit(_build, next_hours[0])
+            
+            if not built:
+                results.append((fh, None))
+                continue
             try:
-                # MapGenerator is PURE - only renders from ds
-                map_generator.generate_map(
-                    ds=ds,
-                    variable=variable,
-                    model=model_id,  # Pass model_id as string
-                    run_time=run_time,
-                    forecast_hour=forecast_hour
+                result = _render_hour_maps(
+                    map_generator, ds, model_id, run_time, fh, stale, loggers[fh], fingerprints
                 )
-                child_logger.info(f"  ✓ {variable}")
-                success_count += 1
             except Exception as e:
-                child_logger.error(f"  ✗ {variable}: {e}")
-                failed_variables.append(variable)
-        
-        # Clear matplotlib state after all maps for this forecast hour
-        # This prevents memory accumulation across variables
-        try:
-            import matplotlib.pyplot as plt
-            plt.clf()
-            plt.cla()
-            plt.close('all')
-        except Exception:
-            pass  # Non-critical
-        
-        # Cleanup
-        ds.close()
-        del ds
-        gc.collect()
-        
-        # Only mark as complete if ALL maps exist
-        if success_count == len(variables_to_generate):
-            child_logger.info(f"✅ {model_id} f{forecast_hour:03d}: Complete ({success_count} maps)")
-            return forecast_hour
-        else:
-            child_logger.warning(f"⚠️  {model_id} f{forecast_hour:03d}: Incomplete ({success_count}/{len(variables_to_generate)}). Failed: {failed_variables}")
-            return None
-        
-    except Exception as e:
-        child_logger.error(f"❌ Worker failed for f{forecast_hour:03d}: {e}")
-        return None
+                loggers[fh].error(f"❌ Worker failed for f{fh:03d}: {e}")
+                result = None
+            results.append((fh, result))
+    
+    return results
+
+
+def chunk_forecast_hours(forecast_hours, worker_count, max_chunk=None):
+    """
+    Split sorted forecast hours into consecutive chunks for pipelined workers.
+    
+    Chunks are no longer than settings.pipeline_chunk_hours and small enough
+    that every worker gets work (a handful of hours never collapses into one
+    chunk on one worker).
+    """
+    if max_chunk is None:
+        max_chunk = settings.pipeline_chunk_hours
+    hours = sorted(forecast_hours)
+    if not hours:
+        return []
+    size = max(1, min(max_chunk, -(-len(hours) // max(1, worker_count))))
+    return [hours[i:i + size] for i in range(0, len(hours), size)]
 
 class ForecastScheduler:
     """Multi-model scheduler with global concurrency control"""
@@ -303,12 +613,7 @@ class ForecastScheduler:
             model_config = ModelRegistry.get(model_id)
             
             # Determine forecast hours (use model-specific if available)
-            if model_id == "HRRR":
-                configured_hours = settings.hrrr_forecast_hours_list
-            elif model_id == "AIGFS":
-                configured_hours = settings.aigfs_forecast_hours_list
-            else:
-                configured_hours = [int(h) for h in settings.forecast_hours.split(',')]
+            configured_hours = settings.forecast_hours_for_model(model_id)
             max_hour = self._get_effective_max_forecast_hour(model_id, run_time, model_config)
             forecast_hours = [h for h in configured_hours if h <= max_hour]
             
@@ -325,9 +630,19 @@ class ForecastScheduler:
             # Use allocated worker count for this model
             logger.info(f"💻 Using {worker_count} worker processes")
             
-            with Pool(processes=worker_count, maxtasksperchild=5) as pool:
-                args = [(model_id, run_time, fh, variables) for fh in forecast_hours]
-                results = pool.map(generate_maps_for_hour, args)
+            with Pool(processes=worker_count, initializer=_init_worker,
+                      maxtasksperchild=_WORKER_MAX_TASKS_PER_CHILD) as pool:
+                if settings.pipelined_generation:
+                    chunks = chunk_forecast_hours(forecast_hours, worker_count)
+                    logger.info(f"⏩ Pipelined generation: {len(chunks)} chunks of up to {len(chunks[0]) if chunks else 0} hours")
+                    args = [(model_id, run_time, chunk, variables) for chunk in chunks]
+                    results = [result for chunk_results in pool.map(generate_maps_for_hours, args)
+                               for _, result in chunk_results]
+                else:
+                    args = [(model_id, run_time, fh, variables) for fh in forecast_hours]
+                    results = pool.map(generate_maps_for_hour, args)
+            
+            self._publish_map_listing(model_id, run_time.strftime("%Y%m%d_%H"))
             
             # Summary
             successful = [r for r in results if r is not None]
@@ -341,6 +656,13 @@ class ForecastScheduler:
             logger.error(traceback.format_exc())
             return False
     
+    def _publish_map_listing(self, model_id: str, run_str: str):
+        """Refresh the pre-compressed /api/maps listing for a run (non-fatal)"""
+        try:
+            get_map_listing_cache().publish(model_id, run_str)
+        except Exception as e:
+            logger.warning(f"Could not publish {model_id} {run_str} map listing: {e}")
+    
     def generate_forecast_for_model_progressive(
         self, 
         model_id: str,
@@ -384,12 +706,7 @@ class ForecastScheduler:
             model_config = ModelRegistry.get(model_id)
             
             # Determine forecast hours (use model-specific if available)
-            if model_id == "HRRR":
-                configured_hours = settings.hrrr_forecast_hours_list
-            elif model_id == "AIGFS":
-                configured_hours = settings.aigfs_forecast_hours_list
-            else:
-                configured_hours = [int(h) for h in settings.forecast_hours.split(',')]
+            configured_hours = settings.forecast_hours_for_model(model_id)
             max_hour = self._get_effective_max_forecast_hour(model_id, run_time, model_config)
             forecast_hours = sorted([h for h in configured_hours if h <= max_hour])
             
@@ -409,36 +726,27 @@ class ForecastScheduler:
             pending_hours = set(forecast_hours)
             failed_attempts = {}  # Track failures per hour
             
-            # Pre-scan for existing maps to avoid regenerating already-complete hours
-            logger.info("🔍 Scanning for existing maps...")
+            # Pre-scan the run ledger so a restart resumes where it stopped
+            logger.info("🔍 Checking run ledger for existing maps...")
             run_str = run_time.strftime("%Y%m%d_%H")
-            images_path = Path(settings.storage_path)
+            ledger = get_run_ledger()
+            ledger.ensure_run(model_id, run_str)
+            expected_by_hour = {fh: _expected_variables(variables, fh) for fh in forecast_hours}
+            # Maps drawn with an older style count as missing and are re-rendered
+            styles = _style_fingerprints(variables)
             
-            if images_path.exists():
-                for fh in list(pending_hours):
-                    # Skip f000 which has limited variables
-                    if fh == 0:
-                        skip_vars = ['wind_speed', 'precip', 'mslp_precip', 'radar', 'radar_reflectivity']
-                        expected_vars = [v for v in variables if v not in skip_vars]
-                    else:
-                        expected_vars = variables
-                    
-                    # Count how many maps exist for this hour
-                    existing_count = 0
-                    for var in expected_vars:
-                        expected_filename = f"{model_id.lower()}_{run_str}_{var}_{fh}.png"
-                        if (images_path / expected_filename).exists():
-                            existing_count += 1
-                    
-                    # Consider complete if at least 80% of expected maps exist
-                    # This handles cases where one problematic variable fails but others succeed
-                    completion_threshold = max(1, int(len(expected_vars) * 0.8))
-                    if existing_count >= completion_threshold:
-                        completed_hours.add(fh)
-                        pending_hours.discard(fh)
-                        logger.info(f"  ✓ f{fh:03d}: {existing_count}/{len(expected_vars)} maps exist (already complete)")
-                    elif existing_count > 0:
-                        logger.info(f"  ⊙ f{fh:03d}: {existing_count}/{len(expected_vars)} maps exist (incomplete, will retry)")
+            for fh, state in sorted(ledger.hour_progress(model_id, run_str, expected_by_hour, styles).items()):
+                expected_count = len(expected_by_hour[fh])
+                missing_outputs = _missing_hour_outputs(model_id, run_str, fh)
+                if not state['missing'] and missing_outputs:
+                    logger.info(f"  ⊙ f{fh:03d}: {len(state['done'])}/{expected_count} maps exist, missing {', '.join(missing_outputs)}")
+                elif not state['missing']:
+                    completed_hours.add(fh)
+                    pending_hours.discard(fh)
+                    note = f", gave up on {state['gave_up']}" if state['gave_up'] else ""
+                    logger.info(f"  ✓ f{fh:03d}: {len(state['done'])}/{expected_count} maps exist (already complete{note})")
+                elif state['done']:
+                    logger.info(f"  ⊙ f{fh:03d}: {len(state['done'])}/{expected_count} maps exist (incomplete, will retry)")
             
             if completed_hours:
                 logger.info(f"✅ Pre-scan found {len(completed_hours)} already-complete hours")
@@ -448,81 +756,187 @@ class ForecastScheduler:
             max_duration_seconds = max_duration_minutes * 60
             poll_cycle = 0
             
-            while pending_hours:
-                poll_cycle += 1
-                elapsed = time.time() - start_time
-                elapsed_minutes = elapsed / 60
+            # Hours submitted to the pool whose result has not come back yet.
+            # Pool callbacks run on the pool's result thread and hand results
+            # back to this loop through the queue. Workers post (task id,
+            # start time) on started_queue when they pick a task up; only then
+            # do its hours get a result deadline.
+            in_flight = set()
+            hour_task = {}  # in-flight hour -> id of the task it was last submitted in
+            task_hours = {}  # submitted, not yet started task id -> its hours
+            result_deadlines = {}  # started hour -> time after which its result counts as lost
+            results_queue = queue.Queue()
+            task_ids = itertools.count(1)
+            
+            def _track(hours):
+                task_id = next(task_ids)
+                in_flight.update(hours)
+                task_hours[task_id] = list(hours)
+                for fh in hours:
+                    hour_task[fh] = task_id
+                    result_deadlines.pop(fh, None)
+                return task_id
+            
+            def _submit(pool, fh):
+                task_id = _track([fh])
+                pool.apply_async(
+                    generate_maps_for_hour,
+                    ((model_id, run_time, fh, variables, started_queue, task_id),),
+                    callback=lambda result, fh=fh: results_queue.put((fh, result)),
+                    error_callback=lambda exc, fh=fh: results_queue.put((fh, None))
+                )
+            
+            def _submit_chunk(pool, hours):
+                # Pipelined: one worker fetches hour N+1 while rendering hour N
+                task_id = _track(hours)
+                pool.apply_async(
+                    generate_maps_for_hours,
+                    ((model_id, run_time, hours, variables, started_queue, task_id),),
+                    callback=lambda results: [results_queue.put(item) for item in results],
+                    error_callback=lambda exc, hours=hours: [results_queue.put((fh, None)) for fh in hours]
+                )
+            
+            def _note_started():
+                # Chunk hours are rendered in order, so hour N of a chunk gets N timeouts
+                while True:
+                    try:
+                        task_id, started_at = started_queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    for position, fh in enumerate(task_hours.pop(task_id, ()), start=1):
+                        if hour_task.get(fh) == task_id:
+                            result_deadlines[fh] = started_at + position * _HOUR_RESULT_TIMEOUT_SECONDS
+            
+            def _handle_result(fh, result):
+                in_flight.discard(fh)
+                hour_task.pop(fh, None)
+                result_deadlines.pop(fh, None)
                 
-                # Check if we've exceeded max duration
-                if elapsed >= max_duration_seconds:
-                    logger.warning(f"⏰ Max duration ({max_duration_minutes} min) reached")
-                    logger.warning(f"   Still pending: {sorted(pending_hours)}")
-                    break
+                if result is not None:
+                    completed_hours.add(fh)
+                    pending_hours.discard(fh)
+                    logger.info(f"   ✓ f{fh:03d} generation complete")
+                    self._publish_map_listing(model_id, run_str)
+                    return
                 
-                logger.info(f"🔍 Poll cycle #{poll_cycle} at +{elapsed_minutes:.1f} min")
-                logger.info(f"   Completed: {len(completed_hours)}/{len(forecast_hours)} hours")
-                if pending_hours:
-                    logger.info(f"   Pending: {sorted(pending_hours)}")
+                failed_attempts[fh] = failed_attempts.get(fh, 0) + 1
                 
-                # Check which pending hours are now available
-                available_hours = []
-                for fh in sorted(pending_hours):
-                    if self.check_forecast_hour_available(model_id, run_time, fh):
-                        available_hours.append(fh)
+                # The ledger knows exactly which variables rendered and which
+                # have exhausted their retries
+                state = ledger.hour_progress(model_id, run_str, {fh: expected_by_hour[fh]}, styles)[fh]
+                expected_count = len(expected_by_hour[fh])
                 
-                if available_hours:
-                    logger.info(f"✅ Found {len(available_hours)} available: {available_hours}")
+                if not state['missing']:
+                    logger.warning(f"   ⊙ f{fh:03d} complete except {state['gave_up']} ({len(state['done'])}/{expected_count} maps), marking as done")
+                    completed_hours.add(fh)
+                    pending_hours.discard(fh)
+                    self._publish_map_listing(model_id, run_str)
+                elif failed_attempts[fh] >= 3:
+                    logger.error(f"   ✗ f{fh:03d} failed {failed_attempts[fh]} times ({len(state['done'])}/{expected_count} maps, missing {state['missing']}), giving up")
+                    pending_hours.discard(fh)
+                else:
+                    logger.warning(f"   ⚠️  f{fh:03d} generation failed (attempt {failed_attempts[fh]}/3, {len(state['done'])}/{expected_count} maps exist)")
+            
+            def _probe(hours):
+                if settings.availability_listing:
+                    return get_availability_probe().available_hours(
+                        model_id, run_time, hours, self.check_forecast_hour_available,
+                        model_config.herbie_product
+                    )
+                return {fh for fh in hours if self.check_forecast_hour_available(model_id, run_time, fh)}
+            
+            # Polls are timed from learned publish latency (adaptive_polling);
+            # otherwise every check_interval_seconds
+            watcher = AvailabilityWatcher(model_id, run_time, pending_hours, _probe, check_interval_seconds)
+            
+            # One long-lived pool for the whole run: worker warm-up is paid once,
+            # hours are submitted as soon as they are published and results are
+            # consumed as they complete instead of in poll-cycle batches.
+            with Manager() as manager, Pool(processes=worker_count, initializer=_init_worker,
+                                            maxtasksperchild=_WORKER_MAX_TASKS_PER_CHILD) as pool:
+                started_queue = manager.Queue()
+                while pending_hours:
+                    poll_cycle += 1
+                    elapsed = time.time() - start_time
+                    elapsed_minutes = elapsed / 60
+                    
+                    # Check if we've exceeded max duration
+                    if elapsed >= max_duration_seconds:
+                        logger.warning(f"⏰ Max duration ({max_duration_minutes} min) reached")
+                        logger.warning(f"   Still pending: {sorted(pending_hours)}")
+                        break
                     
-                    # Generate maps for available hours in parallel
-                    with Pool(processes=worker_count, maxtasksperchild=5) as pool:
-                        args = [(model_id, run_time, fh, variables) for fh in available_hours]
-                        results = pool.map(generate_maps_for_hour, args)
+                    logger.info(f"🔍 Poll cycle #{poll_cycle} at +{elapsed_minutes:.1f} min")
+                    logger.info(f"   Completed: {len(completed_hours)}/{len(forecast_hours)} hours")
+                    if in_flight:
+                        logger.info(f"   In progress: {sorted(in_flight)}")
                     
-                    # Process results
-                    for fh, result in zip(available_hours, results):
-                        if result is not None:
-                            completed_hours.add(fh)
-                            pending_hours.discard(fh)
-                            logger.info(f"   ✓ f{fh:03d} generation complete")
+                    # Check which pending hours (not already running) are now available
+                    waiting_hours = sorted(pending_hours - in_flight)
+                    if waiting_hours:
+                        logger.info(f"   Pending: {waiting_hours}")
+                    
+                    available_hours = watcher.poll(waiting_hours)
+                    interval = watcher.next_interval() if settings.adaptive_polling else check_interval_seconds
+                    
+                    if available_hours:
+                        logger.info(f"✅ Found {len(available_hours)} available: {available_hours}")
+                        if settings.pipelined_generation:
+                            for chunk in chunk_forecast_hours(available_hours, worker_count):
+                                if len(chunk) == 1:
+                                    _submit(pool, chunk[0])
+                                else:
+                                    _submit_chunk(pool, chunk)
                         else:
-                            failed_attempts[fh] = failed_attempts.get(fh, 0) + 1
-                            
-                            # Before giving up, check if maps exist on disk (may have partial success)
-                            if fh == 0:
-                                skip_vars = ['wind_speed', 'precip', 'mslp_precip', 'radar', 'radar_reflectivity']
-                                expected_vars = [v for v in variables if v not in skip_vars]
-                            else:
-                                expected_vars = variables
-                            
-                            existing_count = 0
-                            for var in expected_vars:
-                                expected_filename = f"{model_id.lower()}_{run_str}_{var}_{fh}.png"
-                                if (images_path / expected_filename).exists():
-                                    existing_count += 1
-                            
-                            # If at least 80% of maps exist, consider it complete despite the failure
-                            completion_threshold = max(1, int(len(expected_vars) * 0.8))
-                            if existing_count >= completion_threshold:
-                                logger.warning(f"   ⊙ f{fh:03d} partially complete ({existing_count}/{len(expected_vars)} maps exist), marking as done")
-                                completed_hours.add(fh)
-                                pending_hours.discard(fh)
-                            elif failed_attempts[fh] >= 3:
-                                logger.error(f"   ✗ f{fh:03d} failed {failed_attempts[fh]} times ({existing_count}/{len(expected_vars)} maps), giving up")
-                                pending_hours.discard(fh)
-                            else:
-                                logger.warning(f"   ⚠️  f{fh:03d} generation failed (attempt {failed_attempts[fh]}/3, {existing_count}/{len(expected_vars)} maps exist)")
+                            for fh in available_hours:
+                                _submit(pool, fh)
+                    elif not in_flight:
+                        logger.info(f"⏳ No new data available, waiting {interval:.0f}s...")
+                    
+                    # Consume completions as they arrive until the next availability check
+                    next_check = time.time() + interval
+                    while pending_hours:
+                        timeout = next_check - time.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            fh, result = results_queue.get(timeout=timeout)
+                        except queue.Empty:
+                            break
+                        if fh in in_flight:
+                            _handle_result(fh, result)
+                    
+                    # Hours whose worker died are failed attempts, so they are resubmitted;
+                    # hours still queued behind busy workers have no deadline yet
+                    _note_started()
+                    now = time.time()
+                    for fh in sorted(h for h in in_flight if result_deadlines.get(h, now) < now):
+                        logger.warning(f"   ⚠️  f{fh:03d} result lost (no reply in time after its task started, worker likely killed)")
+                        _handle_result(fh, None)
                     
-                    # Check if we're done immediately after generating
                     if not pending_hours:
+                        elapsed_minutes = (time.time() - start_time) / 60
                         logger.info(f"\n🎉 All {len(completed_hours)} forecast hours complete!")
                         logger.info(f"⏱️  Total time: {elapsed_minutes:.1f} minutes ({poll_cycle} poll cycles)")
-                        break
-                else:
-                    logger.info(f"⏳ No new data available, waiting {check_interval_seconds}s...")
                 
-                # Wait before next check (only if there are still pending hours)
-                if pending_hours:
-                    time.sleep(check_interval_seconds)
+                # Let hours that are already rendering finish before the pool shuts down
+                # (bounded by the run's remaining duration, with a short grace)
+                if in_flight:
+                    logger.info(f"⏳ Waiting for {len(in_flight)} in-progress hours: {sorted(in_flight)}")
+                drain_deadline = max(start_time + max_duration_seconds, time.time() + _IN_FLIGHT_GRACE_SECONDS)
+                while in_flight:
+                    timeout = drain_deadline - time.time()
+                    try:
+                        if timeout <= 0:
+                            raise queue.Empty
+                        fh, result = results_queue.get(timeout=timeout)
+                    except queue.Empty:
+                        logger.error(f"⏰ Gave up waiting for in-progress hours {sorted(in_flight)}, terminating workers")
+                        in_flight.clear()
+                        pool.terminate()
+                        break
+                    if fh in in_flight:
+                        _handle_result(fh, result)
             
             # Final summary (only show if we didn't already report completion)
             final_elapsed = time.time() - start_time
@@ -580,7 +994,7 @@ class ForecastScheduler:
                 # Use Herbie's built-in availability check
                 logger.debug(f"{model_id} uses Herbie - checking availability via Herbie")
                 try:
-                    from herbie import Herbie
+                    from app.services.herbie_data_fetcher import get_herbie
                     
                     # Map to Herbie model name
                     herbie_model_map = {
@@ -593,14 +1007,10 @@ class ForecastScheduler:
                         logger.warning(f"{model_id} not in Herbie model map, assuming available")
                         return True
                     
-                    # Check if Herbie can find the file
-                    run_time_naive = run_time.replace(tzinfo=None) if run_time.tzinfo else run_time
-                    H = Herbie(
-                        date=run_time_naive,
-                        model=herbie_model,
-                        fxx=forecast_hour,
-                        verbose=False
-                    )
+                    # Check if Herbie can find the file. Found objects are cached
+                    # and reused by later polls and the fetchers (resolved source
+                    # and parsed inventory included).
+                    H = get_herbie(model_id, herbie_model, run_time, forecast_hour, model_config.herbie_product)
                     
                     # If Herbie found a grib file, it's available
                     available = H.grib is not None
@@ -673,10 +1083,7 @@ class ForecastScheduler:
             Maximum forecast hour for this specific model run
         """
         # Get the configured forecast hours for this model
-        if model_id == "HRRR":
-            configured_hours = settings.hrrr_forecast_hours_list
-        else:
-            configured_hours = [int(h) for h in settings.forecast_hours.split(',')]
+        configured_hours = settings.forecast_hours_for_model(model_id)
         
         max_configured = max(configured_hours) if configured_hours else 0
         
@@ -723,41 +1130,40 @@ class ForecastScheduler:
                 fetcher = ModelFactory.create_fetcher(model_id)
                 latest_run = fetcher.get_latest_run_time()
                 
-                # Check if this run has already been generated
+                # Check if this run has already been generated (run ledger)
                 run_str = latest_run.strftime("%Y%m%d_%H")
-                images_path = Path(settings.storage_path)
+                variables = VariableRegistry.filter_by_model_capabilities(
+                    self.variables, config
+                )
+                configured_hours = settings.forecast_hours_for_model(model_id)
+                
+                max_hour = self._get_effective_max_forecast_hour(model_id, latest_run, config)
+                expected_by_hour = {
+                    h: _expected_variables(variables, h) for h in configured_hours if h <= max_hour
+                }
                 
-                # Quick check: does at least one image exist for this run?
-                existing_images = list(images_path.glob(f"{model_id.lower()}_{run_str}_*.png"))
+                ledger = get_run_ledger()
+                ledger.ensure_run(model_id, run_str)
+                progress = ledger.hour_progress(
+                    model_id, run_str, expected_by_hour, _style_fingerprints(variables)
+                )
+                done_count = sum(len(state['done']) for state in progress.values())
+                missing_count = sum(len(state['missing']) for state in progress.values())
+                outputs_missing = [fh for fh in expected_by_hour if _missing_hour_outputs(model_id, run_str, fh)]
                 
-                if len(existing_images) == 0:
-                    # No images exist yet, this model has new data
+                if done_count == 0:
+                    # No maps exist yet, this model has new data
                     models_with_data[model_id] = config
                     logger.info(f"  ✓ {model_id}: New run {run_str} available (no existing images)")
+                elif missing_count:
+                    models_with_data[model_id] = config
+                    logger.info(f"  ⊙ {model_id}: Run {run_str} incomplete ({done_count} maps, {missing_count} missing)")
+                elif outputs_missing:
+                    models_with_data[model_id] = config
+                    logger.info(f"  ⊙ {model_id}: Run {run_str} maps complete, field export/point cube missing "
+                                f"for {len(outputs_missing)} hours")
                 else:
-                    # Some images exist, check if generation is complete
-                    # Use a simple heuristic: if we have fewer than expected images, still needs work
-                    variables = VariableRegistry.filter_by_model_capabilities(
-                        self.variables, config
-                    )
-                    if model_id == "HRRR":
-                        configured_hours = settings.hrrr_forecast_hours_list
-                    elif model_id == "AIGFS":
-                        configured_hours = settings.aigfs_forecast_hours_list
-                    else:
-                        configured_hours = [int(h) for h in settings.forecast_hours.split(',')]
-                    
-                    max_hour = self._get_effective_max_forecast_hour(model_id, latest_run, config)
-                    forecast_hours = [h for h in configured_hours if h <= max_hour]
-                    
-                    # Rough expected image count (variables * forecast_hours, minus f000 restrictions)
-                    expected_images = len(variables) * len(forecast_hours)
-                    
-                    if len(existing_images) < expected_images * 0.8:  # 80% threshold
-                        models_with_data[model_id] = config
-                        logger.info(f"  ⊙ {model_id}: Run {run_str} incomplete ({len(existing_images)} images, expected ~{expected_images})")
-                    else:
-                        logger.info(f"  ⊘ {model_id}: Run {run_str} already complete ({len(existing_images)} images)")
+                    logger.info(f"  ⊘ {model_id}: Run {run_str} already complete ({done_count} maps)")
             except Exception as e:
                 logger.warning(f"  ⚠️  {model_id}: Could not check run status: {e}")
                 # On error, include the model to be safe
@@ -1042,29 +1448,18 @@ class ForecastScheduler:
             
             # Get enabled models
             enabled_models = ModelRegistry.get_enabled()
+            manifest = get_map_manifest()
             
             for model_id in enabled_models.keys():
                 model_prefix = f"{model_id.lower()}_"
                 
-                # Parse all image filenames for this model
-                image_files = list(images_path.glob(f"{model_prefix}*.png"))
+                # Unique run times (format: YYYYMMDD_HH) from the manifest index
+                run_times = {row['run_time'] for row in manifest.runs(model_id)}
                 
-                if not image_files:
+                if not run_times:
                     logger.info(f"No images found for {model_id}, skipping cleanup")
                     continue
                 
-                # Extract unique run times (format: YYYYMMDD_HH)
-                run_times = set()
-                for img in image_files:
-                    try:
-                        parts = img.stem.split('_')
-                        if len(parts) >= 3:
-                            run_time_str = f"{parts[1]}_{parts[2]}"  # e.g., "20260124_00"
-                            run_times.add(run_time_str)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse filename {img.name}: {e}")
-                        continue
-                
                 # Sort run times (newest first)
                 sorted_runs = sorted(run_times, reverse=True)
                 
@@ -1089,15 +1484,20 @@ class ForecastScheduler:
                                 logger.debug(f"Deleted: {img.name}")
                             except Exception as e:
                                 logger.error(f"Failed to delete {img.name}: {e}")
+                        manifest.remove_run(model_id, old_run)
+                        get_run_ledger().remove_run(model_id, old_run)
+                        get_map_listing_cache().remove_run(model_id, old_run)
+                        get_tile_renderer().remove_run(model_id, old_run)
+                        get_field_exporter().remove_run(model_id, old_run)
+                        get_point_cube().remove_run(model_id, old_run)
                     
                     logger.info(f"✅ {model_id} cleanup complete: Deleted {deleted_count} images from {len(runs_to_delete)} old runs")
                 else:
                     logger.info(f"Only {len(sorted_runs)} {model_id} runs found, keeping all (threshold: {keep_last_n})")
             
             # Log current disk usage
-            total_size = sum(f.stat().st_size for f in images_path.glob("*.png"))
-            total_images = len(list(images_path.glob("*.png")))
-            logger.info(f"Current storage: {total_size / (1024*1024):.1f} MB ({total_images} images)")
+            totals = manifest.totals()
+            logger.info(f"Current storage: {totals['bytes'] / (1024*1024):.1f} MB ({totals['count']} images)")
                 
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
@@ -0,0 +1,149 @@
+"""Run-keyed, cross-process store for running accumulation sums.
+
+Bucketed precipitation and snowfall totals are prefix sums over forecast
+hours: total(fH) = total(fH - increment) + bucket(fH). The scheduler renders
+forecast hours in separate worker processes, so an in-process cache never
+sees the previous hour's total and every worker re-reads every bucket from
+f000, which is O(H^2) work across a run.
+
+This store persists each running sum as a ``.npy`` file on disk so any worker
+can memory-map the latest sum below its forecast hour and add only the
+buckets it is missing.
+
+Layout::
+
+    {storage_path}/../accumulation_cache/{model}/{YYYYMMDD_HH}/{field}_f{fh:03d}.npy
+    {storage_path}/../accumulation_cache/{model}/{YYYYMMDD_HH}/{field}_f{fh:03d}.grid
+
+The optional ``.grid`` file holds a digest of the sum's coordinates, so a
+sum is never resumed onto a different grid of the same shape.
+
+Writes are atomic (temp file + ``os.replace``) so concurrent workers writing
+the same key never expose a partial file. Run directories other than the most
+recent ``keep_runs`` are pruned the first time a process sees a new run.
+"""
+from pathlib import Path
+from typing import Iterable, Optional, Set, Tuple
+import logging
+import os
+import shutil
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AccumulationStore:
+    """Memory-mapped running sums keyed by (model, run, forecast hour, field)."""
+
+    def __init__(self, model_id: str, root: Optional[Path] = None, keep_runs: int = 2):
+        """
+        Args:
+            model_id: Model identifier (e.g., "GFS", "HRRR")
+            root: Base directory (default: sibling of storage_path)
+            keep_runs: Number of most recent runs to keep on disk. Two covers
+                       a new run starting while the previous one is still
+                       being rendered (HRRR hourly cycles).
+        """
+        base = root or (Path(settings.storage_path).parent / "accumulation_cache")
+        self._model_dir = base / model_id.lower()
+        self._keep_runs = max(1, keep_runs)
+        self._active_runs: Set[str] = set()
+
+    def _run_dir(self, run_str: str) -> Path:
+        return self._model_dir / run_str
+
+    def _path(self, run_str: str, field: str, forecast_hour: int) -> Path:
+        return self._run_dir(run_str) / f"{field}_f{forecast_hour:03d}.npy"
+
+    def activate_run(self, run_str: str) -> None:
+        """
+        Mark a run as current, pruning stale run directories once per process.
+
+        Run strings (YYYYMMDD_HH) sort chronologically, so the newest
+        ``keep_runs`` directories are retained and everything older is removed.
+        """
+        if run_str in self._active_runs:
+            return
+        self._active_runs.add(run_str)
+
+        try:
+            self._run_dir(run_str).mkdir(parents=True, exist_ok=True)
+            run_dirs = sorted(p.name for p in self._model_dir.iterdir() if p.is_dir())
+        except OSError as e:
+            logger.warning(f"Accumulation store unavailable ({self._model_dir}): {e}")
+            return
+
+        keep = set(run_dirs[-self._keep_runs:]) | {run_str}
+        for name in run_dirs:
+            if name not in keep:
+                logger.info(f"    Pruning accumulation sums for old run {name}")
+                shutil.rmtree(self._model_dir / name, ignore_errors=True)
+
+    def load(self, run_str: str, field: str, forecast_hour: int) -> Optional[np.ndarray]:
+        """Return a read-only memory map of a stored running sum, or None."""
+        path = self._path(run_str, field, forecast_hour)
+        if not path.exists():
+            return None
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable accumulation file {path.name}: {e}")
+            return None
+
+    def load_grid(self, run_str: str, field: str, forecast_hour: int) -> Optional[str]:
+        """Grid digest stored with a running sum, or None if none was recorded."""
+        try:
+            return self._path(run_str, field, forecast_hour).with_suffix('.grid').read_text().strip()
+        except OSError:
+            return None
+
+    def latest(
+        self,
+        run_str: str,
+        field: str,
+        forecast_hours: Iterable[int]
+    ) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        Find the latest stored running sum among ``forecast_hours``.
+
+        Returns:
+            (forecast_hour, values) of the newest hit, or (0, None) if no
+            running sum has been stored yet for this run and field.
+        """
+        for fh in sorted(forecast_hours, reverse=True):
+            values = self.load(run_str, field, fh)
+            if values is not None:
+                return fh, values
+        return 0, None
+
+    def save(
+        self,
+        run_str: str,
+        field: str,
+        forecast_hour: int,
+        values: np.ndarray,
+        grid: Optional[str] = None
+    ) -> None:
+        """Atomically persist a running sum (float32) and optionally its grid digest."""
+        path = self._path(run_str, field, forecast_hour)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if grid is not None:
+                # Written first, so a visible sum always has its digest
+                grid_path = path.with_suffix('.grid')
+                grid_tmp = grid_path.with_name(f".{grid_path.name}.{os.getpid()}.tmp")
+                grid_tmp.write_text(grid)
+                os.replace(grid_tmp, grid_path)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(values, dtype=np.float32))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist accumulation {path.name}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,174 @@
+"""Batch forecast-hour availability from one listing per (source, run).
+
+The progressive loop used to ask about every pending hour separately: a
+Herbie construction (several source probes) per hour for GFS/HRRR and one
+HEAD request per hour for AIGFS. An availability poll now reads the run's
+file list once, an S3 ListObjectsV2 of the run prefix on the NOAA open-data
+buckets or the NOMADS directory index, and answers every pending hour from
+it. Hours confirmed available are remembered per (model, run) and never
+probed again, so a poll costs one listing however many hours are pending.
+
+Models without a known listing, or whose listing fails, fall back to the
+caller's per-hour check.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Set
+import logging
+import re
+import threading
+import xml.etree.ElementTree as ET
+
+from app.services.http_downloader import get_downloader
+
+logger = logging.getLogger(__name__)
+
+_S3_NS = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+# Runs per model whose confirmed hours are remembered
+_RUNS_KEPT = 4
+
+
+@dataclass(frozen=True)
+class RunListing:
+    """Where one run's files are listed and how to read forecast hours from names."""
+    kind: str  # "s3" or "nomads"
+    url: str  # Bucket endpoint or directory URL
+    prefix: str  # S3 key prefix ("" for NOMADS directories)
+    pattern: str  # Regex matching a data file name; group 1 is the forecast hour
+    needs_index: bool  # Hour counts only once its .idx is listed (byte-range reads need it)
+
+
+def run_listing(model_id: str, run_time: datetime, herbie_product: Optional[str] = None) -> Optional[RunListing]:
+    """
+    Listing that covers every forecast hour of a run, or None if unknown for the model.
+
+    GFS and HRRR are read from the NOAA open-data buckets, Herbie's first
+    source. AIGFS is read from its NOMADS directory.
+    """
+    date = run_time.strftime("%Y%m%d")
+    hh = run_time.strftime("%H")
+    if model_id == "GFS":
+        product = herbie_product or "pgrb2.0p25"
+        prefix = f"gfs.{date}/{hh}/atmos/gfs.t{hh}z.{product}.f"
+        return RunListing("s3", "https://noaa-gfs-bdp-pds.s3.amazonaws.com/", prefix,
+                          rf"^{re.escape(prefix)}(\d{{3}})$", True)
+    if model_id == "HRRR":
+        product = "wrfsfc" if (herbie_product or "sfc") == "sfc" else f"wrf{herbie_product}"
+        prefix = f"hrrr.{date}/conus/hrrr.t{hh}z.{product}f"
+        return RunListing("s3", "https://noaa-hrrr-bdp-pds.s3.amazonaws.com/", prefix,
+                          rf"^{re.escape(prefix)}(\d{{2}})\.grib2$", True)
+    if model_id == "AIGFS":
+        url = f"https://nomads.ncep.noaa.gov/pub/data/nccf/com/aigfs/prod/aigfs.{date}/{hh}/model/atmos/grib2/"
+        return RunListing("nomads", url, "", rf"^aigfs\.t{hh}z\.sfc\.f(\d{{3}})\.grib2$", False)
+    return None
+
+
+def _list_s3(listing: RunListing) -> Set[str]:
+    """Keys under the listing prefix (anonymous ListObjectsV2, paginated)."""
+    downloader = get_downloader()
+    keys: Set[str] = set()
+    params = {"list-type": "2", "prefix": listing.prefix}
+    while True:
+        root = ET.fromstring(downloader.get_text(listing.url, params=params))
+        keys.update(el.text for el in root.iter(f"{_S3_NS}Key") if el.text)
+        token = root.findtext(f"{_S3_NS}NextContinuationToken")
+        if root.findtext(f"{_S3_NS}IsTruncated") != "true" or not token:
+            return keys
+        params = {**params, "continuation-token": token}
+
+
+def _list_nomads(listing: RunListing) -> Set[str]:
+    """File names linked from a NOMADS directory index (a missing run directory lists nothing)."""
+    try:
+        html = get_downloader().get_text(listing.url)
+    except Exception as e:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        if status == 404:
+            return set()
+        raise
+    return set(re.findall(r'href="([^"/?]+)"', html))
+
+
+def hours_in_listing(listing: RunListing, names: Iterable[str]) -> Set[int]:
+    """Forecast hours whose data file (and .idx when required) are listed."""
+    names = set(names)
+    pattern = re.compile(listing.pattern)
+    hours = set()
+    for name in names:
+        match = pattern.match(name)
+        if match and (not listing.needs_index or f"{name}.idx" in names):
+            hours.add(int(match.group(1)))
+    return hours
+
+
+class AvailabilityProbe:
+    """Answers "which of these hours exist now" with one listing per poll."""
+
+    def __init__(self):
+        # model -> {run: hours confirmed available}, newest runs last
+        self._confirmed: Dict[str, Dict[str, Set[int]]] = {}
+        self._lock = threading.Lock()
+
+    def _confirmed_for(self, model_id: str, run_key: str) -> Set[int]:
+        with self._lock:
+            runs = self._confirmed.setdefault(model_id, {})
+            if run_key not in runs:
+                runs[run_key] = set()
+                for stale in sorted(runs)[:-_RUNS_KEPT]:
+                    del runs[stale]
+            return runs[run_key]
+
+    def available_hours(
+        self,
+        model_id: str,
+        run_time: datetime,
+        hours: Iterable[int],
+        fallback: Callable[[str, datetime, int], bool],
+        herbie_product: Optional[str] = None
+    ) -> Set[int]:
+        """
+        Subset of ``hours`` that is published now.
+
+        Args:
+            hours: Forecast hours to check
+            fallback: Per-hour check, ``fallback(model_id, run_time, fh)``, used
+                      when the model has no listing or the listing fails
+            herbie_product: Product the Herbie fetcher reads (selects the file family)
+
+        Returns:
+            Set of available forecast hours
+        """
+        hours = set(hours)
+        confirmed = self._confirmed_for(model_id, run_time.strftime("%Y%m%d_%H"))
+        unknown = hours - confirmed
+        if not unknown:
+            return hours
+
+        listing = run_listing(model_id, run_time, herbie_product)
+        found: Optional[Set[int]] = None
+        if listing is not None:
+            try:
+                names = _list_s3(listing) if listing.kind == "s3" else _list_nomads(listing)
+                found = hours_in_listing(listing, names) & unknown
+                logger.debug(f"{model_id} listing: {len(names)} files, {len(found)}/{len(unknown)} pending hours present")
+            except Exception as e:
+                logger.warning(f"{model_id} availability listing failed ({e}), checking hours individually")
+
+        if found is None:
+            found = {fh for fh in sorted(unknown) if fallback(model_id, run_time, fh)}
+
+        with self._lock:
+            confirmed |= found
+        return hours & confirmed
+
+
+_probe: Optional[AvailabilityProbe] = None
+
+
+def get_availability_probe() -> AvailabilityProbe:
+    """Process-wide probe shared by every model's polling thread."""
+    global _probe
+    if _probe is None:
+        _probe = AvailabilityProbe()
+    return _probe
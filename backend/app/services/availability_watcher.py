@@ -0,0 +1,234 @@
+"""Adaptive availability polling driven by learned publish latency.
+
+A fixed 60 s poll leaves every hour waiting half an interval on average after
+NOAA publishes it, and most polls early in a run find nothing. The watcher
+learns, per model and forecast hour, how long after the run's init time
+each hour usually appears. Between polls it sleeps until the next pending
+hour is nearly due. Around the due time it polls about once per typical
+prediction error, and it backs off again if the hour is badly overdue
+(unless later hours are coming due). Hours it finds are handed
+straight back to the caller for submission.
+
+Latency is learned only from hours the watcher saw missing and then found,
+so an hour published long before the scheduler started does not inflate it.
+Stored as JSON next to the images directory.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+import json
+import logging
+import os
+import threading
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Weight of a new observation in the per-hour moving average
+_EMA_ALPHA = 0.3
+
+# Weight of a new observation in the run's early/late bias. Latencies average
+# over many runs, but the bias starts at zero every run and has to catch up
+# with a run that is late as a whole within its first few hours
+_BIAS_GAIN = 0.6
+
+# Overdue hours are polled at the minimum interval for this long, then backed off
+_OVERDUE_TIGHT_SECONDS = 15 * 60
+
+
+class PublishLatency:
+    """Seconds from run init to publication, per model and forecast hour."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: JSON file (default: {storage_path}/../publish_latency.json)
+        """
+        self.path = Path(path or (Path(settings.storage_path).parent / "publish_latency.json"))
+        self._lock = threading.Lock()
+        self._latency: Dict[str, Dict[int, float]] = {}
+        # model -> moving average of |observed - expected| seconds
+        self._spread: Dict[str, float] = {}
+        try:
+            raw = json.loads(self.path.read_text())
+            self._latency = {
+                model: {int(fh): float(s) for fh, s in hours.items()}
+                for model, hours in raw.get('latency', {}).items()
+            }
+            self._spread = {model: float(s) for model, s in raw.get('spread', {}).items()}
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def observe(self, model_id: str, forecast_hour: int, delay_seconds: float) -> None:
+        """Fold one observed publish delay into the moving averages."""
+        expected = self.expected(model_id, forecast_hour)
+        with self._lock:
+            model = model_id.upper()
+            hours = self._latency.setdefault(model, {})
+            previous = hours.get(forecast_hour)
+            hours[forecast_hour] = delay_seconds if previous is None else (
+                previous + _EMA_ALPHA * (delay_seconds - previous)
+            )
+            if expected is not None:
+                error = abs(delay_seconds - expected)
+                spread = self._spread.get(model)
+                self._spread[model] = error if spread is None else spread + _EMA_ALPHA * (error - spread)
+    
+    def spread(self, model_id: str) -> Optional[float]:
+        """Typical prediction error in seconds, or None before any prediction was checked."""
+        with self._lock:
+            return self._spread.get(model_id.upper())
+
+    def expected(self, model_id: str, forecast_hour: int) -> Optional[float]:
+        """
+        Expected publish delay of one hour.
+
+        Unobserved hours inside the observed range are interpolated linearly
+        between their neighbours. Hours outside it are not extrapolated:
+        publication steps are not evenly spaced in forecast hours (GFS goes
+        3-hourly to 12-hourly), so a guess there would be worse than none.
+
+        Returns:
+            Seconds after run init, or None if it cannot be estimated
+        """
+        with self._lock:
+            hours = dict(self._latency.get(model_id.upper(), {}))
+        if forecast_hour in hours:
+            return hours[forecast_hour]
+        below = [fh for fh in hours if fh < forecast_hour]
+        above = [fh for fh in hours if fh > forecast_hour]
+        if not below or not above:
+            return None
+        lo, hi = max(below), min(above)
+        return hours[lo] + (hours[hi] - hours[lo]) * (forecast_hour - lo) / (hi - lo)
+
+    def save(self) -> None:
+        with self._lock:
+            data = {
+                'latency': {model: {str(fh): round(s, 1) for fh, s in sorted(hours.items())}
+                            for model, hours in self._latency.items()},
+                'spread': {model: round(s, 1) for model, s in self._spread.items()},
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=1))
+        os.replace(tmp_path, self.path)
+
+
+class AvailabilityWatcher:
+    """Tracks one run's pending hours and decides when to look again."""
+
+    def __init__(
+        self,
+        model_id: str,
+        run_time: datetime,
+        forecast_hours: Iterable[int],
+        probe: Callable[[List[int]], Set[int]],
+        base_interval: float,
+        latency: Optional[PublishLatency] = None,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            probe: Returns the subset of the given hours that is published now
+            base_interval: Interval used while no latency is known for the run's
+                           pending hours (the previous fixed poll interval)
+            latency: Learned latencies (default: the process-wide store)
+            min_interval, max_interval: Clamp for adaptive intervals
+                                        (default: settings.poll_min_seconds / poll_max_seconds)
+            clock: Time source (replaced by the replay harness)
+        """
+        self.model_id = model_id
+        run_time = run_time if run_time.tzinfo else run_time.replace(tzinfo=timezone.utc)
+        self.run_ts = run_time.timestamp()
+        self.unseen: Set[int] = set(forecast_hours)
+        self.probe = probe
+        self.base_interval = base_interval
+        self.latency = latency or get_publish_latency()
+        self.min_interval = min_interval if min_interval is not None else settings.poll_min_seconds
+        self.max_interval = max_interval if max_interval is not None else settings.poll_max_seconds
+        self.clock = clock
+        # Hours a poll found missing; only these teach the latency model
+        self._seen_missing: Set[int] = set()
+        self._last_poll: Optional[float] = None
+        # How late (positive) or early this run publishes compared with the learned latency
+        self._bias = 0.0
+        self.polls = 0
+
+    def poll(self, hours: Iterable[int]) -> List[int]:
+        """
+        Hours among ``hours`` that are available now, learning from first sightings.
+
+        Returns:
+            Sorted available hours (including ones found by earlier polls)
+        """
+        hours = sorted(hours)
+        if not hours:
+            return []
+        self.polls += 1
+        available = set(self.probe(hours))
+        now = self.clock()
+
+        learned = False
+        for fh in sorted(available & self.unseen):
+            if fh in self._seen_missing:
+                # Published between the previous poll and this one
+                delay = (self._last_poll + now) / 2 - self.run_ts
+                expected = self.latency.expected(self.model_id, fh)
+                if expected is not None:
+                    self._bias += _BIAS_GAIN * ((delay - expected) - self._bias)
+                self.latency.observe(self.model_id, fh, delay)
+                learned = True
+        self._last_poll = now
+        self.unseen -= available
+        self._seen_missing |= set(hours) - available
+        if learned:
+            try:
+                self.latency.save()
+            except OSError as e:
+                logger.debug(f"Could not save publish latency: {e}")
+        return sorted(available)
+
+    def next_interval(self) -> float:
+        """Seconds until the next poll is worthwhile."""
+        if not self.unseen:
+            return self.base_interval
+        expected = [self.latency.expected(self.model_id, fh) for fh in self.unseen]
+        expected = [delay for delay in expected if delay is not None]
+        if not expected:
+            return self.base_interval
+
+        # From half a typical prediction error before the due time, poll once per error
+        spread = self.latency.spread(self.model_id)
+        lead = spread if spread is not None else self.base_interval
+        now = self.clock()
+        due = sorted(self.run_ts + delay + self._bias - now for delay in expected)
+        # An hour long overdue (missing upstream or skipped) does not hold the
+        # watcher at the base interval while later hours come due
+        current = [until for until in due if until > -_OVERDUE_TIGHT_SECONDS]
+        until_due = current[0] if current else due[0]
+        if until_due > lead / 2:
+            # Sleep until the next hour is nearly due
+            interval = until_due - lead / 2
+        elif until_due > -_OVERDUE_TIGHT_SECONDS:
+            interval = min(lead, self.base_interval)
+        else:
+            # Well past its usual time: the run is late or the hours are missing
+            interval = self.base_interval
+        return max(self.min_interval, min(self.max_interval, interval))
+
+
+_latency: Optional[PublishLatency] = None
+
+
+def get_publish_latency() -> PublishLatency:
+    """Process-wide latency store for the configured storage path."""
+    global _latency
+    path = Path(settings.storage_path).parent / "publish_latency.json"
+    if _latency is None or _latency.path != path:
+        _latency = PublishLatency(path)
+    return _latency
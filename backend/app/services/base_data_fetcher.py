@@ -2,8 +2,10 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Set, Dict, Tuple
+from typing import Callable, Optional, List, Set, Dict, Tuple
+import numpy as np
 import xarray as xr
+import hashlib
 import logging
 import tempfile
 import os
@@ -12,13 +14,28 @@ import time
 from app.models.model_registry import ModelRegistry, ModelConfig
 from app.models.variable_requirements import VariableRegistry
 from app.config import settings
+from app.services.accumulation_store import AccumulationStore
 
 logger = logging.getLogger(__name__)
 
 
+def _grid_digest(data: xr.DataArray) -> str:
+    """Digest of the coordinates on a field's dimensions (its grid)."""
+    digest = hashlib.sha1()
+    for name in sorted(data.coords):
+        coord = data.coords[name]
+        if coord.dims and set(coord.dims) <= set(data.dims) and coord.dtype.kind in 'fiu':
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(coord.values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
 class BaseDataFetcher(ABC):
     """Abstract base class for weather data fetchers"""
     
+    # Raw fields the accumulation helpers read from earlier forecast hours
+    _ACCUMULATION_FIELDS = {"apcp", "tp", "prate", "csnow", "tmp_850", "tmp2m"}
+    
     def __init__(self, model_id: str):
         """Initialize fetcher for a specific model"""
         self.model_config = ModelRegistry.get(model_id)
@@ -44,6 +61,12 @@ class BaseDataFetcher(ABC):
         # Key: (run_time_str, forecast_hour) -> Value: (precip_total, snow_total)
         self._accumulation_cache: Dict[Tuple[str, int], Tuple[Optional[xr.DataArray], Optional[xr.DataArray]]] = {}
         self._current_run_time_str: Optional[str] = None
+        
+        # Cross-process running sums (shared by all workers for a run)
+        self._accumulation_store = AccumulationStore(model_id)
+        
+        # (run, forecast hour, fields) -> source fingerprint, see input_fingerprints
+        self._source_fingerprints: Dict[Tuple[str, int, frozenset], Optional[str]] = {}
     
     def get_latest_run_time(self) -> datetime:
         """Get the latest available run time for this model"""
@@ -85,6 +108,139 @@ class BaseDataFetcher(ABC):
         """
         pass
     
+    def prefetch_raw_data(
+        self,
+        run_time: datetime,
+        forecast_hours: List[int],
+        raw_fields: Set[str],
+        subset_region: bool = True
+    ) -> None:
+        """
+        Warm the local GRIB cache for several forecast hours at once.
+        
+        Optional hook: fetchers that download whole files (NOMADS) override it
+        to download concurrently. The default does nothing and fetch_raw_data
+        downloads lazily.
+        """
+        return None
+    
+    def plan_hour_fields(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        raw_fields: Set[str]
+    ) -> None:
+        """
+        Announce every raw field build_dataset_for_maps will read for one hour.
+        
+        Optional hook: fetchers that pay per request (Herbie byte ranges)
+        override it to fetch the hour's fields in one download. The default
+        does nothing.
+        """
+        return None
+    
+    def _plan_reads(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        variables: List[str],
+        raw_fields: Set[str]
+    ) -> None:
+        """Pass plan_hour_fields the hour's fields and the earlier buckets snowfall reads"""
+        self.plan_hour_fields(run_time, forecast_hour, raw_fields | self._derived_fields_at_hour(forecast_hour, variables))
+        if VariableRegistry.needs_snow_total(variables) and not self.model_config.tp_is_accumulated_from_init:
+            # Precip and snow totals both read every bucket; fetch apcp and csnow together
+            for fh in range(self.model_config.forecast_increment, forecast_hour, self.model_config.forecast_increment):
+                self.plan_hour_fields(run_time, fh, {"apcp", "csnow"})
+    
+    def _derived_fields_at_hour(self, forecast_hour: int, variables: List[str]) -> Set[str]:
+        """Raw fields the derived-field helpers read at the forecast hour itself"""
+        accumulated = self.model_config.tp_is_accumulated_from_init
+        fields: Set[str] = set()
+        if VariableRegistry.needs_precip_total(variables):
+            if forecast_hour == 0:
+                fields |= {"tp", "prate"}
+            else:
+                fields.add("tp" if accumulated else "apcp")
+        if VariableRegistry.needs_snow_total(variables):
+            fields |= {"tmp2m"} if forecast_hour == 0 else {"apcp", "csnow"}
+        if VariableRegistry.needs_precip_6hr_rate(variables):
+            fields |= {"prate", "tmp2m"} if forecast_hour < 6 else {"tp"}
+        return fields
+    
+    def input_fingerprints(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        variables: List[str]
+    ) -> Dict[str, str]:
+        """
+        Fingerprint the GRIB inputs each variable's map is built from.
+        
+        Covers the forecast hour itself and, for accumulated and 6-hour rate
+        products, every earlier hour the accumulation reads. A missing earlier
+        bucket is part of the fingerprint, so a total rendered while a bucket
+        was unavailable changes fingerprint once the bucket appears.
+        
+        Returns:
+            {variable: hex digest}; variables whose inputs this fetcher cannot
+            fingerprint (or whose hour is not published yet) are omitted
+        """
+        run_time_str = run_time.strftime("%Y%m%d_%H")
+        increment = self.model_config.forecast_increment
+        accumulated = self.model_config.tp_is_accumulated_from_init
+        
+        fingerprints = {}
+        for variable in variables:
+            req = VariableRegistry.get(variable)
+            if req is None:
+                continue
+            
+            hours = {forecast_hour: set(req.raw_fields) | set(req.optional_fields)}
+            earlier = []
+            if (req.needs_precip_total or req.needs_snow_total) and not accumulated:
+                earlier = list(range(increment, forecast_hour, increment))
+            elif req.needs_precip_6hr_rate and accumulated and forecast_hour >= 6:
+                earlier = [forecast_hour - 6]
+            if req.needs_precip_total or req.needs_snow_total or req.needs_precip_6hr_rate:
+                hours[forecast_hour] |= self._ACCUMULATION_FIELDS
+            for fh in earlier:
+                hours.setdefault(fh, set()).update(self._ACCUMULATION_FIELDS)
+            
+            parts = []
+            for fh in sorted(hours):
+                key = (run_time_str, fh, frozenset(hours[fh]))
+                if key not in self._source_fingerprints:
+                    try:
+                        self._source_fingerprints[key] = self._source_fingerprint(run_time, fh, hours[fh])
+                    except Exception as e:
+                        logger.debug(f"    No input fingerprint for f{fh:03d}: {e}")
+                        self._source_fingerprints[key] = None
+                fingerprint = self._source_fingerprints[key]
+                if fingerprint is None and fh == forecast_hour:
+                    break
+                parts.append(f"f{fh:03d}={fingerprint or 'missing'}")
+            else:
+                digest = hashlib.sha1(f"{self.model_id}|{run_time_str}|{'|'.join(parts)}".encode())
+                fingerprints[variable] = digest.hexdigest()
+        return fingerprints
+    
+    def _source_fingerprint(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        raw_fields: Set[str]
+    ) -> Optional[str]:
+        """
+        Identity of the published GRIB bytes holding ``raw_fields`` for one hour.
+        
+        Optional hook for input_fingerprints. Must be cheap (index or URL
+        metadata, never the data itself). The default cannot fingerprint and
+        returns None, which makes the scheduler fall back to "rendered once is
+        done".
+        """
+        return None
+    
     def build_dataset_for_maps(
         self,
         run_time: datetime,
@@ -108,6 +264,7 @@ class BaseDataFetcher(ABC):
         # Get all raw fields needed
         all_raw_fields = VariableRegistry.get_all_raw_fields(variables)
         logger.info(f"  Raw fields needed: {sorted(all_raw_fields)}")
+        self._plan_reads(run_time, forecast_hour, variables, all_raw_fields)
         
         # Fetch raw data once
         ds = self.fetch_raw_data(run_time, forecast_hour, all_raw_fields, subset_region)
@@ -185,54 +342,41 @@ class BaseDataFetcher(ABC):
             return tp
         
         else:
-            # Bucketed: compute full accumulation from f000 to forecast_hour
-            # This is necessary because maps are generated in parallel (not sequentially),
-            # so we can't rely on previous hours being in the cache
-            logger.info(f"    Computing bucketed precip: summing all buckets from f000 to f{forecast_hour:03d}")
-            
-            precip_total = None
-            increment = self.model_config.forecast_increment
-
+            # Bucketed: running sum of buckets from f000 to forecast_hour.
+            # Maps are generated in parallel worker processes, so the previous
+            # hour's total comes from the shared on-disk accumulation store.
             def _drop_timeish(da: xr.DataArray) -> xr.DataArray:
                 drop_coords = [c for c in ['time', 'valid_time', 'step'] if c in da.coords]
                 if drop_coords:
                     da = da.drop_vars(drop_coords)
                 return da.squeeze()
             
-            # Loop through all forecast hours from increment to forecast_hour
-            # (skip f000 which has zero precip)
-            for fh in range(increment, forecast_hour + increment, increment):
-                if fh > forecast_hour:
-                    break
-                    
+            def _load_precip_bucket(fh: int) -> Optional[xr.DataArray]:
                 try:
                     ds = self.fetch_raw_data(run_time, fh, {"apcp"}, subset_region)
 
                     if 'apcp' in ds:
-                        p = self._precip_to_mm(
+                        return self._precip_to_mm(
                             _drop_timeish(ds['apcp']),
                             context=f"{self.model_id} apcp f{fh:03d}"
                         )
-                    elif 'tp' in ds:
-                        p = self._precip_to_mm(
+                    if 'tp' in ds:
+                        return self._precip_to_mm(
                             _drop_timeish(ds['tp']),
                             context=f"{self.model_id} tp f{fh:03d}"
                         )
-                    else:
-                        logger.warning(f"      No apcp/tp in f{fh:03d}, skipping")
-                        continue
-
-                    if precip_total is None:
-                        precip_total = p.copy(deep=True)
-                    else:
-                        precip_total = precip_total + p
-                    
-                    logger.debug(f"      Added bucket f{fh:03d}")
+                    logger.warning(f"      No apcp/tp in f{fh:03d}, skipping")
                 
                 except FileNotFoundError:
                     logger.warning(f"      f{fh:03d} not found, skipping")
                 except Exception as e:
                     logger.error(f"      Error fetching f{fh:03d}: {e}")
+                return None
+            
+            precip_total = self._accumulate_buckets(
+                run_time, forecast_hour, "tp_total_mm", _load_precip_bucket, subset_region,
+                prefetch_fields={"apcp"}
+            )
             
             if precip_total is None:
                 raise ValueError(f"No precipitation data available from f000 to f{forecast_hour:03d}")
@@ -241,6 +385,121 @@ class BaseDataFetcher(ABC):
             self._accumulation_cache[cache_key] = (precip_total, None)
             return precip_total
     
+    def _accumulate_buckets(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        field: str,
+        load_bucket: Callable[[int], Optional[xr.DataArray]],
+        subset_region: bool = True,
+        prefetch_fields: Optional[Set[str]] = None
+    ) -> Optional[xr.DataArray]:
+        """
+        Running sum of bucket values from the first bucket through forecast_hour.
+        
+        Resumes from the newest running sum in the shared AccumulationStore, so
+        a worker normally reads one bucket and does one add instead of
+        re-reading every bucket since f000. Each new running sum is persisted
+        for other workers as long as no bucket in the chain was skipped.
+        
+        Args:
+            field: Store key for the running sum (e.g., "tp_total_mm")
+            load_bucket: Returns the bucket for a forecast hour (already unit
+                         converted), or None if the bucket should be skipped
+            prefetch_fields: Raw fields load_bucket fetches; when given, all
+                             pending bucket files are prefetched concurrently
+        
+        Returns:
+            Running total as a DataArray on the bucket grid, or None if no
+            bucket could be read.
+        """
+        run_time_str = run_time.strftime("%Y%m%d_%H")
+        store_field = field if subset_region else f"{field}_full"
+        increment = self.model_config.forecast_increment
+        hours = list(range(increment, forecast_hour + 1, increment))
+        
+        store = self._accumulation_store
+        store.activate_run(run_time_str)
+        start_hour, stored = store.latest(run_time_str, store_field, hours)
+        
+        while True:
+            if stored is not None and start_hour == forecast_hour:
+                logger.info(f"    Resuming {field} from stored f{start_hour:03d} running sum")
+                # Exact hit: a bucket is read only as the coordinate template,
+                # from the nearest hour that loads
+                template = next(
+                    (bucket for bucket in (load_bucket(fh) for fh in reversed(hours)) if bucket is not None),
+                    None
+                )
+                if template is None:
+                    logger.warning(f"    No {field} bucket readable as a grid template for stored f{start_hour:03d}")
+                    return None
+                if self._matches_stored_grid(stored, template, run_time_str, store_field, start_hour):
+                    return template.copy(data=np.array(stored, dtype=template.dtype))
+                logger.warning(f"    Stored {field} f{start_hour:03d} is on a different grid; recomputing from f000")
+                start_hour, stored = 0, None
+                continue
+            
+            if stored is not None:
+                logger.info(f"    Resuming {field} from stored f{start_hour:03d} running sum")
+                pending = [fh for fh in hours if fh > start_hour]
+            else:
+                logger.info(f"    Accumulating {field} from f000 through f{forecast_hour:03d}")
+                pending = hours
+            
+            if prefetch_fields and len(pending) > 1:
+                self.prefetch_raw_data(run_time, pending, prefetch_fields, subset_region)
+            
+            total = None
+            grid = None
+            chain_intact = True
+            grid_mismatch = False
+            
+            for fh in pending:
+                bucket = load_bucket(fh)
+                if bucket is None:
+                    chain_intact = False
+                    continue
+                
+                if total is None:
+                    if stored is not None:
+                        if not self._matches_stored_grid(stored, bucket, run_time_str, store_field, start_hour):
+                            grid_mismatch = True
+                            break
+                        total = bucket.copy(data=np.asarray(stored, dtype=bucket.dtype) + bucket.values)
+                    else:
+                        total = bucket.copy(deep=True)
+                    grid = _grid_digest(bucket)
+                else:
+                    total = total + bucket
+                
+                logger.debug(f"      Added bucket f{fh:03d}")
+                if chain_intact:
+                    store.save(run_time_str, store_field, fh, total.values, grid=grid)
+            
+            if not grid_mismatch:
+                return total
+            
+            logger.warning(
+                f"    Stored {field} f{start_hour:03d} ({stored.shape}) does not match "
+                f"the bucket grid {bucket.shape}; recomputing from f000"
+            )
+            start_hour, stored = 0, None
+    
+    def _matches_stored_grid(
+        self,
+        stored: np.ndarray,
+        bucket: xr.DataArray,
+        run_time_str: str,
+        store_field: str,
+        forecast_hour: int
+    ) -> bool:
+        """Whether a stored running sum lies on a bucket's grid (shape and coordinates)."""
+        if stored.shape != bucket.shape:
+            return False
+        stored_grid = self._accumulation_store.load_grid(run_time_str, store_field, forecast_hour)
+        return stored_grid is None or stored_grid == _grid_digest(bucket)
+    
     def _compute_total_snowfall(
         self,
         run_time: datetime,
@@ -331,124 +590,51 @@ class BaseDataFetcher(ABC):
             self._accumulation_cache[cache_key] = (precip_cached, result)
             return result
 
-        if self.model_id == "HRRR":
-            logger.info("    Using APCP * 10 with CSNOW mask (HRRR path)")
-
-            snow_liq_mm_total = None
-            increment = self.model_config.forecast_increment
-            hours_to_process = list(range(increment, forecast_hour + increment, increment))
-            logger.info(f"    Accumulating HRRR snowfall from f000 through {hours_to_process}")
-
-            for fh in hours_to_process:
+        snow_liq_mm_total = None
+        
+        # Branch: model has native precip-type masks?
+        if self.model_id == "HRRR" or self.model_config.has_precip_type_masks:
+            if self.model_id == "HRRR":
+                logger.info("    Using APCP * 10 with CSNOW mask (HRRR path)")
+            else:
+                logger.info("    Using native CSNOW mask (GFS path)")
+            
+            def _load_snow_bucket(fh: int) -> Optional[xr.DataArray]:
+                """Liquid-equivalent snow (mm) for one bucket, or None to skip it"""
                 try:
                     ds = self.fetch_raw_data(run_time, fh, {'apcp', 'csnow'}, subset_region)
-
+                    
                     p_mm = _get_bucket_precip_mm(ds)
-
+                    
                     if 'csnow' not in ds:
+                        # Model claims masks but csnow missing => skip this bucket
                         logger.warning(f"CSNOW missing at f{fh:03d}, skipping bucket")
-                        if snow_liq_mm_total is None:
-                            raise ValueError(f"No snowfall data for f{fh:03d}")
-                        continue
-
-                    # Normalize csnow to [0,1]
+                        return None
+                    
                     cs = _drop_timeish(ds['csnow'])
+                    
+                    # Normalize csnow to [0,1]
                     cs_units = (cs.attrs.get('units') or '').lower()
                     if cs_units in ('%', 'percent'):
                         cs_frac = (cs / 100.0)
                     else:
+                        # Heuristic: if max > 1.5 => likely 0-100 scale
                         cs_frac = (cs / 100.0) if float(cs.max()) > 1.5 else cs
-                    cs_frac = cs_frac.clip(0.0, 1.0)
-
-                    snow_bucket_mm = p_mm * cs_frac
-
-                    snow_liq_mm_total = (snow_bucket_mm.copy(deep=True) if snow_liq_mm_total is None
-                                        else (snow_liq_mm_total + snow_bucket_mm))
-
-                except FileNotFoundError:
-                    logger.warning(f"Data not found for f{fh:03d}")
-                    if snow_liq_mm_total is None:
-                        raise ValueError(f"No snowfall data for f{fh:03d}")
-                except Exception as e:
-                    logger.error(f"Error computing HRRR snowfall for f{fh:03d}: {e}")
-                    if snow_liq_mm_total is None:
-                        raise
-
-            if snow_liq_mm_total is None:
-                raise ValueError(f"No snowfall/precip data available up to f{forecast_hour:03d}")
-
-            snow_in_10to1 = (snow_liq_mm_total / 25.4) * 10.0
-            snow_in_10to1 = _drop_timeish(snow_in_10to1)
-
-            precip_cached, _ = self._accumulation_cache.get(cache_key, (None, None))
-            self._accumulation_cache[cache_key] = (precip_cached, snow_in_10to1)
-            return snow_in_10to1
-        
-        # Try to get previous accumulation for incremental update
-        prev_hour = forecast_hour - self.model_config.forecast_increment
-        prev_key = (run_time_str, prev_hour)
-        
-        snow_liq_mm_total = None
-        hours_to_process = []
-        
-        if prev_hour > 0 and prev_key in self._accumulation_cache:
-            _, snow_prev_in = self._accumulation_cache[prev_key]
-            if snow_prev_in is not None:
-                logger.info(f"    Reusing f{prev_hour:03d} snowfall, adding f{forecast_hour:03d} bucket")
-                # Convert previous snow (in inches) back to liquid mm for accumulation
-                snow_liq_mm_total = (snow_prev_in / 10.0) * 25.4  # inches -> mm liquid
-                # Only process the current bucket
-                hours_to_process = [forecast_hour]
-        
-        # If no cached data, accumulate from all hours
-        if not hours_to_process:
-            increment = self.model_config.forecast_increment
-            hours_to_process = list(range(increment, forecast_hour + increment, increment))
-            logger.info(f"    No cache, accumulating snowfall from f000 through {hours_to_process}")
-        
-        # Process each forecast hour bucket
-        for fh in hours_to_process:
-            # Branch: model has native precip-type masks?
-            if self.model_config.has_precip_type_masks:
-                # -------- GFS PATH (native csnow) --------
-                logger.info(f"    Using native CSNOW mask (GFS path) for f{fh:03d}")
-                
-                try:
-                    ds = self.fetch_raw_data(run_time, fh, {'apcp', 'csnow'}, subset_region)
                     
-                    p_mm = _get_bucket_precip_mm(ds)
+                    cs_frac = cs_frac.clip(0.0, 1.0)
                     
-                    if 'csnow' not in ds:
-                        # Model claims masks but csnow missing => treat as no-snow for this bucket
-                        logger.warning(f"CSNOW missing at f{fh:03d}, skipping bucket")
-                        if snow_liq_mm_total is None:
-                            raise ValueError(f"No snowfall data for f{fh:03d}")
-                    else:
-                        cs = _drop_timeish(ds['csnow'])
-                        
-                        # Normalize csnow to [0,1]
-                        cs_units = (cs.attrs.get('units') or '').lower()
-                        if cs_units in ('%', 'percent'):
-                            cs_frac = (cs / 100.0)
-                        else:
-                            # Heuristic: if max > 1.5 => likely 0-100 scale
-                            cs_frac = (cs / 100.0) if float(cs.max()) > 1.5 else cs
-                        
-                        cs_frac = cs_frac.clip(0.0, 1.0)
-                        
-                        snow_bucket_mm = p_mm * cs_frac
-                        
-                        snow_liq_mm_total = (snow_bucket_mm.copy(deep=True) if snow_liq_mm_total is None 
-                                            else (snow_liq_mm_total + snow_bucket_mm))
+                    return p_mm * cs_frac
                 
                 except FileNotFoundError:
                     logger.warning(f"Data not found for f{fh:03d}")
-                    if snow_liq_mm_total is None:
-                        raise ValueError(f"No snowfall data for f{fh:03d}")
                 except Exception as e:
                     logger.error(f"Error computing snowfall (mask path) for f{fh:03d}: {e}")
-                    if snow_liq_mm_total is None:
-                        raise
+                return None
+            
+            snow_liq_mm_total = self._accumulate_buckets(
+                run_time, forecast_hour, "snow_liq_mm", _load_snow_bucket, subset_region,
+                prefetch_fields={'apcp', 'csnow'}
+            )
         
         if snow_liq_mm_total is None:
             raise ValueError(f"No snowfall/precip data available up to f{forecast_hour:03d}")
@@ -0,0 +1,120 @@
+"""Cross-process download deduplication.
+
+The scheduler renders forecast hours in 8-10 worker processes, each with its
+own fetcher, so two workers regularly need the same GRIB file at the same
+time (e.g. the f006 map and the f009 accumulation both need f006 APCP).
+Without coordination both download it.
+
+Each download is guarded by an exclusive ``flock`` on a lock file named
+after its cache key. The first worker takes the lock and downloads; the
+others block on the lock (that is the in-flight marker) and, once it is
+released, re-check the cache and reuse the finished file instead of fetching
+it again. Locks are released by the kernel if a worker dies, so a crashed
+download never wedges the others.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+import hashlib
+import logging
+import os
+import re
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process locking
+    fcntl = None
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DownloadCoordinator:
+    """Per-key exclusive file locks shared by every worker on the host."""
+
+    def __init__(self, lock_dir: Optional[Path] = None, timeout: float = 600.0, poll_interval: float = 0.2):
+        """
+        Args:
+            lock_dir: Directory for lock files (default: sibling of storage_path)
+            timeout: Seconds to wait for another worker before downloading anyway
+            poll_interval: Seconds between lock attempts while waiting
+        """
+        self.lock_dir = lock_dir or (Path(settings.storage_path).parent / "download_locks")
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def _lock_path(self, key: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+        if len(safe) > 120:
+            safe = f"{safe[:80]}_{hashlib.sha1(key.encode()).hexdigest()[:16]}"
+        return self.lock_dir / f"{safe}.lock"
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[bool]:
+        """
+        Hold the exclusive lock for ``key``.
+
+        Yields:
+            True if another worker held the lock while we waited (the caller
+            should re-check its cache), False if it was free.
+        """
+        if fcntl is None:
+            yield False
+            return
+
+        fd = os.open(self._lock_path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        waited = False
+        locked = False
+        try:
+            deadline = time.monotonic() + self.timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    if not waited:
+                        logger.info(f"    Waiting for another worker to finish {key}")
+                        waited = True
+                    if time.monotonic() >= deadline:
+                        logger.warning(f"    Timed out waiting for {key} after {self.timeout:.0f}s, proceeding")
+                        break
+                    time.sleep(self.poll_interval)
+            yield waited
+        finally:
+            if locked:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def fetch_once(self, key: str, ready: Callable[[], Optional[T]], produce: Callable[[], T]) -> T:
+        """
+        Produce a shared artifact at most once across workers.
+
+        Args:
+            key: Cache key identifying the artifact
+            ready: Returns the finished artifact if it already exists, else None
+            produce: Creates the artifact (called with the lock held)
+        """
+        with self.lock(key) as waited:
+            result = ready()
+            if result is not None:
+                if waited:
+                    logger.info(f"    Reusing {key} downloaded by another worker")
+                return result
+            return produce()
+
+
+_coordinator: Optional[DownloadCoordinator] = None
+
+
+def get_download_coordinator() -> DownloadCoordinator:
+    """Process-wide coordinator (lock files are shared across processes)."""
+    global _coordinator
+    if _coordinator is None:
+        _coordinator = DownloadCoordinator()
+    return _coordinator
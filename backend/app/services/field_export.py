@@ -0,0 +1,183 @@
+"""Quantised gridded-field export for client-side rendering.
+
+Every visual change used to need a server-side matplotlib render. The
+scheduler can also write the fields behind the maps (2 m temperature, total
+precipitation and snowfall, 6-hour precip rate, composite reflectivity and
+10 m wind components) as compact fixed-point arrays per (model, run,
+forecast hour), which the frontend colour-maps itself.
+
+Each field is quantised with a fixed per-field scale and offset
+(``value = offset + scale * q``; the dtype's maximum marks missing data), so
+frames of one field are directly comparable and a colour or unit change on
+the client needs no re-render. Fields are stored on a regular lat/lon grid,
+rows south to north, raw little-endian plus a gzip copy for transport.
+
+Layout::
+
+    {storage_path}/../fields/{model}/{run}/{fh:03d}/index.json
+    {storage_path}/../fields/{model}/{run}/{fh:03d}/{field}.bin[.gz]
+"""
+from pathlib import Path
+from typing import Dict, Optional
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import xarray as xr
+
+from app.config import settings
+from app.services.tile_renderer import regular_grid
+
+logger = logging.getLogger(__name__)
+
+# Dataset field -> (dtype, offset, scale, units). Ranges cover physical extremes:
+# tmp2m 150-805 K, precip 0-3276 mm, snow 0-655 in, rate 0-327 mm/hr,
+# reflectivity -32-95 dBZ, wind components +/-163 m/s.
+EXPORT_FIELDS = {
+    'tmp2m': ('uint16', 150.0, 0.01, 'K'),
+    'tp_total': ('uint16', 0.0, 0.05, 'mm'),
+    'tp_snow_total': ('uint16', 0.0, 0.01, 'in'),
+    'p6_rate_mmhr': ('uint16', 0.0, 0.005, 'mm/hr'),
+    'refc': ('uint8', -32.0, 0.5, 'dBZ'),
+    'ugrd10m': ('uint16', -163.0, 0.005, 'm/s'),
+    'vgrd10m': ('uint16', -163.0, 0.005, 'm/s'),
+}
+
+# Field -> other names it has in datasets from fetchers that keep cfgrib's
+# cfVarName (the NOMADS fetcher, used for AIGFS); MapGenerator accepts the same
+FIELD_ALIASES = {
+    'tmp2m': ('t2m',),
+    'ugrd10m': ('u10',),
+    'vgrd10m': ('v10',),
+    'prmsl': ('msl',),
+}
+
+
+def resolve_field(ds: xr.Dataset, field: str) -> Optional[str]:
+    """Name under which a field is present in ``ds`` (its own name first), or None."""
+    for name in (field,) + FIELD_ALIASES.get(field, ()):
+        if name in ds:
+            return name
+    return None
+
+
+def quantize(values: np.ndarray, dtype: str, offset: float, scale: float) -> np.ndarray:
+    """
+    Fixed-point encode a float array.
+
+    NaN becomes the dtype's maximum (the nodata value); everything else is
+    rounded and clipped to the remaining range.
+    """
+    nodata = np.iinfo(dtype).max
+    q = np.rint((values - offset) / scale)
+    q = np.clip(np.nan_to_num(q, nan=nodata), 0, nodata - 1)
+    q[np.isnan(values)] = nodata
+    return q.astype(np.dtype(dtype).newbyteorder('<'))
+
+
+def dequantize(q: np.ndarray, offset: float, scale: float) -> np.ndarray:
+    """Inverse of quantize (nodata becomes NaN)."""
+    values = offset + scale * q.astype(np.float32)
+    values[q == np.iinfo(q.dtype).max] = np.nan
+    return values
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class FieldExporter:
+    """Writes and locates quantised fields per (model, run, forecast hour)."""
+
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Args:
+            root: Export root directory (default: {storage_path}/../fields)
+        """
+        self.root = Path(root or (Path(settings.storage_path).parent / "fields"))
+
+    def hour_dir(self, model: str, run_time: str, forecast_hour: int) -> Path:
+        return self.root / model.lower() / run_time / f"{forecast_hour:03d}"
+
+    def export(self, ds: xr.Dataset, model: str, run_time: str, forecast_hour: int) -> Dict[str, dict]:
+        """
+        Quantise and write every exportable field present in ``ds``.
+
+        Fields already exported for the hour and absent from ``ds`` are kept
+        in the index (an incremental rebuild may only carry some fields).
+
+        Returns:
+            The hour's index: {field: metadata}
+        """
+        hour_dir = self.hour_dir(model, run_time, forecast_hour)
+        hour_dir.mkdir(parents=True, exist_ok=True)
+        index = self.index(model, run_time, forecast_hour) or {}
+
+        for field, (dtype, offset, scale, units) in EXPORT_FIELDS.items():
+            name = resolve_field(ds, field)
+            if name is None:
+                continue
+            try:
+                values, lat, lon = regular_grid(ds[name].squeeze())
+            except Exception as e:
+                logger.warning(f"Could not export {field} f{forecast_hour:03d}: {e}")
+                continue
+            if values.ndim != 2 or len(lat) < 2 or len(lon) < 2:
+                continue
+
+            raw = quantize(values, dtype, offset, scale).tobytes()
+            _write_atomic(hour_dir / f"{field}.bin", raw)
+            _write_atomic(hour_dir / f"{field}.bin.gz", gzip.compress(raw, compresslevel=6, mtime=0))
+            index[field] = {
+                'dtype': dtype,
+                'byte_order': 'little',
+                'offset': offset,
+                'scale': scale,
+                'nodata': int(np.iinfo(dtype).max),
+                'units': units,
+                'shape': [len(lat), len(lon)],
+                'lat0': float(lat[0]),
+                'dlat': float((lat[-1] - lat[0]) / (len(lat) - 1)),
+                'lon0': float(lon[0]),
+                'dlon': float((lon[-1] - lon[0]) / (len(lon) - 1)),
+                'bytes': len(raw),
+                'etag': hashlib.sha256(raw).hexdigest()[:32],
+            }
+
+        if index:
+            _write_atomic(hour_dir / "index.json", json.dumps(index, sort_keys=True).encode())
+        return index
+
+    def index(self, model: str, run_time: str, forecast_hour: int) -> Optional[Dict[str, dict]]:
+        """Metadata of an exported hour, or None if nothing was exported."""
+        try:
+            return json.loads((self.hour_dir(model, run_time, forecast_hour) / "index.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def field_path(self, model: str, run_time: str, forecast_hour: int, field: str, encoding: Optional[str]) -> Path:
+        suffix = ".bin.gz" if encoding == 'gzip' else ".bin"
+        return self.hour_dir(model, run_time, forecast_hour) / f"{field}{suffix}"
+
+    def remove_run(self, model: str, run_time: str) -> None:
+        """Delete every exported field of one run (called by cleanup)."""
+        shutil.rmtree(self.root / model.lower() / run_time, ignore_errors=True)
+
+
+_exporter: Optional[FieldExporter] = None
+
+
+def get_field_exporter() -> FieldExporter:
+    """Process-wide exporter for the configured storage path."""
+    global _exporter
+    root = Path(settings.storage_path).parent / "fields"
+    if _exporter is None or _exporter.root != root:
+        _exporter = FieldExporter(root)
+    return _exporter
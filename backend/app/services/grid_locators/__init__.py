@@ -1,12 +1,13 @@
 """Grid locator strategies for model-agnostic station sampling."""
 
-from .base import GridLocator
+from .base import GridLocator, grid_fingerprint
 from .latlon_1d import LatLon1DLocator
 from .projected_xy import ProjectedXYLocator
 from .curvilinear_kdtree import CurvilinearKDTreeLocator
 
 __all__ = [
     'GridLocator',
+    'grid_fingerprint',
     'LatLon1DLocator',
     'ProjectedXYLocator',
     'CurvilinearKDTreeLocator',
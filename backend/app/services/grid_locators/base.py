@@ -1,26 +1,78 @@
 """Base class for grid locator strategies."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from pathlib import Path
+import hashlib
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import xarray as xr
 
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Grid index arrays (one per grid dimension) plus the dimension names they index
+GridIndex = Tuple[Tuple[np.ndarray, ...], Tuple[str, ...]]
+
+# Horizontal coordinate names inspected when fingerprinting a grid
+_GRID_COORDS = ('latitude', 'lat', 'longitude', 'lon', 'y', 'x')
+
+
+def grid_fingerprint(ds: xr.Dataset) -> str:
+    """
+    Stable fingerprint of a dataset's horizontal grid.
+    
+    Built from the shape and corner values of the horizontal coordinates and
+    any CF grid-mapping definition, so every forecast hour of every run on the
+    same (subset) grid has the same fingerprint, independent of field values.
+    
+    Returns:
+        Hex digest string
+    """
+    parts = []
+    for name in _GRID_COORDS:
+        if name in ds.coords:
+            vals = np.asarray(ds.coords[name].values)
+            if vals.ndim == 2:
+                corners = (vals[0, 0], vals[0, -1], vals[-1, 0], vals[-1, -1])
+            else:
+                corners = (vals.ravel()[0], vals.ravel()[-1])
+            parts.append(f"{name}{vals.shape}:" + ",".join(f"{float(c):.6f}" for c in corners))
+    
+    for var_name in ds.data_vars:
+        gm_name = ds[var_name].attrs.get('grid_mapping')
+        if gm_name and gm_name in ds:
+            gm_attrs = ds[gm_name].attrs
+            parts.append(f"gm:{gm_attrs.get('crs_wkt') or sorted(gm_attrs.items())}")
+            break
+    
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
 
 class GridLocator(ABC):
     """Abstract base class for grid location strategies."""
     
+    # Station -> grid index cache, shared by all locator instances in the process
+    # Key: (grid signature, station set key) -> GridIndex
+    _index_cache: Dict[tuple, GridIndex] = {}
+    
     @abstractmethod
-    def sample(self, ds: xr.Dataset, variable: str, 
-               stations: List['Station']) -> Dict[str, float]:
+    def locate(self, ds: xr.Dataset, variable: str,
+               lats: np.ndarray, lons: np.ndarray) -> GridIndex:
         """
-        Extract model values at station locations.
+        Find the nearest grid cell for every point in one vectorised pass.
         
         Args:
             ds: xarray Dataset with forecast data
-            variable: Variable name to sample
-            stations: List of Station objects with lat/lon
+            variable: Variable whose grid is searched
+            lats: Point latitudes (1D)
+            lons: Point longitudes (1D, -180 to 180)
         
         Returns:
-            Dictionary mapping station IDs to extracted values
+            (index arrays, dimension names) - one integer array per grid
+            dimension, each the same length as lats
         """
         pass
     
@@ -37,3 +89,138 @@ class GridLocator(ABC):
             True if this locator can sample from this dataset
         """
         pass
+    
+    def _grid_signature(self, ds: xr.Dataset, variable: str) -> tuple:
+        """
+        Cache key describing the grid a variable lives on.
+        
+        Every forecast hour of a run (and every run on the same grid) shares
+        one entry while a different subset or grid gets its own.
+        """
+        return (type(self).__name__, grid_fingerprint(ds), ds[variable].attrs.get('grid_mapping', ''))
+    
+    @staticmethod
+    def _points_key(lats: np.ndarray, lons: np.ndarray) -> tuple:
+        """Cache key for a set of points."""
+        digest = hashlib.sha1(lats.tobytes() + lons.tobytes()).hexdigest()
+        return (len(lats), digest)
+    
+    def get_indices(self, ds: xr.Dataset, variable: str,
+                    lats: np.ndarray, lons: np.ndarray) -> GridIndex:
+        """
+        locate() with a cache per (grid signature, station set).
+        
+        Lookups go memory -> disk (if settings.station_index_disk_cache) ->
+        locate(), so a restarted worker does not rebuild KD-trees or
+        re-project the catalog for grids it has already seen.
+        """
+        lats = np.ascontiguousarray(lats, dtype=np.float64)
+        lons = np.ascontiguousarray(lons, dtype=np.float64)
+        key = (self._grid_signature(ds, variable), self._points_key(lats, lons))
+        
+        index = self._index_cache.get(key)
+        if index is not None:
+            return index
+        
+        disk_path = self._disk_cache_path(key)
+        if disk_path is not None:
+            index = self._load_index(disk_path)
+        if index is None:
+            index = self.locate(ds, variable, lats, lons)
+            if disk_path is not None:
+                self._save_index(disk_path, index)
+        
+        self._index_cache[key] = index
+        return index
+    
+    @staticmethod
+    def _disk_cache_path(key: tuple) -> Optional[Path]:
+        """On-disk location of an index table, or None if disk caching is off."""
+        if not settings.station_index_disk_cache:
+            return None
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return Path(settings.storage_path).parent / "locator_cache" / f"{digest}.npz"
+    
+    @staticmethod
+    def _load_index(path: Path) -> Optional[GridIndex]:
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                dims = tuple(str(d) for d in data['dims'])
+                indices = tuple(data[f'idx{i}'] for i in range(len(dims)))
+            logger.debug(f"Loaded station index table {path.name}")
+            return indices, dims
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable station index table {path.name}: {e}")
+            return None
+    
+    @staticmethod
+    def _save_index(path: Path, index: GridIndex) -> None:
+        """Write an index table atomically (temp file + rename)."""
+        indices, dims = index
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            arrays = {f'idx{i}': np.asarray(idx, dtype=np.int64) for i, idx in enumerate(indices)}
+            np.savez(tmp_path, dims=np.array(dims), **arrays)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist station index table {path.name}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+    
+    def sample_points(self, ds: xr.Dataset, variable: str,
+                      lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        Extract model values at many points with a single gather.
+        
+        Returns:
+            float64 array aligned with lats/lons
+        """
+        if variable not in ds:
+            raise ValueError(f"Variable {variable} not in dataset")
+        
+        indices, dims = self.get_indices(ds, variable, lats, lons)
+        
+        da = ds[variable]
+        extra = [d for d in da.dims if d not in dims]
+        if extra:
+            # Singleton time/level dims are dropped; anything else is ambiguous
+            if any(da.sizes[d] != 1 for d in extra):
+                raise ValueError(f"Variable {variable} has non-grid dimensions {extra}")
+            da = da.squeeze(extra, drop=True)
+        
+        data = np.asarray(da.transpose(*dims).values)
+        return data[indices].astype(np.float64)
+    
+    def sample(self, ds: xr.Dataset, variable: str, 
+               stations: List['Station']) -> Dict[str, float]:
+        """
+        Extract model values at station locations.
+        
+        Args:
+            ds: xarray Dataset with forecast data
+            variable: Variable name to sample
+            stations: List of Station objects with lat/lon
+        
+        Returns:
+            Dictionary mapping station IDs to extracted values
+        """
+        if variable not in ds:
+            raise ValueError(f"Variable {variable} not in dataset")
+        if not stations:
+            return {}
+        
+        lats = np.array([s.lat for s in stations], dtype=np.float64)
+        lons = np.array([s.lon for s in stations], dtype=np.float64)
+        
+        try:
+            values = self.sample_points(ds, variable, lats, lons)
+        except Exception as e:
+            logger.warning(f"Could not sample {variable} at {len(stations)} stations: {e}")
+            return {}
+        
+        return {station.id: float(value) for station, value in zip(stations, values)}
@@ -1,11 +1,11 @@
 """Grid locator for true curvilinear grids (fallback)."""
 
 import logging
-from typing import Dict, List, Optional
+from typing import Optional
 import xarray as xr
 import numpy as np
 from scipy.spatial import cKDTree
-from .base import GridLocator
+from .base import GridLocator, GridIndex
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +15,7 @@ class CurvilinearKDTreeLocator(GridLocator):
     
     def __init__(self):
         self._kdtree_cache: Optional[cKDTree] = None
+        self._kdtree_signature: Optional[tuple] = None
         self._grid_shape_cache: Optional[tuple] = None
         self._uses_360_lon: Optional[bool] = None
     
@@ -31,9 +32,9 @@ class CurvilinearKDTreeLocator(GridLocator):
         return (ds.coords[lat_coord].ndim == 2 and
             ds.coords[lon_coord].ndim == 2)
     
-    def _build_kdtree(self, ds: xr.Dataset) -> cKDTree:
-        """Build KDTree from flattened lat/lon coordinates."""
-        if self._kdtree_cache is not None:
+    def _build_kdtree(self, ds: xr.Dataset, signature: tuple) -> cKDTree:
+        """Build KDTree from flattened lat/lon coordinates (once per grid)."""
+        if self._kdtree_cache is not None and self._kdtree_signature == signature:
             return self._kdtree_cache
         
         lat_coord = 'latitude' if 'latitude' in ds.coords else 'lat'
@@ -53,52 +54,26 @@ class CurvilinearKDTreeLocator(GridLocator):
         
         # Build KDTree
         self._kdtree_cache = cKDTree(coords)
+        self._kdtree_signature = signature
         logger.debug(f"Built KDTree with {len(coords)} grid points")
         
         return self._kdtree_cache
     
-    def sample(self, ds: xr.Dataset, variable: str, 
-               stations: List['Station']) -> Dict[str, float]:
-        """Sample using KDTree nearest neighbor search."""
-        if variable not in ds:
-            raise ValueError(f"Variable {variable} not in dataset")
-        
-        kdtree = self._build_kdtree(ds)
+    def locate(self, ds: xr.Dataset, variable: str,
+               lats: np.ndarray, lons: np.ndarray) -> GridIndex:
+        """Query the KDTree for all points in one call."""
+        kdtree = self._build_kdtree(ds, self._grid_signature(ds, variable))
         uses_360_lon = self._uses_360_lon
         
-        # Get dimension names from 2D lat coord
-        lat_coord = 'latitude' if 'latitude' in ds.coords else 'lat'
-        dim_names = ds.coords[lat_coord].dims
+        if uses_360_lon:
+            lons = np.where(lons < 0, lons % 360, lons)
+        else:
+            lons = np.where(lons > 180, lons - 360, lons)
         
-        values = {}
-        for station in stations:
-            try:
-                # Find nearest grid point
-                station_lon = station.lon
-                if uses_360_lon and station_lon < 0:
-                    station_lon = station_lon % 360
-                elif uses_360_lon is False and station_lon > 180:
-                    station_lon = station_lon - 360
-
-                station_coords = np.array([[station.lat, station_lon]])
-                _, idx = kdtree.query(station_coords, k=1)
-                
-                # Convert flat index to 2D indices
-                idx_2d = np.unravel_index(idx[0], self._grid_shape_cache)
-                
-                # Extract value using 2D indices
-                value = ds[variable].isel({
-                    dim_names[0]: idx_2d[0],
-                    dim_names[1]: idx_2d[1]
-                }).values
-                
-                if hasattr(value, 'item'):
-                    value = value.item()
-                
-                values[station.id] = float(value)
-                
-            except Exception as e:
-                logger.warning(f"Could not sample station {station.id}: {e}")
-                continue
+        _, flat_idx = kdtree.query(np.column_stack([lats, lons]), k=1)
+        
+        # Convert flat indices to 2D indices along the lat coord's dims
+        lat_coord = 'latitude' if 'latitude' in ds.coords else 'lat'
+        idx_2d = np.unravel_index(flat_idx, self._grid_shape_cache)
         
-        return values
+        return (idx_2d[0], idx_2d[1]), tuple(ds.coords[lat_coord].dims)
@@ -1,9 +1,10 @@
 """Grid locator for regular lat/lon grids (GFS, AIGFS)."""
 
 import logging
-from typing import Dict, List
+import numpy as np
+import pandas as pd
 import xarray as xr
-from .base import GridLocator
+from .base import GridLocator, GridIndex
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +24,9 @@ class LatLon1DLocator(GridLocator):
         return (ds.coords[lat_coord].ndim == 1 and 
                 ds.coords[lon_coord].ndim == 1)
     
-    def sample(self, ds: xr.Dataset, variable: str, 
-               stations: List['Station']) -> Dict[str, float]:
-        """Sample using .sel() with nearest neighbor."""
-        if variable not in ds:
-            raise ValueError(f"Variable {variable} not in dataset")
-        
+    def locate(self, ds: xr.Dataset, variable: str,
+               lats: np.ndarray, lons: np.ndarray) -> GridIndex:
+        """Nearest lat/lon index per point (same tie-breaking as .sel(method='nearest'))."""
         # Detect coordinate names
         lat_name = 'latitude' if 'latitude' in ds.coords else 'lat'
         lon_name = 'longitude' if 'longitude' in ds.coords else 'lon'
@@ -36,26 +34,10 @@ class LatLon1DLocator(GridLocator):
         # Detect 0-360 longitude format
         lon_vals = ds.coords[lon_name].values
         uses_360 = lon_vals.min() >= 0 and lon_vals.max() > 180
+        if uses_360:
+            lons = np.where(lons < 0, lons % 360, lons)
         
-        values = {}
-        for station in stations:
-            try:
-                station_lon = station.lon
-                if uses_360 and station_lon < 0:
-                    station_lon = station_lon % 360
-                
-                value = ds[variable].sel(
-                    {lat_name: station.lat, lon_name: station_lon},
-                    method='nearest'
-                ).values
-                
-                if hasattr(value, 'item'):
-                    value = value.item()
-                
-                values[station.id] = float(value)
-                
-            except Exception as e:
-                logger.warning(f"Could not sample station {station.id}: {e}")
-                continue
+        lat_idx = pd.Index(ds.coords[lat_name].values).get_indexer(lats, method='nearest')
+        lon_idx = pd.Index(lon_vals).get_indexer(lons, method='nearest')
         
-        return values
+        return (lat_idx, lon_idx), (ds.coords[lat_name].dims[0], ds.coords[lon_name].dims[0])
@@ -1,11 +1,12 @@
 """Grid locator for projected rectilinear grids (HRRR, RAP, NAM)."""
 
 import logging
-from typing import Dict, List, Optional
+from typing import Dict
 import xarray as xr
 import pyproj
 import numpy as np
-from .base import GridLocator
+import pandas as pd
+from .base import GridLocator, GridIndex
 
 logger = logging.getLogger(__name__)
 
@@ -158,33 +159,15 @@ class ProjectedXYLocator(GridLocator):
         
         return self._transformer_cache[sig]
     
-    def sample(self, ds: xr.Dataset, variable: str, 
-               stations: List['Station']) -> Dict[str, float]:
-        """Sample using projection transform + x/y selection."""
-        if variable not in ds:
-            raise ValueError(f"Variable {variable} not in dataset")
-        
+    def locate(self, ds: xr.Dataset, variable: str,
+               lats: np.ndarray, lons: np.ndarray) -> GridIndex:
+        """Transform all points to projected x/y at once, then nearest x/y index."""
         transformer = self._get_transformer(ds, variable)
         
-        values = {}
-        for station in stations:
-            try:
-                # Transform (lon, lat) to (x, y) in projection
-                x_proj, y_proj = transformer.transform(station.lon, station.lat)
-                
-                # Sample using x/y coordinates
-                value = ds[variable].sel(
-                    {'x': x_proj, 'y': y_proj},
-                    method='nearest'
-                ).values
-                
-                if hasattr(value, 'item'):
-                    value = value.item()
-                
-                values[station.id] = float(value)
-                
-            except Exception as e:
-                logger.warning(f"Could not sample station {station.id}: {e}")
-                continue
+        # Transform (lon, lat) to (x, y) in projection
+        x_proj, y_proj = transformer.transform(lons, lats)
+        
+        x_idx = pd.Index(ds.coords['x'].values).get_indexer(np.asarray(x_proj), method='nearest')
+        y_idx = pd.Index(ds.coords['y'].values).get_indexer(np.asarray(y_proj), method='nearest')
         
-        return values
+        return (y_idx, x_idx), (ds.coords['y'].dims[0], ds.coords['x'].dims[0])
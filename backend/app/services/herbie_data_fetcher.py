@@ -1,12 +1,16 @@
 """Herbie-based data fetcher for weather models"""
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import xarray as xr
+import hashlib
 import logging
+import threading
 import warnings
 
 from app.services.base_data_fetcher import BaseDataFetcher
+from app.services.download_coordinator import get_download_coordinator
 from app.config import settings
 
 # Suppress FutureWarnings from cfgrib about xarray compat parameter
@@ -16,6 +20,76 @@ warnings.filterwarnings('ignore', message='.*compat.*', category=FutureWarning,
 
 logger = logging.getLogger(__name__)
 
+# Data source priority (fallback order)
+PRIORITY_SOURCES = ['aws', 'nomads', 'google', 'azure']
+
+# Herbie objects that located their GRIB file, keyed by
+# (herbie model, product, run, fxx), least recently used first. Building one
+# probes every source and the .idx inventory is parsed lazily on the object,
+# so reusing it skips both. Shared by all fetchers of a process and the
+# scheduler's availability checks (forked workers inherit the scheduler's).
+_HERBIE_CACHE_SIZE = 256
+_herbie_cache: "OrderedDict[Tuple[str, str, str, int], object]" = OrderedDict()
+_herbie_cache_lock = threading.Lock()
+
+
+def herbie_save_dir(model_id: str) -> Path:
+    """Persistent Herbie download directory for a model, shared by all workers"""
+    return Path(settings.storage_path).parent / "herbie_cache" / f"{model_id.lower()}"
+
+
+def get_herbie(
+    model_id: str,
+    herbie_model: str,
+    run_time: datetime,
+    forecast_hour: int,
+    product: Optional[str] = None
+):
+    """
+    Herbie object for one run/forecast hour, reused while it stays cached.
+    
+    Objects that did not find a GRIB file are returned but not cached, so the
+    next availability poll probes the sources again.
+    
+    Args:
+        model_id: Our model ID (selects the save directory)
+        herbie_model: Herbie model name (e.g. "gfs")
+        product: Herbie product, or None for Herbie's default
+    """
+    from herbie import Herbie
+    
+    # Herbie expects timezone-naive datetime
+    run_time_naive = run_time.replace(tzinfo=None) if run_time.tzinfo else run_time
+    key = (herbie_model, product or "", f"{run_time_naive:%Y%m%d_%H}", forecast_hour)
+    with _herbie_cache_lock:
+        H = _herbie_cache.get(key)
+        if H is not None:
+            _herbie_cache.move_to_end(key)
+            return H
+    
+    save_dir = herbie_save_dir(model_id)
+    save_dir.mkdir(parents=True, exist_ok=True)
+    herbie_params = {
+        'date': run_time_naive,
+        'model': herbie_model,
+        'fxx': forecast_hour,
+        'save_dir': str(save_dir),
+        'overwrite': False,  # Don't re-download existing files
+        'priority': PRIORITY_SOURCES,  # Multi-source fallback
+        'verbose': False
+    }
+    if product:
+        herbie_params['product'] = product
+    logger.debug(f"  Herbie params: {herbie_params}")
+    H = Herbie(**herbie_params)
+    
+    if getattr(H, 'grib', None):
+        with _herbie_cache_lock:
+            _herbie_cache[key] = H
+            while len(_herbie_cache) > _HERBIE_CACHE_SIZE:
+                _herbie_cache.popitem(last=False)
+    return H
+
 
 class HerbieDataFetcher(BaseDataFetcher):
     """
@@ -30,6 +104,9 @@ class HerbieDataFetcher(BaseDataFetcher):
     Maintains compatibility with BaseDataFetcher interface.
     """
     
+    # Forecast hours whose merged download stays in memory
+    _HOUR_DATASETS_KEPT = 4
+    
     def __init__(self, model_id: str):
         """Initialize Herbie fetcher for a specific model"""
         super().__init__(model_id)
@@ -48,7 +125,7 @@ class HerbieDataFetcher(BaseDataFetcher):
         
         # Herbie cache configuration (CRITICAL for production)
         # Must be persistent, shared across workers, and not auto-deleted
-        self.herbie_save_dir = Path(settings.storage_path).parent / "herbie_cache" / f"{model_id.lower()}"
+        self.herbie_save_dir = herbie_save_dir(model_id)
         self.herbie_save_dir.mkdir(parents=True, exist_ok=True)
         
         # Model name mapping (your model_id → Herbie model name)
@@ -91,7 +168,12 @@ class HerbieDataFetcher(BaseDataFetcher):
         }
         
         # Data source priority (fallback order)
-        self.priority_sources = ['aws', 'nomads', 'google', 'azure']
+        self.priority_sources = PRIORITY_SOURCES
+        
+        # Fields build_dataset_for_maps will read per (run, hour), see plan_hour_fields
+        self._hour_plans: Dict[Tuple[str, int], Set[str]] = {}
+        # (run, hour, subset) -> [(fields downloaded, dataset), ...] for the most recent hours
+        self._hour_datasets: "OrderedDict[Tuple[str, int, bool], List[Tuple[frozenset, xr.Dataset]]]" = OrderedDict()
         
         logger.info(f"HerbieDataFetcher initialized for {model_id}")
         logger.info(f"  Cache directory: {self.herbie_save_dir}")
@@ -145,6 +227,114 @@ class HerbieDataFetcher(BaseDataFetcher):
         
         return search_string
     
+    def _create_herbie(self, run_time: datetime, forecast_hour: int):
+        """Herbie object for one run/forecast hour with this fetcher's sources and cache"""
+        return get_herbie(
+            self.model_id,
+            self._get_herbie_model_name(),
+            run_time,
+            forecast_hour,
+            getattr(self.model_config, 'herbie_product', None)
+        )
+    
+    @staticmethod
+    def _canonical_name(field: str) -> str:
+        """Dataset variable a raw field ends up as after _standardize_variable_names"""
+        return 'tp' if field == 'apcp' else field
+    
+    def plan_hour_fields(self, run_time: datetime, forecast_hour: int, raw_fields: Set[str]) -> None:
+        """
+        Merge the fields read for one hour into a single byte-range download.
+        
+        The first fetch_raw_data call for the hour downloads its own fields
+        plus the planned ones at once; later calls (accumulation helpers) are
+        answered from that download.
+        """
+        run_key = run_time.strftime("%Y%m%d_%H")
+        if any(key[0] != run_key for key in self._hour_plans):
+            self._hour_plans = {key: plan for key, plan in self._hour_plans.items() if key[0] == run_key}
+        self._hour_plans.setdefault((run_key, forecast_hour), set()).update(raw_fields)
+    
+    def _merge_fields(self, run_key: str, forecast_hour: int, raw_fields: Set[str]) -> Set[str]:
+        """
+        Requested fields plus the hour's planned fields that can share its download.
+        
+        Planned fields that would land on the same dataset variable as another
+        field with a different GRIB message (run-total ``tp`` vs. bucket
+        ``apcp``) are left out and fetched separately when asked for.
+        """
+        plan = self._hour_plans.pop((run_key, forecast_hour), set())
+        claimed: Dict[str, List[str]] = {}
+        for field in plan - set(raw_fields):
+            claimed.setdefault(self._canonical_name(field), []).append(field)
+        requested = {self._canonical_name(field) for field in raw_fields}
+        extras = {
+            fields[0] for name, fields in claimed.items()
+            if len(fields) == 1 and name not in requested
+        }
+        return set(raw_fields) | extras
+    
+    def _select_fields(self, ds: xr.Dataset, fetched: frozenset, raw_fields: Set[str]) -> xr.Dataset:
+        """
+        Shallow copy of a merged download without the variables only other requests asked for.
+        
+        Callers test for variables by name (``'prate' in ds``), so extra merged
+        fields must not leak into their result. Always returns a new Dataset
+        so callers adding variables do not alter the memoised one.
+        """
+        requested = {self._canonical_name(field) for field in raw_fields}
+        extra = {self._canonical_name(field) for field in fetched - set(raw_fields)} - requested
+        return ds.drop_vars([name for name in extra if name in ds.data_vars])
+    
+    def _from_memo(self, memo_key: Tuple[str, int, bool], raw_fields: Set[str]) -> Optional[xr.Dataset]:
+        """Answer a request from the hour's earlier downloads, or None if any field is missing"""
+        entries = self._hour_datasets.get(memo_key)
+        if not entries:
+            return None
+        parts: Dict[int, Tuple[frozenset, xr.Dataset, Set[str]]] = {}
+        for field in raw_fields:
+            index = next((i for i, (fetched, _) in enumerate(entries) if field in fetched), None)
+            if index is None:
+                return None
+            parts.setdefault(index, (*entries[index], set()))[2].add(field)
+        self._hour_datasets.move_to_end(memo_key)
+        datasets = [self._select_fields(ds, fetched, fields) for fetched, ds, fields in parts.values()]
+        if len(datasets) == 1:
+            return datasets[0]
+        return xr.merge(datasets, compat='override', join='outer')
+    
+    def _source_fingerprint(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        raw_fields: Set[str]
+    ) -> Optional[str]:
+        """
+        Fingerprint an hour's inputs from the GRIB index (.idx) only.
+        
+        Hashes the matched message names and their byte ranges, which is
+        what a byte-range download fetches; a republished or extended file
+        shifts them. The source URL is left out so a fallback mirror serving
+        the same file keeps the same fingerprint.
+        
+        Returns:
+            Hex digest, or None if the hour is not published yet
+        """
+        fields = {f for f in raw_fields if f in self._variable_map or f == 'apcp'}
+        if not fields:
+            return None
+        H = self._create_herbie(run_time, forecast_hour)
+        if not getattr(H, 'grib', None):
+            return None
+        
+        inventory = H.inventory(self._build_search_string(fields, forecast_hour))
+        if len(inventory) == 0:
+            return None
+        digest = hashlib.sha1(str(H.grib).rsplit('/', 1)[-1].encode())
+        for row in inventory.itertuples():
+            digest.update(f"|{getattr(row, 'search_this', '')}:{row.start_byte}-{row.end_byte}".encode())
+        return digest.hexdigest()
+    
     def fetch_raw_data(
         self,
         run_time: datetime,
@@ -170,13 +360,22 @@ class HerbieDataFetcher(BaseDataFetcher):
         Returns:
             xr.Dataset with requested variables
         """
+        run_key = run_time.strftime("%Y%m%d_%H")
+        memo_key = (run_key, forecast_hour, subset_region)
+        cached = self._from_memo(memo_key, raw_fields)
+        if cached is not None:
+            logger.info(f"  Reusing f{forecast_hour:03d} download for {sorted(raw_fields)}")
+            return cached
+        
+        requested_fields = raw_fields
+        raw_fields = self._merge_fields(run_key, forecast_hour, raw_fields)
+        
         logger.info(f"Fetching {self.model_id} data via Herbie:")
         logger.info(f"  Run: {run_time.strftime('%Y-%m-%d %H:%M')} UTC")
         logger.info(f"  Forecast hour: f{forecast_hour:03d}")
         logger.info(f"  Variables: {raw_fields}")
         
         try:
-            # Create Herbie object
             herbie_model = self._get_herbie_model_name()
             
             # Herbie expects timezone-naive datetime
@@ -184,39 +383,31 @@ class HerbieDataFetcher(BaseDataFetcher):
             
             # Get product from model config (e.g., "pgrb2.0p25" for GFS, "sfc" for HRRR)
             product = getattr(self.model_config, 'herbie_product', None)
-            logger.debug(f"  Model config herbie_product: {product}")
-            
-            # Build Herbie initialization parameters
-            herbie_params = {
-                'date': run_time_naive,
-                'model': herbie_model,
-                'fxx': forecast_hour,
-                'save_dir': str(self.herbie_save_dir),
-                'overwrite': False,  # Don't re-download existing files
-                'priority': self.priority_sources,  # Multi-source fallback
-                'verbose': False
-            }
-            
-            # Add product if specified in model config (must be before Herbie creation)
             if product:
-                herbie_params['product'] = product
                 logger.info(f"  Herbie product parameter: {product}")
             else:
                 logger.warning(f"  No herbie_product specified for {self.model_id}, using Herbie default")
             
-            logger.debug(f"  Herbie params: {herbie_params}")
-            H = self.Herbie(**herbie_params)
+            H = self._create_herbie(run_time, forecast_hour)
             
             # Build search string for variable subsetting
             search_string = self._build_search_string(raw_fields, forecast_hour)
             
             # Download and convert to xarray
             # Herbie uses byte-range requests to download only matching variables
-            logger.info(f"  Downloading via Herbie (byte-range subsetting)...")
-            ds = H.xarray(
-                search_string,
-                remove_grib=False  # CRITICAL: Keep GRIB files for caching
+            # Serialised across workers per (run, hour, product, search): the
+            # first worker downloads the subset, the others then find it in
+            # save_dir (overwrite=False) and read it locally.
+            lock_key = (
+                f"herbie_{herbie_model}_{run_time_naive:%Y%m%d_%H}_f{forecast_hour:03d}_"
+                f"{product or 'default'}_{hashlib.sha1(search_string.encode()).hexdigest()[:12]}"
             )
+            logger.info(f"  Downloading via Herbie (byte-range subsetting)...")
+            with get_download_coordinator().lock(lock_key):
+                ds = H.xarray(
+                    search_string,
+                    remove_grib=False  # CRITICAL: Keep GRIB files for caching
+                )
             
             # Herbie may return a list of datasets if multiple matches
             # Merge them into a single dataset
@@ -258,7 +449,12 @@ class HerbieDataFetcher(BaseDataFetcher):
             # Select specific pressure levels and remove extra dimensions
             ds = self._select_pressure_levels(ds)
             
-            return ds
+            fetched = frozenset(raw_fields)
+            self._hour_datasets.setdefault(memo_key, []).append((fetched, ds))
+            self._hour_datasets.move_to_end(memo_key)
+            while len(self._hour_datasets) > self._HOUR_DATASETS_KEPT:
+                self._hour_datasets.popitem(last=False)
+            return self._select_fields(ds, fetched, requested_fields)
             
         except Exception as e:
             logger.error(f"Herbie fetch failed: {e}")
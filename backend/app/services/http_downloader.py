@@ -0,0 +1,195 @@
+"""Shared, connection-pooled HTTP downloader for GRIB products.
+
+One ``requests.Session`` per process keeps TCP/TLS connections alive across
+downloads instead of opening a new connection for every file. Concurrency is
+bounded per host (NOMADS throttles aggressive clients), bodies are streamed
+in large chunks, and every file is written to a temp name and renamed into
+place so a concurrent reader never sees a half-written GRIB.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlparse
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+from app.services.download_coordinator import get_download_coordinator
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPDownloader:
+    """Pooled session with per-host concurrency limits and atomic writes."""
+
+    def __init__(
+        self,
+        max_connections_per_host: Optional[int] = None,
+        chunk_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            max_connections_per_host: Concurrent downloads allowed per host
+                                      (default: settings.nomads_max_connections_per_host)
+            chunk_bytes: Streaming chunk / write buffer size
+                         (default: settings.download_chunk_bytes)
+        """
+        self.max_connections_per_host = max(1, max_connections_per_host or settings.nomads_max_connections_per_host)
+        self.chunk_bytes = chunk_bytes or settings.download_chunk_bytes
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=self.max_connections_per_host,
+            max_retries=0
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return self._host_limits[host]
+
+    def download(
+        self,
+        url: str,
+        dest_path: str,
+        timeout: int = 120,
+        max_retries: int = 3,
+        reuse_max_age: Optional[float] = None
+    ) -> str:
+        """
+        Download ``url`` to ``dest_path`` atomically, retrying with backoff.
+
+        The transfer runs under the cross-process lock for the file's cache
+        key (its name without extension), so concurrent workers asking for
+        the same file download it once.
+
+        Args:
+            reuse_max_age: If set, a ``dest_path`` younger than this many
+                           seconds found after taking the lock is reused
+                           instead of downloaded again
+
+        Returns:
+            dest_path
+
+        Raises:
+            The last request/IO error once retries are exhausted.
+        """
+        def _ready() -> Optional[str]:
+            if reuse_max_age is None or not os.path.exists(dest_path):
+                return None
+            if time.time() - os.path.getmtime(dest_path) >= reuse_max_age:
+                return None
+            return dest_path
+
+        return get_download_coordinator().fetch_once(
+            Path(dest_path).stem,
+            _ready,
+            lambda: self._download(url, dest_path, timeout, max_retries)
+        )
+
+    def _download(self, url: str, dest_path: str, timeout: int, max_retries: int) -> str:
+        tmp_path = f"{dest_path}.{os.getpid()}.{threading.get_ident()}.part"
+
+        for attempt in range(max_retries):
+            try:
+                logger.info(f"  Downloading (attempt {attempt + 1}/{max_retries})...")
+                with self._host_semaphore(url):
+                    with self._session.get(url, timeout=timeout, stream=True) as response:
+                        response.raise_for_status()
+                        with open(tmp_path, 'wb', buffering=self.chunk_bytes) as f:
+                            for chunk in response.iter_content(chunk_size=self.chunk_bytes):
+                                f.write(chunk)
+                os.replace(tmp_path, dest_path)
+
+                file_size_mb = os.path.getsize(dest_path) / (1024 * 1024)
+                logger.info(f"  Downloaded {file_size_mb:.1f} MB")
+                return dest_path
+
+            except Exception as e:
+                logger.warning(f"  Download attempt {attempt + 1} failed: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                if attempt == max_retries - 1:
+                    raise
+                time.sleep(2 ** attempt)  # Exponential backoff
+
+        raise RuntimeError(f"Failed to download after {max_retries} attempts")
+
+    def get_text(self, url: str, params: Optional[Dict[str, str]] = None, timeout: int = 10) -> str:
+        """
+        Small GET over the pooled session (directory and bucket listings).
+
+        Raises:
+            requests.RequestException: On connection errors or non-2xx status
+        """
+        with self._host_semaphore(url):
+            response = self._session.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    def download_many(
+        self,
+        jobs: Iterable[Tuple[str, str]],
+        timeout: int = 120,
+        max_retries: int = 3,
+        reuse_max_age: Optional[float] = None
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        Download several (url, dest_path) pairs concurrently.
+
+        Concurrency is capped by the per-host limit, so handing this a whole
+        run's worth of files is safe.
+
+        Returns:
+            Mapping of dest_path -> dest_path on success or the raised exception
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return {}
+
+        results: Dict[str, Union[str, Exception]] = {}
+        workers = min(len(jobs), self.max_connections_per_host * 2)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download") as pool:
+            futures = {
+                dest: pool.submit(self.download, url, dest, timeout, max_retries, reuse_max_age)
+                for url, dest in jobs
+            }
+            for dest, future in futures.items():
+                try:
+                    results[dest] = future.result()
+                except Exception as e:
+                    results[dest] = e
+        return results
+
+
+_downloader: Optional[HTTPDownloader] = None
+_downloader_pid: Optional[int] = None
+
+
+def get_downloader() -> HTTPDownloader:
+    """
+    Process-wide downloader.
+
+    Sessions are not fork-safe, so a worker forked from a process that already
+    created one gets its own fresh instance.
+    """
+    global _downloader, _downloader_pid
+    if _downloader is None or _downloader_pid != os.getpid():
+        _downloader = HTTPDownloader()
+        _downloader_pid = os.getpid()
+    return _downloader
@@ -13,6 +13,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import logging
 from typing import Optional
+import hashlib
+import json
 import os
 
 # Additional matplotlib configuration to prevent hanging
@@ -25,11 +27,15 @@ os.environ['CARTOPY_OFFLINE'] = '0'  # Allow downloading map data if needed
 
 from app.config import settings
 from app.config.overlay_rules import is_overlay_enabled, get_overlay_config
-from app.config.regions import get_region_bbox
+from app.services.map_manifest import get_map_manifest
+from app.services.precip_types import PRECIP_TYPES, composite_precip_types
+from app.services.raster_renderer import colorbar_proxy, render_categories, render_layer
+from app.services.reprojection import get_reprojection_cache, grid_coords, reproject_for_axes
 from app.services.station_catalog import StationCatalog
-from app.services.station_selector import StationSelector
 from app.services.station_sampling import GridLocatorFactory
 from app.services.stations import format_station_value
+from app.services.pressure_centers import find_pressure_centers
+from app.services.tile_renderer import TileStyle, get_tile_renderer, tile_bounds
 
 logger = logging.getLogger(__name__)
 
@@ -120,9 +126,110 @@ class MapGenerator:
         }
     }
     
+    # Per-process cache of projected, clipped base-map geometry (see _get_base_map_layers)
+    _base_map_layer_cache: dict = {}
+    
+    # Base-map layers a map may be drawn without (the county shapefile is an
+    # optional download); any other layer failing leaves the cache unbuilt
+    _OPTIONAL_BASE_MAP_LAYERS = ('counties',)
+    
+    # Bump when a change to the drawing code should re-render existing maps.
+    # Colour tables, map settings and overlay rules are fingerprinted
+    # automatically (see style_fingerprint).
+    RENDER_VERSION = 5
+    
+    # Variable name (including aliases) -> product id used by overlay rules
+    PRODUCT_IDS = {
+        'temperature_2m': 'temp_2m',
+        'temp': 'temp_2m',
+        'temp_850_wind_mslp': 'temp_850mb',
+        '850mb': 'temp_850mb',
+        'wind_speed_10m': 'wind_speed_10m',
+        'wind_speed': 'wind_speed_10m',
+        'precipitation': 'precipitation',
+        'precip': 'precipitation',
+        'snowfall': 'snowfall',
+        'radar': 'radar',
+        'radar_reflectivity': 'radar',
+        'mslp_precip': 'mslp_precip',
+        'mslp_pcpn': 'mslp_precip'
+    }
+    
     def __init__(self):
         self.storage_path = Path(settings.storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self._style_fingerprints = {}
+        # Normalisation plans per grid and processed fields of the dataset being mapped
+        self._lonlat_plans = {}
+        self._fields_ds = None
+        self._fields = {}
+    
+    def _style_colour_tables(self, product_id: str) -> list:
+        """Colour tables (cmap/norm/levels tuples) a product's map is drawn with"""
+        if product_id == 'temp_2m':
+            return [self.get_temperature_cmap()]
+        if product_id == 'precipitation':
+            return [self.get_precipitation_cmap()]
+        if product_id == 'snowfall':
+            return [self.get_snowfall_cmap()]
+        if product_id == 'wind_speed_10m':
+            return [self.get_wind_speed_cmap()]
+        if product_id == 'temp_850mb':
+            return [self.get_850mb_temp_cmap()]
+        if product_id == 'radar':
+            return [self.get_radar_cmap(p_type) for p_type in sorted(self.RADAR_CONFIG)]
+        if product_id == 'mslp_precip':
+            return [self.get_precip_cmap(p_type) for p_type in sorted(self.PRECIP_CONFIG)]
+        return []
+    
+    @staticmethod
+    def _style_token(obj) -> str:
+        """Stable text form of a colormap, norm or level list for fingerprinting"""
+        if isinstance(obj, colors.Colormap):
+            samples = np.round(obj(np.linspace(0.0, 1.0, obj.N)), 4)
+            extremes = np.round([obj.get_under(), obj.get_over(), obj.get_bad()], 4)
+            return f"cmap:{obj.N}:{samples.tobytes().hex()}:{extremes.tobytes().hex()}"
+        if isinstance(obj, colors.BoundaryNorm):
+            return f"boundary:{np.asarray(obj.boundaries).tolist()}:{obj.extend}:{obj.clip}"
+        if isinstance(obj, colors.Normalize):
+            return f"norm:{obj.vmin}:{obj.vmax}:{obj.clip}"
+        if isinstance(obj, (list, tuple)):
+            return "[" + ",".join(MapGenerator._style_token(item) for item in obj) + "]"
+        if isinstance(obj, np.ndarray):
+            return repr(obj.tolist())
+        return repr(obj)
+    
+    def style_fingerprint(self, variable: str) -> str:
+        """
+        Fingerprint of everything besides the data that shapes a variable's map.
+        
+        Covers RENDER_VERSION, the map size/region and drawing-engine
+        settings, the product's overlay rules and its colour tables, so the scheduler can tell which
+        stored maps a style change actually affects.
+        
+        Returns:
+            Hex digest (memoised per generator)
+        """
+        if variable in self._style_fingerprints:
+            return self._style_fingerprints[variable]
+        
+        product_id = self.PRODUCT_IDS.get(variable, variable)
+        overlay = None
+        if settings.station_overlays and is_overlay_enabled(product_id):
+            overlay = get_overlay_config(product_id)
+        parts = {
+            'render_version': self.RENDER_VERSION,
+            'product': product_id,
+            'map': [settings.map_width, settings.map_height, settings.map_dpi,
+                    settings.map_region, settings.map_region_bounds],
+            'stations': [settings.station_overlays, settings.station_priority, overlay],
+            'tiles': [settings.tile_output, settings.tile_min_zoom, settings.tile_max_zoom],
+            'render': [settings.raster_renderer, settings.reproject_cache, settings.reproject_step_px],
+            'colours': self._style_token(self._style_colour_tables(product_id)),
+        }
+        digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+        self._style_fingerprints[variable] = digest
+        return digest
     
     def get_precip_cmap(self, p_type):
         """
@@ -345,36 +452,8 @@ class MapGenerator:
         
         return LinearSegmentedColormap.from_list('weatherbell_c', norm_colors, N=256)
     
-    def _setup_base_map(self, region: str = 'pnw', 
-                       land_color: str = '#fbf5e7',
-                       ocean_color: str = '#e3f2fd',
-                       border_color: str = '#000000',  # Force Black for visibility
-                       border_linewidth: float = 0.8,  # Increased from 0.6
-                       state_linewidth: float = 1.2,  # Increased from 0.6 for better visibility
-                       county_linewidth: float = 0.8):  # Increased from 0.3 for better visibility
-        """
-        Set up the base map with projection, extent, and geographic features.
-        
-        This is the foundation for all maps - provides consistent base styling
-        that can be customized per map type.
-        
-        Args:
-            region: Map region ('pnw', 'us', or 'global')
-            land_color: Color for land areas (default: light beige)
-            ocean_color: Color for ocean areas (default: light blue)
-            border_color: Color for borders/coastlines (default: dark gray)
-            border_linewidth: Width of coastline/border lines
-            state_linewidth: Width of state boundary lines
-            county_linewidth: Width of county boundary lines
-            
-        Returns:
-            matplotlib axes object with base map configured
-        """
-        fig = plt.figure(figsize=(settings.map_width/100, settings.map_height/100), dpi=settings.map_dpi)
-        
-        # Minimize margins by adjusting subplot parameters
-        fig.subplots_adjust(left=0.02, right=0.98, top=0.95, bottom=0.05)
-        
+    def _create_map_axes(self, fig, region: str = 'pnw'):
+        """Add a GeoAxes with the projection and extent for a map region."""
         # Set projection based on region
         if region == "pnw":
             # Pacific Northwest: WA, OR, ID
@@ -399,33 +478,167 @@ class MapGenerator:
         else:
             ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
             ax.set_global()
-        
-        # Add map features - land/ocean at bottom, borders/states on top of precip
-        ax.add_feature(cfeature.OCEAN, facecolor=ocean_color, zorder=0)
-        ax.add_feature(cfeature.LAND, facecolor=land_color, zorder=0)
-        
-        # Move borders and states to zorder=10 to ensure visibility above precipitation
-        ax.add_feature(cfeature.COASTLINE, linewidth=border_linewidth, edgecolor=border_color, zorder=10)
-        ax.add_feature(cfeature.BORDERS, linewidth=border_linewidth, edgecolor=border_color, zorder=10)
-        
+        return ax
+    
+    @staticmethod
+    def _base_map_features() -> list:
+        """Natural Earth layers drawn on every base map, in drawing order."""
+        features = [
+            ('ocean', cfeature.OCEAN),
+            ('land', cfeature.LAND),
+            ('coastline', cfeature.COASTLINE),
+            ('borders', cfeature.BORDERS),
+        ]
         # Add county boundaries for better geographic reference
         # Using NaturalEarthFeature to load counties at 1:10m scale (highest resolution available)
         try:
-            counties = NaturalEarthFeature(
+            features.append(('counties', NaturalEarthFeature(
                 category='cultural',
                 name='admin_2_counties',
                 scale='10m',
                 facecolor='none',
                 edgecolor='#333333'  # Darker gray for better visibility
-            )
-            ax.add_feature(counties, linewidth=county_linewidth, linestyle='-', alpha=0.7, zorder=9)
+            )))
         except Exception as e:
             # If counties can't be loaded (missing data files), log warning but continue
             logger.warning(f"Could not load county boundaries: {e}")
+        features.append(('states', cfeature.STATES))
+        return features
+    
+    def _get_base_map_layers(self, ax, region: str) -> dict:
+        """
+        Get base-map geometry already projected and clipped to the map extent.
+        
+        Selecting the Natural Earth geometries that intersect the map,
+        projecting them and clipping away everything off-map is the same work
+        for every map of a region, so it is done once per process and cached
+        at class level. Styling (colours, line widths) is applied per map, so
+        one cache entry serves every colour scheme.
         
-        # Make state lines bolder and more opaque for better visibility
-        ax.add_feature(cfeature.STATES, linewidth=state_linewidth, edgecolor=border_color, 
-                       linestyle='-', alpha=0.8, zorder=10)
+        A failure in a required layer (e.g. a transient Natural Earth download
+        error) raises instead of caching a map without coastlines or borders;
+        the caller draws the features directly and the next map retries.
+        
+        Returns:
+            Dict of layer name -> list of shapely geometries in ax.projection
+        """
+        x0, x1, y0, y1 = ax.get_extent()
+        cache_key = (region, ax.projection.proj4_init, tuple(round(v, 1) for v in (x0, x1, y0, y1)))
+        layers = MapGenerator._base_map_layer_cache.get(cache_key)
+        if layers is not None:
+            return layers
+        
+        import shapely.geometry as sgeom
+        
+        # Clip slightly outside the visible extent so strokes at the frame edge stay intact
+        pad_x = (x1 - x0) * 0.02
+        pad_y = (y1 - y0) * 0.02
+        clip_box = sgeom.box(x0 - pad_x, y0 - pad_y, x1 + pad_x, y1 + pad_y)
+        
+        start = datetime.now()
+        layers = {}
+        failed = []
+        for name, feature in self._base_map_features():
+            geoms = []
+            try:
+                for geom in feature.intersecting_geometries(ax.get_extent(feature.crs)):
+                    projected = ax.projection.project_geometry(geom, feature.crs)
+                    clipped = projected.intersection(clip_box)
+                    if not clipped.is_empty:
+                        geoms.append(clipped)
+            except Exception as e:
+                # e.g. county shapefile missing - draw the map without that layer
+                logger.warning(f"Could not load base map layer '{name}': {e}")
+                if name not in self._OPTIONAL_BASE_MAP_LAYERS:
+                    failed.append(name)
+            layers[name] = geoms
+        
+        if failed:
+            raise RuntimeError(f"base map layers {failed} failed to load, not caching")
+        
+        MapGenerator._base_map_layer_cache[cache_key] = layers
+        elapsed = (datetime.now() - start).total_seconds()
+        logger.info(f"Cached base map geometry for region '{region}' in {elapsed:.2f}s "
+                    f"({sum(len(g) for g in layers.values())} geometries)")
+        return layers
+    
+    def warm_base_map_cache(self, region: Optional[str] = None):
+        """Build the base-map geometry cache for a region ahead of the first map."""
+        region = region or settings.map_region
+        fig = plt.figure(figsize=(settings.map_width/100, settings.map_height/100), dpi=settings.map_dpi)
+        try:
+            ax = self._create_map_axes(fig, region)
+            self._get_base_map_layers(ax, region)
+        except Exception as e:
+            logger.warning(f"Could not pre-build base map cache for '{region}': {e}")
+        finally:
+            plt.close(fig)
+    
+    def _setup_base_map(self, region: str = 'pnw', 
+                       land_color: str = '#fbf5e7',
+                       ocean_color: str = '#e3f2fd',
+                       border_color: str = '#000000',  # Force Black for visibility
+                       border_linewidth: float = 0.8,  # Increased from 0.6
+                       state_linewidth: float = 1.2,  # Increased from 0.6 for better visibility
+                       county_linewidth: float = 0.8,  # Increased from 0.3 for better visibility
+                       use_cache: bool = True):
+        """
+        Set up the base map with projection, extent, and geographic features.
+        
+        This is the foundation for all maps - provides consistent base styling
+        that can be customized per map type.
+        
+        Args:
+            region: Map region ('pnw', 'us', or 'global')
+            land_color: Color for land areas (default: light beige)
+            ocean_color: Color for ocean areas (default: light blue)
+            border_color: Color for borders/coastlines (default: dark gray)
+            border_linewidth: Width of coastline/border lines
+            state_linewidth: Width of state boundary lines
+            county_linewidth: Width of county boundary lines
+            use_cache: Draw from the cached pre-projected geometry (default).
+                       False adds the Natural Earth features directly.
+            
+        Returns:
+            matplotlib axes object with base map configured
+        """
+        fig = plt.figure(figsize=(settings.map_width/100, settings.map_height/100), dpi=settings.map_dpi)
+        
+        # Minimize margins by adjusting subplot parameters
+        fig.subplots_adjust(left=0.02, right=0.98, top=0.95, bottom=0.05)
+        
+        ax = self._create_map_axes(fig, region)
+        
+        # Per-layer styling - land/ocean at bottom, borders/states on top of precip
+        # (zorder=10 keeps boundaries visible above precipitation)
+        line_style = dict(facecolor='none', edgecolor=border_color, linewidth=border_linewidth, zorder=10)
+        layer_styles = {
+            'ocean': dict(facecolor=ocean_color, edgecolor='face', zorder=0),
+            'land': dict(facecolor=land_color, edgecolor='face', zorder=0),
+            'coastline': line_style,
+            'borders': line_style,
+            'counties': dict(facecolor='none', edgecolor='#333333', linewidth=county_linewidth,
+                             linestyle='-', alpha=0.7, zorder=9),
+            # Make state lines bolder and more opaque for better visibility
+            'states': dict(facecolor='none', edgecolor=border_color, linewidth=state_linewidth,
+                           linestyle='-', alpha=0.8, zorder=10),
+        }
+        
+        layers = None
+        if use_cache:
+            try:
+                layers = self._get_base_map_layers(ax, region)
+            except Exception as e:
+                logger.warning(f"Base map cache unavailable, drawing features directly: {e}")
+        
+        if layers is not None:
+            # Geometry is already in the axes projection, so cartopy skips reprojection
+            for name, geoms in layers.items():
+                if geoms:
+                    ax.add_geometries(geoms, crs=ax.projection, **layer_styles[name])
+        else:
+            for name, feature in self._base_map_features():
+                ax.add_feature(feature, **layer_styles[name])
         
         return fig, ax
     
@@ -518,19 +731,168 @@ class MapGenerator:
             logger.warning(f"Could not determine grid locator for wind sampling: {e}")
             return {}
 
-        u_values = locator.sample(ds, u_var, stations)
-        v_values = locator.sample(ds, v_var, stations)
-
-        station_values = {}
-        for station_id, u in u_values.items():
-            if station_id not in v_values:
-                continue
-            v = v_values[station_id]
-            wind_speed = np.sqrt(u**2 + v**2)
-            wind_speed_mph = wind_speed * 2.23694
-            station_values[station_id] = float(wind_speed_mph)
+        # u and v share a grid, so the station -> grid index lookup is done once
+        lats = np.array([s.lat for s in stations], dtype=np.float64)
+        lons = np.array([s.lon for s in stations], dtype=np.float64)
+        try:
+            u = locator.sample_points(ds, u_var, lats, lons)
+            v = locator.sample_points(ds, v_var, lats, lons)
+        except Exception as e:
+            logger.warning(f"Could not sample wind components at stations: {e}")
+            return {}
 
-        return station_values
+        wind_speed_mph = np.sqrt(u**2 + v**2) * 2.23694
+        return {station.id: float(speed) for station, speed in zip(stations, wind_speed_mph)}
+    
+    def _tile_style(self, variable: str) -> Optional[TileStyle]:
+        """
+        Colour mapping of a variable's filled-contour layer for tile output.
+        
+        Mirrors the contourf calls in generate_map. Products drawn as several
+        precipitation-type layers (radar, MSLP & precip) have no single data
+        layer and return None.
+        """
+        if variable in ("temperature_2m", "temp"):
+            return TileStyle(self.get_temperature_cmap(), np.arange(-40, 122.5, 2.5))
+        if variable in ("precipitation", "precip"):
+            cmap, norm, levels = self.get_precipitation_cmap()
+            return TileStyle(cmap, levels, norm)
+        if variable == "snowfall":
+            cmap, norm, levels = self.get_snowfall_cmap()
+            return TileStyle(cmap, levels, norm)
+        if variable in ("wind_speed_10m", "wind_speed"):
+            cmap, levels = self.get_wind_speed_cmap()
+            return TileStyle(cmap, levels, extend='max')
+        if variable in ("temp_850_wind_mslp", "850mb"):
+            return TileStyle(self.get_850mb_temp_cmap(), np.arange(-40, 47, 1))
+        return None
+    
+    def _map_grid(self, ax, field: xr.DataArray):
+        """
+        Coordinates, values and transform for drawing a field with contourf/contour.
+        
+        With reproject_cache on, the field is regridded into the axes
+        projection with cached weights, so cartopy does no reprojection.
+        Otherwise the native lat/lon coordinates are returned with PlateCarree.
+        
+        Returns:
+            (X, Y, values, transform)
+        """
+        if settings.reproject_cache:
+            values, lat, lon = grid_coords(field)
+            reprojector = reproject_for_axes(ax, lat, lon, settings.reproject_step_px)
+            return reprojector.x, reprojector.y, reprojector.scalar(values), ax.projection
+        X, Y, transform = self._get_plot_coords_and_transform(field, ax)
+        return X, Y, field, transform
+    
+    def _map_vectors(self, ax, u: xr.DataArray, v: xr.DataArray, density: float = 1):
+        """
+        Like _map_grid for eastward/northward components (streamplot).
+        
+        Reprojected components are rotated into the projection's x/y axes on
+        the same coarse grid cartopy would regrid them to for this density.
+        
+        Returns:
+            (X, Y, U, V, transform)
+        """
+        if settings.reproject_cache:
+            u_values, lat, lon = grid_coords(u)
+            v_values, _, _ = grid_coords(v)
+            reprojector = reproject_for_axes(ax, lat, lon, shape=(int(30 * density),) * 2)
+            had_rotation = reprojector.rotation is not None
+            U, V = reprojector.vector(u_values, v_values, ax.projection)
+            if not had_rotation:
+                get_reprojection_cache().save_rotation(reprojector)
+            return reprojector.x, reprojector.y, U, V, ax.projection
+        X, Y, transform = self._get_plot_coords_and_transform(u, ax)
+        return X, Y, u.values, v.values, transform
+    
+    def _label_pressure_centers(self, ax, mslp_data: xr.DataArray):
+        """Draw H/L labels at the pressure centres inside the map region (hPa data)."""
+        lon_name = 'longitude' if 'longitude' in mslp_data.coords else 'lon'
+        lat_name = 'latitude' if 'latitude' in mslp_data.coords else 'lat'
+        # Keep labels (value printed below the letter) off the top/bottom edges
+        bounds = dict(tile_bounds())
+        bounds["south"] += 0.5
+        bounds["north"] -= 0.5
+        centers = find_pressure_centers(
+            mslp_data.squeeze().values,
+            mslp_data.coords[lat_name].values,
+            mslp_data.coords[lon_name].values,
+            bounds
+        )
+        for center in centers:
+            color = 'blue' if center.kind == 'H' else 'red'
+            ax.text(center.lon, center.lat, center.kind, transform=ccrs.PlateCarree(), fontsize=16,
+                    fontweight='bold', ha='center', color=color, zorder=15)
+            ax.text(center.lon, center.lat - 0.2, f'{int(center.value)}', transform=ccrs.PlateCarree(),
+                    fontsize=10, fontweight='bold', ha='center', color=color, zorder=15)
+        logger.debug(f"Labelled {len(centers)} pressure centres")
+    
+    def _draw_raster_layer(self, ax, layers: list):
+        """
+        Draw filled-contour layers as one NumPy-classified raster (raster_renderer mode).
+        
+        Args:
+            ax: Map axes
+            layers: (field, TileStyle, band_alpha or None) in painting order,
+                    all on the same grid
+        
+        Returns:
+            The AxesImage
+        """
+        start = datetime.now()
+        prepared = []
+        lat = lon = None
+        for field, style, band_alpha in layers:
+            values, lat, lon = grid_coords(field)
+            prepared.append((values, style, band_alpha))
+        image = render_layer(ax, prepared, lat, lon)
+        elapsed = (datetime.now() - start).total_seconds()
+        logger.info(f"Rendered {len(layers)} raster layer(s) in {elapsed:.2f}s")
+        return image
+    
+    def ensure_base_tiles(self, region: Optional[str] = None):
+        """
+        Render the shared basemap and border-overlay tiles for a region once.
+        
+        Every frame of every model reuses them, so only the data layer is
+        rendered per map.
+        """
+        region = region or settings.map_region
+        renderer = get_tile_renderer()
+        
+        def _draw_basemap(ax):
+            ax.add_feature(cfeature.OCEAN, facecolor='#e3f2fd', edgecolor='none')
+            ax.add_feature(cfeature.LAND, facecolor='#fbf5e7', edgecolor='none')
+        
+        def _draw_borders(ax):
+            for name, feature in self._base_map_features():
+                if name in ('ocean', 'land'):
+                    continue
+                linewidth = {'counties': 0.3, 'states': 1.0}.get(name, 0.8)
+                ax.add_feature(feature, facecolor='none', edgecolor='#333333', linewidth=linewidth)
+        
+        try:
+            renderer.render_base_tiles(region, 'basemap', _draw_basemap, transparent=False)
+            renderer.render_base_tiles(region, 'borders', _draw_borders, transparent=True)
+        except Exception as e:
+            logger.warning(f"Could not render base tiles for '{region}': {e}")
+    
+    def _write_tiles(self, data: xr.DataArray, variable: str, model: str, run_str: str, forecast_hour: int):
+        """Write a map's data layer as a tile pyramid (tile_output mode, non-fatal)"""
+        style = self._tile_style(variable)
+        if style is None:
+            logger.debug(f"No single data layer to tile for {variable}, skipping tiles")
+            return
+        try:
+            start = datetime.now()
+            self.ensure_base_tiles()
+            count = get_tile_renderer().render_data_tiles(data, style, model, run_str, variable, forecast_hour)
+            elapsed = (datetime.now() - start).total_seconds()
+            logger.info(f"Wrote {count} tiles for {variable} f{forecast_hour:03d} in {elapsed:.2f}s")
+        except Exception as e:
+            logger.warning(f"Could not write tiles for {variable} f{forecast_hour:03d}: {e}")
     
     def generate_map(
         self,
@@ -552,11 +914,8 @@ class MapGenerator:
         is_850mb_map = False
         is_wind_speed_map = False
         if variable == "temperature_2m" or variable == "temp":
-            temp_data = self._process_temperature(ds)
-            logger.info(f"Temperature data before normalize - shape: {temp_data.shape}, coords: {list(temp_data.coords.keys())}, dims: {list(temp_data.dims)}")
-            logger.info(f"Temperature range: min={float(temp_data.min()):.2f}, max={float(temp_data.max()):.2f}")
-            data = self._normalize_lonlat(temp_data)
-            logger.info(f"Temperature data after normalize - shape: {data.shape}, coords: {list(data.coords.keys())}, dims: {list(data.dims)}")
+            data = self._field(ds, 'temperature_2m', lambda: self._normalize_lonlat(self._process_temperature(ds)))
+            logger.debug(f"Temperature data - shape: {data.shape}, coords: {list(data.coords.keys())}, dims: {list(data.dims)}")
             units = "°F"
             cmap = self.get_temperature_cmap()
         elif variable == "precipitation" or variable == "precip":
@@ -567,8 +926,8 @@ class MapGenerator:
                     f"tp_total not found in dataset. Dataset must be built using "
                     f"build_dataset_for_maps() which computes derived fields."
                 )
-            data = ds['tp_total'].squeeze() / 25.4  # Convert mm to inches
-            data = self._normalize_lonlat(data)
+            # Convert mm to inches
+            data = self._field(ds, 'tp_total', lambda: self._normalize_lonlat(ds['tp_total'].squeeze() / 25.4))
             units = "in"  # Inches for PNW users
             cmap, precip_norm, precip_levels = self.get_precipitation_cmap()
         elif variable == "snowfall":
@@ -580,8 +939,7 @@ class MapGenerator:
                     f"build_dataset_for_maps() which computes derived fields."
                 )
             # tp_snow_total is already in inches (computed by _compute_total_snowfall)
-            data = ds['tp_snow_total'].squeeze()
-            data = self._normalize_lonlat(data)
+            data = self._field(ds, 'tp_snow_total', lambda: self._normalize_lonlat(ds['tp_snow_total'].squeeze()))
             units = "in"  # Inches (10:1 ratio)
             cmap, snow_norm, snow_levels = self.get_snowfall_cmap()
         elif variable == "wind_speed_10m" or variable == "wind_speed":
@@ -590,14 +948,12 @@ class MapGenerator:
             has_wind = ('ugrd10m' in ds) and ('vgrd10m' in ds)
             if not has_wind and forecast_hour == 0:
                 raise ValueError(f"Wind components not available in analysis file (f000) for {variable}. Skipping wind_speed map for forecast hour 0.")
-            data = self._normalize_lonlat(self._process_wind_speed(ds))
+            data = self._field(ds, 'wind_speed_10m', lambda: self._normalize_lonlat(self._process_wind_speed(ds)))
             units = "mph"  # MPH for PNW users
             cmap, wind_levels = self.get_wind_speed_cmap()
             is_wind_speed_map = True
         elif variable == "temp_850_wind_mslp" or variable == "850mb":
-            data = self._normalize_lonlat(ds['tmp_850'])
-            if float(data.max()) > 100:  # Kelvin
-                data = data - 273.15  # Convert to Celsius
+            data = self._field(ds, 'tmp_850', lambda: self._process_850mb_temperature(ds))
             units = "°C"
             cmap = self.get_850mb_temp_cmap()
             is_850mb_map = True
@@ -609,13 +965,12 @@ class MapGenerator:
                     f"p6_rate_mmhr not found in dataset. Dataset must be built using "
                     f"build_dataset_for_maps() which computes derived fields."
                 )
-            data = ds['p6_rate_mmhr'].squeeze()
-            data = self._normalize_lonlat(data)
+            data = self._field(ds, 'p6_rate_mmhr', lambda: self._normalize_lonlat(ds['p6_rate_mmhr'].squeeze()))
             units = "mm/hr"
             cmap = "Greens" # Default, though we plot layers below
             is_mslp_precip = True
         elif variable == "radar" or variable == "radar_reflectivity":
-            data = self._normalize_lonlat(self._process_radar_reflectivity(ds))
+            data = self._field(ds, 'radar', lambda: self._normalize_lonlat(self._process_radar_reflectivity(ds)))
             units = "dBZ"
             # Radar colors are now defined per precipitation type
             # Will be used in the plotting section
@@ -623,6 +978,9 @@ class MapGenerator:
         else:
             raise ValueError(f"Unsupported variable: {variable}")
         
+        # Data layer as processed, before any plot-specific smoothing (tile output)
+        tile_data = data
+        
         # Determine base map colors based on variable type
         # MSLP & Precip, Total Precip, Snowfall, and Radar maps: all white with black borders
         if is_mslp_precip or variable in ["precipitation", "precip", "snowfall", "radar", "radar_reflectivity"]:
@@ -644,6 +1002,9 @@ class MapGenerator:
             border_color=border_color
         )
         
+        # MSLP for the H/L labels (maps that carry pressure set it below)
+        mslp_data = None
+        
         # Plot data
         # Handle precipitation type differently (discrete values)
         if variable in ["precipitation_type", "precip_type"]:
@@ -670,109 +1031,33 @@ class MapGenerator:
         elif is_mslp_precip:
             # data is already 6-hr rate (mm/hr) from fetch_6hr_precip_rate_mmhr
             # A. Normalize all inputs
-            rate = self._normalize_coords(data).squeeze()
-            mslp_data = self._normalize_coords(self._process_mslp(ds))
+            rate = data
+            mslp_data = self._field(ds, 'mslp', lambda: self._normalize_lonlat(self._process_mslp(ds)))
             has_gh = ('gh_1000' in ds and 'gh_500' in ds) or 'gh' in ds or any('gh' in str(v).lower() for v in ds.data_vars)
-            thickness_data = self._normalize_coords(self._process_thickness(ds)) if has_gh else None
+            thickness_data = (
+                self._field(ds, 'thickness', lambda: self._normalize_lonlat(self._process_thickness(ds)))
+                if has_gh else None
+            )
 
             # Detect coordinate names
             lon_name = 'longitude' if 'longitude' in rate.coords else 'lon'
             lat_name = 'latitude' if 'latitude' in rate.coords else 'lat'
 
-            # PERFORMANCE: Early threshold - skip expensive processing if rate is negligible
-            min_rate_threshold = 0.1  # mm/hr
-            max_rate = float(rate.max())
-            
-            if max_rate < min_rate_threshold:
-                # No significant precipitation - skip expensive upsampling/smoothing
-                rate_smooth = rate
-                new_lon = rate[lon_name].values
-                new_lat = rate[lat_name].values
-                has_precip = np.zeros_like(rate.values, dtype=bool)
-                masks = {
-                    'rain': xr.zeros_like(rate),
-                    'snow': xr.zeros_like(rate),
-                    'sleet': xr.zeros_like(rate),
-                    'frzr': xr.zeros_like(rate)
-                }
-            else:
-                # B. Create a master categorical "Owner" grid via per-type masks
-                crain = ds.get('crain', xr.zeros_like(rate))
-                csnow = ds.get('csnow', xr.zeros_like(rate))
-                cicep = ds.get('cicep', xr.zeros_like(rate))
-                cfrzr = ds.get('cfrzr', xr.zeros_like(rate))
-
-                if 'time' in crain.dims: crain = crain.isel(time=0)
-                if 'time' in csnow.dims: csnow = csnow.isel(time=0)
-                if 'time' in cicep.dims: cicep = cicep.isel(time=0)
-                if 'time' in cfrzr.dims: cfrzr = cfrzr.isel(time=0)
+            # B. Upsample rate and type masks to ~2km and pick the winning type once
+            type_fields = []
+            for var_key, _ in PRECIP_TYPES:
+                mask_src = self._precip_type_field(ds, var_key)
+                type_fields.append(mask_src.squeeze().values if mask_src is not None else None)
+            composite = composite_precip_types(
+                rate.values, type_fields, rate.coords[lat_name].values, rate.coords[lon_name].values
+            )
 
-                # PERFORMANCE: Precompute hi-res grid once (reusable across variables)
-                # Store in instance cache for reuse if needed by other variables same hour
-                cache_key = f"{forecast_hour}_{lon_name}_{lat_name}"
-                if not hasattr(self, '_hires_grid_cache'):
-                    self._hires_grid_cache = {}
-                
-                if cache_key not in self._hires_grid_cache:
-                    # Use 0.02 degrees (~2km) for smooth contours
-                    new_lon = np.arange(float(rate[lon_name].min()), float(rate[lon_name].max()), 0.02)
-                    new_lat = np.arange(float(rate[lat_name].min()), float(rate[lat_name].max()), 0.02)
-                    self._hires_grid_cache[cache_key] = (new_lon, new_lat)
-                else:
-                    new_lon, new_lat = self._hires_grid_cache[cache_key]
-                
-                # Upsample rate and masks ONCE with linear interpolation
-                rate_smooth = rate.interp({lon_name: new_lon, lat_name: new_lat}, method="linear")
-                
-                # Build hi-res masks first, then pick the winner on the hi-res grid
-                # This avoids blocky edges from nearest-neighbor upsampling
-                precip_types = [('crain', 'rain'), ('csnow', 'snow'), ('cicep', 'sleet'), ('cfrzr', 'frzr')]
-                
-                mask_hi_list = []
-                for var_key, p_type in precip_types:
-                    if var_key in ds:
-                        mask_src = ds[var_key]
-                        if 'time' in mask_src.dims:
-                            mask_src = mask_src.isel(time=0)
-                        mask_src = self._normalize_coords(mask_src)
-                    else:
-                        mask_src = xr.zeros_like(rate)
-                    
-                    mask_hi = mask_src.interp({lon_name: new_lon, lat_name: new_lat}, method='linear')
-                    mask_hi_list.append(mask_hi.values)
-                
-                # Find winner on hi-res grid for smoother boundaries
-                mask_stack_hi = np.stack(mask_hi_list, axis=0)
-                winner_idx = np.argmax(mask_stack_hi, axis=0)
-                winner_field_hi = xr.DataArray(
-                    winner_idx,
-                    coords=rate_smooth.coords,
-                    dims=rate_smooth.dims
-                )
-                
-                # PERFORMANCE: Single smoothing pass on final rate field (not per-type)
-                from scipy.ndimage import gaussian_filter
-                rate_smooth.values = gaussian_filter(rate_smooth.values, sigma=0.7)
-                
-                # Apply threshold after smoothing
-                has_precip = (rate_smooth.values > min_rate_threshold).astype(bool)
-                
-                # Convert winner field to safe integer array (handle any NaN/float issues)
-                winner_vals = np.asarray(winner_field_hi.values, dtype=float)
-                winner_vals = np.nan_to_num(winner_vals, nan=0.0).astype(int)
-                
-                # Create masks dict from upsampled winner field with explicit boolean conversion
-                masks = {
-                    'rain': xr.DataArray(((winner_vals == 0) & has_precip).astype(bool), coords=rate_smooth.coords, dims=rate_smooth.dims),
-                    'snow': xr.DataArray(((winner_vals == 1) & has_precip).astype(bool), coords=rate_smooth.coords, dims=rate_smooth.dims),
-                    'sleet': xr.DataArray(((winner_vals == 2) & has_precip).astype(bool), coords=rate_smooth.coords, dims=rate_smooth.dims),
-                    'frzr': xr.DataArray(((winner_vals == 3) & has_precip).astype(bool), coords=rate_smooth.coords, dims=rate_smooth.dims)
-                }
-            
-            # C. Plot precip types (simplified - no complex overlap logic)
+            # C. Plot precip types (masks are disjoint, so order only sets zorder)
             # Plot in REVERSE priority order (frzr->sleet->snow->rain)
             precip_contours = {}
             plot_order = [('frzr', 1), ('sleet', 2), ('snow', 3), ('rain', 4)]
+            type_index = {p_type: index for index, (_, p_type) in enumerate(PRECIP_TYPES)}
+            type_styles = {}
             
             for p_type, z_val in plot_order:
                 cmap, norm, edges = self.get_precip_cmap(p_type)
@@ -784,19 +1069,21 @@ class MapGenerator:
                     smooth_levels.append(edges[i] + (edges[i+1] - edges[i]) / 3)
                     smooth_levels.append(edges[i] + 2 * (edges[i+1] - edges[i]) / 3)
                 smooth_levels.append(edges[-1])
+                type_styles[p_type] = TileStyle(cmap, smooth_levels, norm, extend='neither')
                 
-                # Create data for this type using simplified mask
-                type_mask = masks[p_type].values if hasattr(masks[p_type], 'values') else masks[p_type]
+                # Rate where this type wins and reaches its first level
                 type_min_threshold = edges[0] if p_type != 'rain' else 0.01
-                
-                # Apply mask and threshold
-                type_data = np.where(type_mask & (rate_smooth.values >= type_min_threshold), 
-                                    rate_smooth.values, np.nan)
+                type_data = composite.type_rate(type_index[p_type], type_min_threshold)
                 
                 # Only plot if there's actual data
-                if np.any(~np.isnan(type_data)) and np.nanmax(type_data) > 0.001:
+                if not (np.any(~np.isnan(type_data)) and np.nanmax(type_data) > 0.001):
+                    precip_contours[p_type] = (None, cmap, norm, edges)
+                elif settings.raster_renderer:
+                    # Drawn below in one classified pass; proxy carries the colorbar
+                    precip_contours[p_type] = (colorbar_proxy(ax, type_styles[p_type]), cmap, norm, edges)
+                else:
                     pm = ax.contourf(
-                        new_lon, new_lat, type_data,
+                        composite.lon, composite.lat, type_data,
                         levels=smooth_levels,
                         transform=ccrs.PlateCarree(),
                         cmap=cmap, norm=norm,
@@ -805,15 +1092,24 @@ class MapGenerator:
                         zorder=z_val,
                     )
                     precip_contours[p_type] = (pm, cmap, norm, edges)
-                else:
-                    precip_contours[p_type] = (None, cmap, norm, edges)
+
+            if settings.raster_renderer and any(entry[0] is not None for entry in precip_contours.values()):
+                start = datetime.now()
+                render_categories(
+                    ax, composite.rate, composite.kind,
+                    [type_styles[p_type] for _, p_type in PRECIP_TYPES],
+                    composite.lat, composite.lon
+                )
+                elapsed = (datetime.now() - start).total_seconds()
+                logger.info(f"Rendered precipitation types as one raster in {elapsed:.2f}s")
 
             im = list(precip_contours.values())[0][0] if precip_contours else None
+            mslp_x, mslp_y, mslp_z, mslp_transform = self._map_grid(ax, mslp_data)
             cs_mslp = ax.contour(
-                mslp_data[lon_name].values, mslp_data[lat_name].values, mslp_data.values,
+                mslp_x, mslp_y, mslp_z,
                 levels=np.arange(960, 1060, 4),
                 colors='black', linewidths=1.2,
-                transform=ccrs.PlateCarree(), zorder=12
+                transform=mslp_transform, zorder=12
             )
             ax.clabel(cs_mslp, inline=True, fontsize=9, fmt='%d', zorder=13)
             if thickness_data is not None:
@@ -824,17 +1120,18 @@ class MapGenerator:
                 # Clip levels to data range
                 tmin = float(thickness_data.min())
                 tmax = float(thickness_data.max())
+                thick_x, thick_y, thick_z, thick_transform = self._map_grid(ax, thickness_data)
 
                 if tmin <= 540:
                     cold_levels_in = cold_levels[(cold_levels >= tmin) & (cold_levels <= min(540, tmax))]
                     if cold_levels_in.size:
                         cs_cold = ax.contour(
-                            thickness_data[lon_name].values, thickness_data[lat_name].values, thickness_data.values,
+                            thick_x, thick_y, thick_z,
                             levels=cold_levels_in,
                             colors='blue',
                             linewidths=1.2,
                             linestyles='dashed',
-                            transform=ccrs.PlateCarree(),
+                            transform=thick_transform,
                             zorder=11,
                         )
                         ax.clabel(cs_cold, inline=True, fontsize=8, fmt='%d', zorder=13)
@@ -843,12 +1140,12 @@ class MapGenerator:
                     warm_levels_in = warm_levels[(warm_levels >= max(546, tmin)) & (warm_levels <= tmax)]
                     if warm_levels_in.size:
                         cs_warm = ax.contour(
-                            thickness_data[lon_name].values, thickness_data[lat_name].values, thickness_data.values,
+                            thick_x, thick_y, thick_z,
                             levels=warm_levels_in,
                             colors='red',
                             linewidths=1.2,
                             linestyles='dashed',
-                            transform=ccrs.PlateCarree(),
+                            transform=thick_transform,
                             zorder=11,
                         )
                         ax.clabel(cs_warm, inline=True, fontsize=8, fmt='%d', zorder=13)
@@ -858,10 +1155,15 @@ class MapGenerator:
             lat_vals = data.coords.get('lat', data.coords.get('latitude'))
             # Use Celsius levels from -40 to 46 with 1 degree increments for smoothness
             temp_levels = np.arange(-40, 47, 1)
+            try:
+                mslp_data = self._field(ds, 'mslp', lambda: self._normalize_lonlat(self._process_mslp(ds)))
+            except ValueError:
+                logger.debug("No MSLP in dataset, 850mb map drawn without H/L labels")
             
+            X, Y, Z, transform = self._map_grid(ax, data)
             im = ax.contourf(
-                lon_vals, lat_vals, data,
-                transform=ccrs.PlateCarree(),
+                X, Y, Z,
+                transform=transform,
                 cmap=cmap,
                 levels=temp_levels,
                 extend='both',
@@ -872,23 +1174,15 @@ class MapGenerator:
             lon_vals = data.coords.get('lon', data.coords.get('longitude'))
             lat_vals = data.coords.get('lat', data.coords.get('latitude'))
             
-            # Get precipitation type categorical data
-            crain = ds.get('crain', xr.zeros_like(data))
-            csnow = ds.get('csnow', xr.zeros_like(data))
-            cicep = ds.get('cicep', xr.zeros_like(data))
-            cfrzr = ds.get('cfrzr', xr.zeros_like(data))
-            
-            # Remove time dimension if present
-            if 'time' in crain.dims: crain = crain.isel(time=0)
-            if 'time' in csnow.dims: csnow = csnow.isel(time=0)
-            if 'time' in cicep.dims: cicep = cicep.isel(time=0)
-            if 'time' in cfrzr.dims: cfrzr = cfrzr.isel(time=0)
-            
-            # Normalize coordinates for categorical data
-            crain = self._normalize_coords(crain)
-            csnow = self._normalize_coords(csnow)
-            cicep = self._normalize_coords(cicep)
-            cfrzr = self._normalize_coords(cfrzr)
+            # Get precipitation type categorical data (normalised, shared with mslp_precip)
+            crain, csnow, cicep, cfrzr = (
+                self._precip_type_field(ds, var_key)
+                for var_key in ('crain', 'csnow', 'cicep', 'cfrzr')
+            )
+            crain, csnow, cicep, cfrzr = (
+                mask if mask is not None else xr.zeros_like(data)
+                for mask in (crain, csnow, cicep, cfrzr)
+            )
 
             def _sanitize_type_mask(mask_da: xr.DataArray) -> np.ndarray:
                 vals = np.asarray(mask_da.values, dtype=float)
@@ -973,6 +1267,7 @@ class MapGenerator:
                     ('snow', csnow, 1),
                     ('rain', crain, 0)
                 ]
+                raster_layers = []
                 
                 for p_type, mask, idx in plot_order:
                     cmap_type, norm_type, levels_type = self.get_radar_cmap(p_type)
@@ -991,10 +1286,16 @@ class MapGenerator:
                     # Mask the data for this precipitation type using expanded mask
                     masked_data = np.where(expanded_mask, data_vals, np.nan)
                     
-                    if np.any(~np.isnan(masked_data)):
+                    if settings.raster_renderer:
+                        # Composited into one raster after the loop, same painting order
+                        if np.any(~np.isnan(masked_data)):
+                            style = TileStyle(cmap_type, levels_type, norm_type, extend='max')
+                            raster_layers.append((data.copy(data=masked_data), style, _alpha_for_bin))
+                    elif np.any(~np.isnan(masked_data)):
+                        X, Y, Z, transform = self._map_grid(ax, data.copy(data=masked_data))
                         im_temp = ax.contourf(
-                            lon_vals, lat_vals, masked_data,
-                            transform=ccrs.PlateCarree(),
+                            X, Y, Z,
+                            transform=transform,
                             cmap=cmap_type,
                             norm=norm_type,
                             levels=levels_type,
@@ -1019,6 +1320,9 @@ class MapGenerator:
                         # Keep the last plotted image for colorbar
                         if im is None:
                             im = im_temp
+                
+                if raster_layers:
+                    im = self._draw_raster_layer(ax, raster_layers)
             else:
                 # Fall back to single rain colormap if no type data available
                 logger.warning("No precipitation type data available, using rain colormap for all reflectivity")
@@ -1035,38 +1339,43 @@ class MapGenerator:
                         return 0.25 + 0.45 * (low_edge_dbz - 20) / 10.0
                     return min(1.0, 0.8 + 0.2 * (low_edge_dbz - 30) / 40.0)
                 
-                im = ax.contourf(
-                    lon_vals, lat_vals, masked_data,
-                    transform=ccrs.PlateCarree(),
-                    cmap=cmap_type,
-                    norm=norm_type,
-                    levels=levels_type,
-                    extend='max',
-                    zorder=1
-                )
-                
-                # Apply alpha using actual contour levels (handles extend='max' correctly)
-                levels_used = im.levels
-                n_intervals = len(levels_used) - 1
-                
-                # Apply alpha to each interval collection
-                # GeoContourSet (cartopy) stores collections differently than ContourSet
-                collections = getattr(im, 'collections', [])
-                for i in range(min(n_intervals, len(collections))):
-                    collections[i].set_alpha(_alpha_for_bin(levels_used[i]))
-                
-                # If extend='max' adds an extra "over" collection, force it visible
-                if len(collections) > n_intervals:
-                    collections[-1].set_alpha(1.0)
+                if settings.raster_renderer:
+                    style = TileStyle(cmap_type, levels_type, norm_type, extend='max')
+                    im = self._draw_raster_layer(ax, [(data.copy(data=masked_data), style, _alpha_for_bin)])
+                else:
+                    X, Y, Z, transform = self._map_grid(ax, data.copy(data=masked_data))
+                    im = ax.contourf(
+                        X, Y, Z,
+                        transform=transform,
+                        cmap=cmap_type,
+                        norm=norm_type,
+                        levels=levels_type,
+                        extend='max',
+                        zorder=1
+                    )
+                    
+                    # Apply alpha using actual contour levels (handles extend='max' correctly)
+                    levels_used = im.levels
+                    n_intervals = len(levels_used) - 1
+                    
+                    # Apply alpha to each interval collection
+                    # GeoContourSet (cartopy) stores collections differently than ContourSet
+                    collections = getattr(im, 'collections', [])
+                    for i in range(min(n_intervals, len(collections))):
+                        collections[i].set_alpha(_alpha_for_bin(levels_used[i]))
+                    
+                    # If extend='max' adds an extra "over" collection, force it visible
+                    if len(collections) > n_intervals:
+                        collections[-1].set_alpha(1.0)
         elif is_wind_speed_map:
             # Wind Speed with Streamlines
             # Use helper to get correct coordinates and transform
-            X, Y, transform = self._get_plot_coords_and_transform(data, ax)
+            X, Y, Z, transform = self._map_grid(ax, data)
             
             
             # Plot filled contours for wind speed
             im = ax.contourf(
-                X, Y, data,
+                X, Y, Z,
                 transform=transform,
                 cmap=cmap,
                 levels=wind_levels,
@@ -1077,7 +1386,7 @@ class MapGenerator:
             # Add contour lines with labels for key wind speeds
             contour_levels = [3, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 60, 70, 80, 90]
             cs = ax.contour(
-                X, Y, data,
+                X, Y, Z,
                 levels=contour_levels,
                 colors='black',
                 linewidths=0.5,
@@ -1113,9 +1422,10 @@ class MapGenerator:
                 
                 # Add streamlines to show wind direction
                 # Use a moderate density for clarity
+                X, Y, U, V, transform = self._map_vectors(ax, u, v, density=1.5)
                 ax.streamplot(
                     X, Y, 
-                    u.values, v.values,
+                    U, V,
                     transform=transform,
                     color='black',
                     linewidth=0.6,
@@ -1173,11 +1483,16 @@ class MapGenerator:
             logger.debug(f"Data min: {float(data.min()):.2f}, max: {float(data.max()):.2f}, mean: {float(data.mean()):.2f}")
             
             # For precipitation, use BoundaryNorm for discrete color mapping
-            if variable in ["precipitation", "precip"]:
+            if settings.raster_renderer and variable in ["temperature_2m", "temp", "precipitation", "precip", "snowfall"]:
+                style = self._tile_style(variable)
+                self._draw_raster_layer(ax, [(data, style, None)])
+                im = colorbar_proxy(ax, style)
+            elif variable in ["precipitation", "precip"]:
                 logger.info(f"Plotting precipitation with {len(temp_levels)} levels")
+                X, Y, Z, transform = self._map_grid(ax, data)
                 im = ax.contourf(
-                    lon_vals, lat_vals, data,
-                    transform=ccrs.PlateCarree(),
+                    X, Y, Z,
+                    transform=transform,
                     cmap=cmap,
                     norm=precip_norm,
                     levels=temp_levels,
@@ -1186,9 +1501,10 @@ class MapGenerator:
                 )
             elif variable == "snowfall":
                 logger.info(f"Plotting snowfall with {len(snow_levels)} levels")
+                X, Y, Z, transform = self._map_grid(ax, data)
                 im = ax.contourf(
-                    lon_vals, lat_vals, data,
-                    transform=ccrs.PlateCarree(),
+                    X, Y, Z,
+                    transform=transform,
                     cmap=cmap,
                     norm=snow_norm,
                     levels=snow_levels,
@@ -1198,9 +1514,10 @@ class MapGenerator:
             else:
                 logger.info(f"Plotting {variable} with {len(temp_levels) if isinstance(temp_levels, (list, np.ndarray)) else temp_levels} levels")
                 logger.info(f"Data array shape: {data.shape}, lon_vals shape: {lon_vals.shape}, lat_vals shape: {lat_vals.shape}")
+                X, Y, Z, transform = self._map_grid(ax, data)
                 im = ax.contourf(
-                    lon_vals, lat_vals, data,
-                    transform=ccrs.PlateCarree(),
+                    X, Y, Z,
+                    transform=transform,
                     cmap=cmap,
                     levels=temp_levels,
                     extend='both',
@@ -1209,35 +1526,9 @@ class MapGenerator:
                 logger.info(f"Contourf completed successfully")
         
         # Add shared HIGH/LOW labels if MSLP data is available
-        if 'mslp_data' in locals() and mslp_data is not None:
+        if mslp_data is not None:
             try:
-                from scipy.ndimage import maximum_filter, minimum_filter
-                mslp_array = mslp_data.values
-                local_max = maximum_filter(mslp_array, size=20) == mslp_array
-                local_min = minimum_filter(mslp_array, size=20) == mslp_array
-                
-                # Use lon/lat from the data itself
-                lons = mslp_data.coords.get('lon', mslp_data.coords.get('longitude'))
-                lats = mslp_data.coords.get('lat', mslp_data.coords.get('latitude'))
-                is_360 = lons.max() > 180
-                
-                west = -125.0 % 360 if is_360 else -125.0
-                east = -110.0 % 360 if is_360 else -110.0
-                lon_min, lon_max = (west, east) if west < east else (west, 360)
-                lat_min, lat_max = 42.5, 48.5
-                
-                for i in range(5, len(lats) - 5):
-                    for j in range(5, len(lons) - 5):
-                        lat_v, lon_v = lats[i], lons[j]
-                        if not (lon_min <= lon_v <= lon_max and lat_min <= lat_v <= lat_max):
-                            continue
-                        val = mslp_array[i, j]
-                        if local_max[i, j] and val > 1013:
-                            ax.text(lon_v, lat_v, 'H', transform=ccrs.PlateCarree(), fontsize=16, fontweight='bold', ha='center', color='blue', zorder=15)
-                            ax.text(lon_v, lat_v - 0.2, f'{int(val)}', transform=ccrs.PlateCarree(), fontsize=10, fontweight='bold', ha='center', color='blue', zorder=15)
-                        elif local_min[i, j] and val < 1013:
-                            ax.text(lon_v, lat_v, 'L', transform=ccrs.PlateCarree(), fontsize=16, fontweight='bold', ha='center', color='red', zorder=15)
-                            ax.text(lon_v, lat_v - 0.2, f'{int(val)}', transform=ccrs.PlateCarree(), fontsize=10, fontweight='bold', ha='center', color='red', zorder=15)
+                self._label_pressure_centers(ax, mslp_data)
             except Exception as e:
                 logger.warning(f"Error labeling H/L: {e}")
         
@@ -1445,23 +1736,7 @@ class MapGenerator:
         if settings.station_overlays:
             try:
                 # Map variable to product_id for overlay rules
-                product_id_map = {
-                    'temperature_2m': 'temp_2m',
-                    'temp': 'temp_2m',
-                    'temp_850_wind_mslp': 'temp_850mb',
-                    '850mb': 'temp_850mb',
-                    'wind_speed_10m': 'wind_speed_10m',
-                    'wind_speed': 'wind_speed_10m',
-                    'precipitation': 'precipitation',
-                    'precip': 'precipitation',
-                    'snowfall': 'snowfall',
-                    'radar': 'radar',
-                    'radar_reflectivity': 'radar',
-                    'mslp_precip': 'mslp_precip',
-                    'mslp_pcpn': 'mslp_precip'
-                }
-                
-                product_id = product_id_map.get(variable, variable)
+                product_id = self.PRODUCT_IDS.get(variable, variable)
                 
                 # Check if overlays are enabled for this product
                 if not is_overlay_enabled(product_id):
@@ -1473,86 +1748,74 @@ class MapGenerator:
                     
                     logger.info(f"Station overlay enabled for {product_id} (spacing={min_px_spacing}px)")
                     
-                    # 1. Load station catalog
-                    catalog = StationCatalog()
-                    all_stations = catalog.get_stations_for_region(region_to_use)
+                    # 1-3. Load catalog, filter to region and declutter
+                    # (process-wide catalog; selection memoised per region/spacing)
+                    catalog = StationCatalog.shared()
+                    selected_stations = catalog.get_decluttered_stations(region_to_use, min_px_spacing)
                     
-                    if not all_stations:
-                        logger.warning(f"No stations found for region {region_to_use}")
+                    if not selected_stations:
+                        logger.warning(f"No stations selected for region {region_to_use}")
                     else:
-                        # 2. Get region bbox for decluttering
-                        region_bbox = get_region_bbox(region_to_use)
+                        logger.info(f"Selected {len(selected_stations)} stations after declutter")
                         
-                        # 3. Declutter stations
-                        selector = StationSelector(region_bbox, grid_size_px=min_px_spacing)
-                        always_include_ids = catalog.get_always_include_ids()
-                        selected_stations = selector.select_decluttered_stations(
-                            all_stations, always_include_ids
-                        )
+                        # 4. Sample values using GridLocator
+                        locator = GridLocatorFactory.from_dataset(ds)
                         
-                        if not selected_stations:
-                            logger.warning("No stations selected after decluttering")
+                        # Determine which dataset variable to use for sampling
+                        if variable in ["temperature_2m", "temp"]:
+                            extract_var = 'tmp2m'
+                        elif variable in ["temp_850_wind_mslp", "850mb"]:
+                            extract_var = 'tmp_850'
+                        elif variable in ["precipitation", "precip"]:
+                            extract_var = 'tp_total' if 'tp_total' in ds else ('tp' if 'tp' in ds else 'prate')
+                        elif variable == "snowfall":
+                            extract_var = 'tp_snow_total'
+                        elif variable in ["wind_speed_10m", "wind_speed"]:
+                            # Wind speed handled separately below
+                            extract_var = None
                         else:
-                            logger.info(f"Selected {len(selected_stations)} stations after declutter")
-                            
-                            # 4. Sample values using GridLocator
-                            locator = GridLocatorFactory.from_dataset(ds)
+                            extract_var = None
+                        
+                        if extract_var and extract_var in ds:
+                            # Sample values at station locations
+                            station_values = locator.sample(ds, extract_var, selected_stations)
                             
-                            # Determine which dataset variable to use for sampling
+                            # Convert units for display
                             if variable in ["temperature_2m", "temp"]:
-                                extract_var = 'tmp2m'
+                                # Convert K to F
+                                station_values = {k: (v - 273.15) * 9/5 + 32 if v > 100 else v
+                                                for k, v in station_values.items()}
                             elif variable in ["temp_850_wind_mslp", "850mb"]:
-                                extract_var = 'tmp_850'
+                                # Convert K to C
+                                station_values = {k: (v - 273.15) if v > 100 else v
+                                                for k, v in station_values.items()}
                             elif variable in ["precipitation", "precip"]:
-                                extract_var = 'tp_total' if 'tp_total' in ds else ('tp' if 'tp' in ds else 'prate')
-                            elif variable == "snowfall":
-                                extract_var = 'tp_snow_total'
-                            elif variable in ["wind_speed_10m", "wind_speed"]:
-                                # Wind speed handled separately below
-                                extract_var = None
-                            else:
-                                extract_var = None
+                                # Convert mm to inches
+                                if extract_var in ['tp_total', 'tp']:
+                                    station_values = {k: v / 25.4 for k, v in station_values.items()}
+                                else:
+                                    # prate is in kg/m²/s
+                                    station_values = {k: v * 3600 * 0.0393701 for k, v in station_values.items()}
+                            # snowfall already in inches
                             
-                            if extract_var and extract_var in ds:
-                                # Sample values at station locations
-                                station_values = locator.sample(ds, extract_var, selected_stations)
-                                
-                                # Convert units for display
-                                if variable in ["temperature_2m", "temp"]:
-                                    # Convert K to F
-                                    station_values = {k: (v - 273.15) * 9/5 + 32 if v > 100 else v
-                                                    for k, v in station_values.items()}
-                                elif variable in ["temp_850_wind_mslp", "850mb"]:
-                                    # Convert K to C
-                                    station_values = {k: (v - 273.15) if v > 100 else v
-                                                    for k, v in station_values.items()}
-                                elif variable in ["precipitation", "precip"]:
-                                    # Convert mm to inches
-                                    if extract_var in ['tp_total', 'tp']:
-                                        station_values = {k: v / 25.4 for k, v in station_values.items()}
-                                    else:
-                                        # prate is in kg/m²/s
-                                        station_values = {k: v * 3600 * 0.0393701 for k, v in station_values.items()}
-                                # snowfall already in inches
-                                
-                                # 5. Render station overlays
+                            # 5. Render station overlays
+                            self._render_station_overlays(
+                                ax, selected_stations, station_values,
+                                transform=ccrs.PlateCarree()
+                            )
+                            logger.info(f"Rendered {len(station_values)} station overlays")
+                        elif variable in ["wind_speed_10m", "wind_speed"]:
+                            # Wind speed requires special handling (u/v components)
+                            station_values = self._sample_wind_speed(ds, selected_stations)
+                            if station_values:
                                 self._render_station_overlays(
                                     ax, selected_stations, station_values,
                                     transform=ccrs.PlateCarree()
                                 )
-                                logger.info(f"Rendered {len(station_values)} station overlays")
-                            elif variable in ["wind_speed_10m", "wind_speed"]:
-                                # Wind speed requires special handling (u/v components)
-                                station_values = self._sample_wind_speed(ds, selected_stations)
-                                if station_values:
-                                    self._render_station_overlays(
-                                        ax, selected_stations, station_values,
-                                        transform=ccrs.PlateCarree()
-                                    )
-                                    logger.info(f"Rendered {len(station_values)} wind speed overlays")
-                            else:
-                                logger.warning(f"Variable {extract_var} not found in dataset for station overlays")
-                    
+                                logger.info(f"Rendered {len(station_values)} wind speed overlays")
+                        else:
+                            logger.warning(f"Variable {extract_var} not found in dataset for station overlays")
+                
             except Exception as e:
                 # Don't fail the whole map generation if overlays fail
                 logger.warning(f"Could not add station overlays: {e}", exc_info=True)
@@ -1594,6 +1857,15 @@ class MapGenerator:
             raise IOError(f"Map file is empty: {filepath}")
         logger.info(f"Map file verified: {filepath} ({file_size} bytes)")
         
+        # Index the map so the API never has to scan the images directory
+        try:
+            get_map_manifest().record(filepath)
+        except Exception as e:
+            logger.warning(f"Could not record {filename} in map manifest: {e}")
+        
+        if settings.tile_output:
+            self._write_tiles(tile_data, variable, model, run_str, forecast_hour)
+        
         # Aggressive memory cleanup to prevent matplotlib leaks
         # CRITICAL: Must explicitly close figure and delete references
         try:
@@ -1643,6 +1915,13 @@ class MapGenerator:
         logger.info(f"_process_temperature result - shape: {result.shape}, coords: {list(result.coords.keys())}, dims: {list(result.dims)}")
         return result
     
+    def _process_850mb_temperature(self, ds: xr.Dataset) -> xr.DataArray:
+        """Process 850mb temperature data (°C)"""
+        temp = self._normalize_lonlat(ds['tmp_850'])
+        if float(temp.max()) > 100:  # Kelvin
+            temp = temp - 273.15  # Convert to Celsius
+        return temp
+    
     def _process_precipitation(self, ds: xr.Dataset, forecast_hour: int = 0) -> xr.DataArray:
         """
         Process precipitation data.
@@ -2181,6 +2460,47 @@ class MapGenerator:
             f"No standard coordinates found. coords={list(da.coords)}, dims={list(da.dims)}"
         )
 
+    def _lonlat_plan(self, da: xr.DataArray, lon_name: str, lat_name: str) -> dict:
+        """
+        How to normalise a grid: longitude wrap (and sort order for 1D axes)
+        and latitude flip, computed once per grid and reused by every field.
+        
+        Grids are told apart by coordinate shape and corner values, which
+        also separates an already-normalised grid from its raw form.
+        """
+        lon_vals = da.coords[lon_name].values
+        lat_vals = da.coords[lat_name].values
+        key = (
+            lon_name, lat_name, da.coords[lon_name].dims, da.coords[lat_name].dims,
+            lon_vals.shape, lat_vals.shape,
+            float(lon_vals.flat[0]), float(lon_vals.flat[-1]),
+            float(lat_vals.flat[0]), float(lat_vals.flat[-1])
+        )
+        plan = self._lonlat_plans.get(key)
+        if plan is not None:
+            return plan
+        
+        plan = {'lon': None, 'order': None, 'flip_dim': None}
+        if lon_vals.ndim == 2:
+            # 2D curvilinear grids (HRRR): wrap in place, flip rows to north-up
+            if np.nanmax(lon_vals) > 180:
+                plan['lon'] = (((lon_vals + 180) % 360) - 180)
+            if lat_vals.ndim == 2 and np.nanmean(lat_vals[0, :]) > np.nanmean(lat_vals[-1, :]):
+                plan['flip_dim'] = da.coords[lat_name].dims[0]
+        else:
+            # 1D regular grids (GFS): wrap and sort longitudes, ascending latitudes
+            if np.nanmax(lon_vals) > 180:
+                wrapped = (((lon_vals + 180) % 360) - 180)
+                plan['order'] = np.argsort(wrapped, kind='stable')
+                plan['lon'] = wrapped[plan['order']]
+            if lat_vals[0] > lat_vals[-1]:
+                plan['flip_dim'] = da.coords[lat_name].dims[0]
+        
+        if len(self._lonlat_plans) >= 8:
+            self._lonlat_plans.pop(next(iter(self._lonlat_plans)))
+        self._lonlat_plans[key] = plan
+        return plan
+    
     def _normalize_lonlat(self, da: xr.DataArray) -> xr.DataArray:
         """
         Normalize lon/lat coordinates leveraging cfgrib standardization.
@@ -2192,9 +2512,10 @@ class MapGenerator:
         - Longitude wrapping: 0-360 → -180-180
         - Latitude ordering: ensures south-to-north (ascending)
         - Both 1D regular and 2D curvilinear grids
-        """
-        import numpy as np
         
+        The reordering is a single isel (one copy of the field) using the
+        grid's cached plan.
+        """
         # cfgrib standardizes to 'latitude'/'longitude' (fallback to 'lat'/'lon' for NOMADS)
         lon_name = 'longitude' if 'longitude' in da.coords else ('lon' if 'lon' in da.coords else None)
         lat_name = 'latitude' if 'latitude' in da.coords else ('lat' if 'lat' in da.coords else None)
@@ -2203,34 +2524,60 @@ class MapGenerator:
             logger.debug(f"No standard lat/lon coords found in {list(da.coords.keys())}, skipping normalization")
             return da
         
-        lon_vals = da.coords[lon_name].values
-        lat_vals = da.coords[lat_name].values
-        
-        # Handle 2D curvilinear grids (HRRR)
-        if lon_vals.ndim == 2:
-            # Wrap longitude if needed
-            if np.nanmax(lon_vals) > 180:
-                lon_wrapped = (((lon_vals + 180) % 360) - 180)
-                da = da.assign_coords({lon_name: (da.coords[lon_name].dims, lon_wrapped)})
-            
-            # Ensure north-up orientation (south-to-north rows)
-            if lat_vals.ndim == 2:
-                ydim = da.coords[lat_name].dims[0]
-                if np.nanmean(lat_vals[0, :]) > np.nanmean(lat_vals[-1, :]):
-                    da = da.isel({ydim: slice(None, None, -1)})
-                    logger.debug(f"Flipped {ydim} for north-up orientation")
-            return da
+        plan = self._lonlat_plan(da, lon_name, lat_name)
+        lon_dims = da.coords[lon_name].dims
         
-        # Handle 1D regular grids (GFS)
-        if np.nanmax(lon_vals) > 180:
-            da = da.assign_coords({lon_name: (((lon_vals + 180) % 360) - 180)})
-            da = da.sortby(lon_name)
+        if plan['lon'] is not None and plan['order'] is None:
+            da = da.assign_coords({lon_name: (lon_dims, plan['lon'])})
         
-        # Ensure latitude is ascending (south to north)
-        if lat_vals[0] > lat_vals[-1]:
-            da = da.reindex({lat_name: lat_vals[::-1]})
+        indexers = {}
+        if plan['order'] is not None:
+            indexers[lon_dims[0]] = plan['order']
+        if plan['flip_dim'] is not None:
+            indexers[plan['flip_dim']] = slice(None, None, -1)
+        if indexers:
+            da = da.isel(indexers)
         
+        if plan['order'] is not None:
+            da = da.assign_coords({lon_name: (lon_dims, plan['lon'])})
         return da
+    
+    def _field(self, ds: xr.Dataset, name: str, build):
+        """
+        A processed, coordinate-normalised field of ``ds``, built once.
+        
+        generate_map runs once per variable on the same forecast-hour dataset
+        and several maps share fields (MSLP, precipitation-type masks), so
+        fields are kept until a different dataset comes in or
+        clear_field_cache is called. Cached fields are shared: never modify
+        them in place.
+        
+        Args:
+            name: Cache key of the field
+            build: Zero-argument callable producing the field
+        """
+        if self._fields_ds is not ds:
+            self._fields_ds = ds
+            self._fields = {}
+        if name not in self._fields:
+            self._fields[name] = build()
+        return self._fields[name]
+    
+    def clear_field_cache(self):
+        """Drop the processed fields (and the reference) of the last dataset mapped."""
+        self._fields_ds = None
+        self._fields = {}
+    
+    def _precip_type_field(self, ds: xr.Dataset, var_key: str) -> Optional[xr.DataArray]:
+        """Normalised categorical precipitation-type mask (crain, csnow, ...), None if missing."""
+        def _build():
+            if var_key not in ds:
+                return None
+            mask = ds[var_key]
+            if 'time' in mask.dims:
+                mask = mask.isel(time=0)
+            return self._normalize_lonlat(mask)
+        return self._field(ds, var_key, _build)
 
     def _normalize_coords(self, obj):
         """Normalize longitude/latitude on either Dataset or DataArray."""
@@ -0,0 +1,250 @@
+"""SQLite manifest of rendered map images.
+
+The API used to answer every /maps, /runs and /maps/{id} request by globbing
+the images directory, splitting thousands of filenames and stat()-ing each
+file. The manifest records each map when MapGenerator saves it (model, run,
+variable, forecast hour, mtime, size) so the API can answer filters with
+indexed lookups that cost O(results).
+
+The database lives next to the images directory and runs in WAL mode, so
+scheduler workers in separate processes can insert while the API reads;
+readers always see committed rows, so there is nothing to poll or watch.
+If the database is missing (first deploy, or deleted by hand) it is rebuilt
+from a single directory scan.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import sqlite3
+import threading
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS maps (
+    id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    run_time TEXT NOT NULL,
+    variable TEXT NOT NULL,
+    forecast_hour INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    file_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_maps_model_run ON maps (model, run_time);
+CREATE INDEX IF NOT EXISTS idx_maps_run ON maps (run_time);
+"""
+
+
+def parse_map_filename(stem: str) -> Optional[Dict]:
+    """
+    Split a map filename stem into its parts.
+
+    Format: {model}_{YYYYMMDD}_{HH}_{variable}_{forecast_hour}
+
+    Returns:
+        Dict with model, run_time, variable, forecast_hour, or None if the
+        name does not follow the map naming scheme
+    """
+    parts = stem.split("_")
+    if len(parts) < 4:
+        return None
+    try:
+        forecast_hour = int(parts[-1])
+    except ValueError:
+        return None
+    return {
+        'model': parts[0].upper(),
+        'run_time': f"{parts[1]}_{parts[2]}",
+        'variable': "_".join(parts[3:-1]),
+        'forecast_hour': forecast_hour,
+    }
+
+
+class MapManifest:
+    """Indexed catalogue of map images shared by the scheduler and the API."""
+
+    def __init__(self, db_path: Optional[Path] = None, images_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: SQLite file (default: {storage_path}/../map_manifest.sqlite3)
+            images_path: Directory holding the PNGs (default: storage_path)
+        """
+        self.images_path = Path(images_path or settings.storage_path)
+        self.db_path = Path(db_path or (self.images_path.parent / "map_manifest.sqlite3"))
+        self._local = threading.local()
+        self._checked = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def ensure_index(self) -> None:
+        """Build the manifest from the images directory if it is missing or empty (once per process)."""
+        if self._checked:
+            return
+        self._checked = True
+
+        existed = self.db_path.exists()
+        conn = self._connect()
+        if existed and conn.execute("SELECT 1 FROM maps LIMIT 1").fetchone():
+            return
+        if self.images_path.exists() and next(self.images_path.glob("*.png"), None) is not None:
+            self.rebuild_from_directory()
+
+    def rebuild_from_directory(self) -> int:
+        """
+        Replace the manifest with one scan of the images directory.
+
+        Returns:
+            Number of maps indexed
+        """
+        rows = []
+        if self.images_path.exists():
+            for image_file in self.images_path.glob("*.png"):
+                info = parse_map_filename(image_file.stem)
+                if info is None:
+                    continue
+                try:
+                    stat = image_file.stat()
+                except OSError:
+                    continue
+                rows.append((
+                    image_file.stem, info['model'], info['run_time'], info['variable'],
+                    info['forecast_hour'], image_file.name, stat.st_mtime, stat.st_size
+                ))
+
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM maps")
+            conn.executemany("INSERT OR REPLACE INTO maps VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        logger.info(f"Rebuilt map manifest from {self.images_path}: {len(rows)} maps")
+        return len(rows)
+
+    def record(self, filepath: Path) -> None:
+        """Insert or refresh one saved map (called right after savefig)."""
+        filepath = Path(filepath)
+        info = parse_map_filename(filepath.stem)
+        if info is None:
+            return
+        stat = filepath.stat()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO maps VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (filepath.stem, info['model'], info['run_time'], info['variable'],
+                 info['forecast_hour'], filepath.name, stat.st_mtime, stat.st_size)
+            )
+
+    def remove_run(self, model: str, run_time: str) -> int:
+        """Drop every map of one (model, run). Returns rows removed."""
+        conn = self._connect()
+        with conn:
+            cur = conn.execute(
+                "DELETE FROM maps WHERE model = ? AND run_time = ?", (model.upper(), run_time)
+            )
+        return cur.rowcount
+
+    def remove(self, map_id: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM maps WHERE id = ?", (map_id,))
+
+    def query(
+        self,
+        model: Optional[str] = None,
+        run_time: Optional[str] = None,
+        variable: Optional[str] = None,
+        forecast_hour: Optional[int] = None
+    ) -> List[sqlite3.Row]:
+        """Maps matching all given filters, ordered by model, run, hour and variable."""
+        self.ensure_index()
+        clauses, params = [], []
+        for column, value in (('model', model.upper() if model else None), ('run_time', run_time),
+                              ('variable', variable), ('forecast_hour', forecast_hour)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        sql = "SELECT * FROM maps"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY model, run_time, forecast_hour, variable"
+        return self._connect().execute(sql, params).fetchall()
+
+    def get(self, map_id: str) -> Optional[sqlite3.Row]:
+        self.ensure_index()
+        return self._connect().execute("SELECT * FROM maps WHERE id = ?", (map_id,)).fetchone()
+
+    def runs(self, model: Optional[str] = None) -> List[sqlite3.Row]:
+        """
+        Runs newest first with map count, latest mtime and total bytes.
+
+        Rows have run_time, model (when unfiltered, per model), count,
+        latest_mtime and total_bytes.
+        """
+        self.ensure_index()
+        if model:
+            sql = ("SELECT model, run_time, COUNT(*) AS count, MAX(mtime) AS latest_mtime, "
+                   "SUM(file_size) AS total_bytes FROM maps WHERE model = ? "
+                   "GROUP BY run_time ORDER BY run_time DESC")
+            return self._connect().execute(sql, (model.upper(),)).fetchall()
+        sql = ("SELECT model, run_time, COUNT(*) AS count, MAX(mtime) AS latest_mtime, "
+               "SUM(file_size) AS total_bytes FROM maps "
+               "GROUP BY model, run_time ORDER BY run_time DESC")
+        return self._connect().execute(sql).fetchall()
+
+    def run_signature(self, model: str, run_time: str) -> Optional[Tuple[int, float]]:
+        """(map count, latest mtime) of one run from the (model, run_time) index, or None if it has no maps."""
+        self.ensure_index()
+        row = self._connect().execute(
+            "SELECT COUNT(*), MAX(mtime) FROM maps WHERE model = ? AND run_time = ?",
+            (model.upper(), run_time)
+        ).fetchone()
+        return (row[0], row[1]) if row and row[0] else None
+
+    def latest_run(self, model: Optional[str] = None) -> Optional[str]:
+        """Newest run_time for a model, or across all models."""
+        self.ensure_index()
+        if model:
+            row = self._connect().execute(
+                "SELECT MAX(run_time) FROM maps WHERE model = ?", (model.upper(),)
+            ).fetchone()
+        else:
+            row = self._connect().execute("SELECT MAX(run_time) FROM maps").fetchone()
+        return row[0] if row else None
+
+    def totals(self) -> Dict[str, int]:
+        """Total map count and bytes."""
+        self.ensure_index()
+        row = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(file_size), 0) FROM maps").fetchone()
+        return {'count': row[0], 'bytes': row[1]}
+
+    @staticmethod
+    def created_at(row: sqlite3.Row) -> str:
+        return datetime.fromtimestamp(row['mtime']).isoformat()
+
+
+_manifest: Optional[MapManifest] = None
+
+
+def get_map_manifest() -> MapManifest:
+    """Process-wide manifest for the configured storage path."""
+    global _manifest
+    if _manifest is None or _manifest.images_path != Path(settings.storage_path):
+        _manifest = MapManifest()
+    return _manifest
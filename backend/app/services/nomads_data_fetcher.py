@@ -1,19 +1,50 @@
 """NOMADS-based data fetcher for models using NCEP NOMADS"""
 from datetime import datetime
 from pathlib import Path
-from typing import Set
+from typing import Dict, List, Optional, Set, Tuple, Union
+import numpy as np
 import xarray as xr
 import logging
-import requests
 import hashlib
 import os
-import time
 
 from app.services.base_data_fetcher import BaseDataFetcher
+from app.services.http_downloader import get_downloader
 from app.models.model_registry import ModelProvider, URLLayout
 
 logger = logging.getLogger(__name__)
 
+# Requested raw field -> messages to decode in the eccodes reader.
+# Each rule: (typeOfLevel, level or None for any, accepted shortName/cfVarName,
+# output variable name or None to keep the cfVarName cfgrib would use).
+_SURFACE_PRECIP = [('surface', None, ('tp',), None), ('surface', None, ('prate',), None)]
+_SURFACE_PTYPE = [('surface', None, (n,), None) for n in ('crain', 'csnow', 'cicep', 'cfrzr')]
+_ECCODES_FIELD_RULES = {
+    'tmp2m': [('heightAboveGround', 2, ('2t', 't2m', 't', 'tmp'), 'tmp2m')],
+    't2m': [('heightAboveGround', 2, ('2t', 't2m', 't', 'tmp'), 'tmp2m')],
+    'ugrd10m': [('heightAboveGround', 10, ('10u', 'u10'), None)],
+    'u10': [('heightAboveGround', 10, ('10u', 'u10'), None)],
+    'vgrd10m': [('heightAboveGround', 10, ('10v', 'v10'), None)],
+    'v10': [('heightAboveGround', 10, ('10v', 'v10'), None)],
+    'prmsl': [('meanSea', None, ('prmsl', 'msl'), None)],
+    'msl': [('meanSea', None, ('prmsl', 'msl'), None)],
+    'tp': _SURFACE_PRECIP,
+    'prate': _SURFACE_PRECIP,
+    'apcp': _SURFACE_PRECIP,
+    'refc': [('atmosphere', None, ('refc',), None)],
+    'crain': _SURFACE_PTYPE,
+    'csnow': _SURFACE_PTYPE,
+    'cicep': _SURFACE_PTYPE,
+    'cfrzr': _SURFACE_PTYPE,
+    'tmp_850': [('isobaricInhPa', 850, ('t', 'tmp'), 'tmp_850')],
+    'ugrd_850': [('isobaricInhPa', 850, ('u', 'ugrd'), 'ugrd_850')],
+    'vgrd_850': [('isobaricInhPa', 850, ('v', 'vgrd'), 'vgrd_850')],
+    'gh_500': [('isobaricInhPa', 500, ('gh', 'hgt'), 'gh_500')],
+    'hgt_500': [('isobaricInhPa', 500, ('gh', 'hgt'), 'gh_500')],
+    'gh_1000': [('isobaricInhPa', 1000, ('gh', 'hgt'), 'gh_1000')],
+    'hgt_1000': [('isobaricInhPa', 1000, ('gh', 'hgt'), 'gh_1000')],
+}
+
 
 class NOMADSDataFetcher(BaseDataFetcher):
     """Data fetcher for models hosted on NOMADS"""
@@ -69,36 +100,19 @@ class NOMADSDataFetcher(BaseDataFetcher):
     ) -> xr.Dataset:
         """Fetch raw GRIB fields from NOMADS"""
         
-        date_str = run_time.strftime("%Y%m%d")
-        run_hour_str = run_time.strftime("%H")
-        
-        # Determine if this is analysis (f000) and model has special analysis file
-        is_analysis = (forecast_hour == 0) and self.model_config.has_analysis_file
-        
         # Check if model has multiple products and we need fields from different products
         if len(self.model_config.products) > 1:
             return self._fetch_from_multiple_products(
-                run_time, forecast_hour, raw_fields, subset_region,
-                date_str, run_hour_str, is_analysis
+                run_time, forecast_hour, raw_fields, subset_region
             )
         
         # Single product - use original logic
-        product_name = list(self.model_config.products.keys())[0]
-        file_url = self._build_nomads_url_for_product(
-            product_name=product_name,
-            date_str=date_str,
-            run_hour=run_hour_str,
-            forecast_hour=forecast_hour,
-            is_analysis=is_analysis,
-            raw_fields=raw_fields,
-            subset_region=subset_region
+        (product_name, fields, file_url, cache_key), = self._product_requests(
+            run_time, forecast_hour, raw_fields, subset_region
         )
         
         logger.info(f"{self.model_id} URL: {file_url}")
         
-        # Create deterministic cache key based on run_time + forecast_hour + model + product
-        # This ensures the same GRIB file has the same cache key across workers/runs
-        cache_key = f"{self.model_id.lower()}_{date_str}_{run_hour_str}_f{forecast_hour:03d}_{product_name}"
         tmp_path = self._get_cached_grib_path(cache_key)
         
         if not tmp_path:
@@ -107,75 +121,105 @@ class NOMADSDataFetcher(BaseDataFetcher):
             logger.info(f"  Using cached file")
         
         # Open GRIB file
-        ds = self._open_grib_file(tmp_path, forecast_hour, raw_fields, subset_region)
+        ds = self._open_grib_file(tmp_path, forecast_hour, fields, subset_region)
         
         return ds
     
+    def _product_requests(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        raw_fields: Set[str],
+        subset_region: bool
+    ) -> List[Tuple[str, Set[str], str, str]]:
+        """
+        Work out which product files one forecast hour needs.
+        
+        Single-product models always use their only product. Models with
+        separate products (e.g., AIGFS 'sfc' and 'pres') get one entry per
+        product that holds at least one of the requested fields.
+        
+        Returns:
+            List of (product_name, fields, url, cache_key)
+        """
+        date_str = run_time.strftime("%Y%m%d")
+        run_hour_str = run_time.strftime("%H")
+        
+        # Determine if this is analysis (f000) and model has special analysis file
+        is_analysis = (forecast_hour == 0) and self.model_config.has_analysis_file
+        
+        if len(self.model_config.products) > 1:
+            # Separate fields by product
+            upper_air_fields = {'tmp_850', 'ugrd_850', 'vgrd_850', 'gh_500', 'hgt_500', 'gh_1000', 'hgt_1000'}
+            surface_fields = {'tmp2m', 't2m', 'ugrd10m', 'u10', 'vgrd10m', 'v10', 'prmsl', 'msl', 
+                             'tp', 'prate', 'apcp', 'refc', 'crain', 'csnow', 'cicep', 'cfrzr'}
+            by_product = [('sfc', raw_fields & surface_fields), ('pres', raw_fields & upper_air_fields)]
+            by_product = [(p, f) for p, f in by_product if f and p in self.model_config.products]
+        else:
+            by_product = [(list(self.model_config.products.keys())[0], raw_fields)]
+        
+        requests_list = []
+        for product_name, fields in by_product:
+            url = self._build_nomads_url_for_product(
+                product_name, date_str, run_hour_str, forecast_hour,
+                is_analysis, fields, subset_region
+            )
+            # Deterministic cache key based on run_time + forecast_hour + model + product
+            # This ensures the same GRIB file has the same cache key across workers/runs
+            cache_key = f"{self.model_id.lower()}_{date_str}_{run_hour_str}_f{forecast_hour:03d}_{product_name}"
+            requests_list.append((product_name, fields, url, cache_key))
+        return requests_list
+    
+    def _source_fingerprint(
+        self,
+        run_time: datetime,
+        forecast_hour: int,
+        raw_fields: Set[str]
+    ) -> Optional[str]:
+        """
+        Fingerprint an hour's inputs by the filter URLs that fetch them.
+        
+        NOMADS publishes each GRIB once, complete, and never rewrites it, so
+        the request (product, fields, region) identifies the bytes; there is
+        no per-message index to hash as there is for Herbie.
+        """
+        urls = sorted(url for _, _, url, _ in self._product_requests(run_time, forecast_hour, raw_fields, True))
+        return hashlib.sha1("\n".join(urls).encode()).hexdigest()
+    
     def _fetch_from_multiple_products(
         self,
         run_time: datetime,
         forecast_hour: int,
         raw_fields: Set[str],
-        subset_region: bool,
-        date_str: str,
-        run_hour_str: str,
-        is_analysis: bool
+        subset_region: bool
     ) -> xr.Dataset:
         """
         Fetch from multiple product files and merge them.
         Used for models like AIGFS that have separate sfc and pres files.
+        
+        Product files that are not cached yet are downloaded concurrently.
         """
-        # Separate fields by product
-        upper_air_fields = {'tmp_850', 'ugrd_850', 'vgrd_850', 'gh_500', 'hgt_500', 'gh_1000', 'hgt_1000'}
-        surface_fields = {'tmp2m', 't2m', 'ugrd10m', 'u10', 'vgrd10m', 'v10', 'prmsl', 'msl', 
-                         'tp', 'prate', 'apcp', 'refc', 'crain', 'csnow', 'cicep', 'cfrzr'}
+        product_requests = self._product_requests(run_time, forecast_hour, raw_fields, subset_region)
         
-        fields_needing_sfc = raw_fields & surface_fields
-        fields_needing_pres = raw_fields & upper_air_fields
+        missing = []
+        for product_name, _, url, cache_key in product_requests:
+            logger.info(f"  {self.model_id} {product_name.upper()} URL: {url}")
+            if self._get_cached_grib_path(cache_key):
+                logger.info(f"    Using cached {product_name} file")
+            else:
+                missing.append((url, cache_key))
         
-        datasets = []
+        if missing:
+            logger.info(f"  Downloading {len(missing)} product file(s) concurrently")
+            for result in self._download_many_from_nomads(missing).values():
+                if isinstance(result, Exception):
+                    raise result
         
-        # Fetch from sfc product if needed
-        if fields_needing_sfc and 'sfc' in self.model_config.products:
-            logger.info(f"  Fetching surface fields from 'sfc' product")
-            url_sfc = self._build_nomads_url_for_product(
-                'sfc', date_str, run_hour_str, forecast_hour, 
-                is_analysis, fields_needing_sfc, subset_region
-            )
-            logger.info(f"  {self.model_id} SFC URL: {url_sfc}")
-            
-            # Deterministic cache key
-            cache_key = f"{self.model_id.lower()}_{date_str}_{run_hour_str}_f{forecast_hour:03d}_sfc"
-            tmp_path = self._get_cached_grib_path(cache_key)
-            
-            if not tmp_path:
-                tmp_path = self._download_from_nomads(url_sfc, cache_key)
-            else:
-                logger.info(f"    Using cached sfc file")
-            
-            ds_sfc = self._open_grib_file(tmp_path, forecast_hour, fields_needing_sfc, subset_region)
-            datasets.append(ds_sfc)
-        
-        # Fetch from pres product if needed
-        if fields_needing_pres and 'pres' in self.model_config.products:
-            logger.info(f"  Fetching upper air fields from 'pres' product")
-            url_pres = self._build_nomads_url_for_product(
-                'pres', date_str, run_hour_str, forecast_hour,
-                is_analysis, fields_needing_pres, subset_region
-            )
-            logger.info(f"  {self.model_id} PRES URL: {url_pres}")
-            
-            # Deterministic cache key
-            cache_key = f"{self.model_id.lower()}_{date_str}_{run_hour_str}_f{forecast_hour:03d}_pres"
+        datasets = []
+        for product_name, fields, _, cache_key in product_requests:
+            logger.info(f"  Opening {product_name} fields: {sorted(fields)}")
             tmp_path = self._get_cached_grib_path(cache_key)
-            
-            if not tmp_path:
-                tmp_path = self._download_from_nomads(url_pres, cache_key)
-            else:
-                logger.info(f"    Using cached pres file")
-            
-            ds_pres = self._open_grib_file(tmp_path, forecast_hour, fields_needing_pres, subset_region)
-            datasets.append(ds_pres)
+            datasets.append(self._open_grib_file(tmp_path, forecast_hour, fields, subset_region))
         
         if not datasets:
             raise ValueError(f"No data fetched for any product")
@@ -193,6 +237,33 @@ class NOMADSDataFetcher(BaseDataFetcher):
                 ds.close()
             return merged
     
+    def prefetch_raw_data(
+        self,
+        run_time: datetime,
+        forecast_hours: List[int],
+        raw_fields: Set[str],
+        subset_region: bool = True
+    ) -> None:
+        """
+        Download every product file for ``forecast_hours`` concurrently.
+        
+        Failures are only logged; the subsequent fetch_raw_data call retries
+        and reports them.
+        """
+        missing = []
+        for fh in forecast_hours:
+            for _, _, url, cache_key in self._product_requests(run_time, fh, raw_fields, subset_region):
+                if not self._get_cached_grib_path(cache_key):
+                    missing.append((url, cache_key))
+        
+        if not missing:
+            return
+        
+        logger.info(f"    Prefetching {len(missing)} {self.model_id} file(s) concurrently")
+        for cache_key, result in self._download_many_from_nomads(missing).items():
+            if isinstance(result, Exception):
+                logger.warning(f"    Prefetch of {cache_key} failed: {str(result)[:100]}")
+    
     def _build_nomads_url_for_product(
         self,
         product_name: str,
@@ -383,43 +454,227 @@ class NOMADSDataFetcher(BaseDataFetcher):
         return params
     
     def _download_from_nomads(self, url: str, cache_key: str) -> str:
-        """Download GRIB file from NOMADS with retry logic"""
+        """
+        Download GRIB file from NOMADS with retry logic.
+        
+        Deduplicated across workers: if another process is already fetching
+        ``cache_key`` this waits for it and reuses the file.
+        """
         local_path = str(self._cache_dir / f"{cache_key}.grib2")
         
-        max_retries = self.model_config.max_retries
-        timeout = self.model_config.timeout
+        get_downloader().download(
+            url, local_path,
+            timeout=self.model_config.timeout,
+            max_retries=self.model_config.max_retries,
+            reuse_max_age=self._cache_max_age_seconds
+        )
         
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"  Downloading (attempt {attempt + 1}/{max_retries})...")
-                response = requests.get(url, timeout=timeout, stream=True)
-                response.raise_for_status()
-                
-                with open(local_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                # Cache it
-                self._grib_cache[cache_key] = (local_path, os.path.getmtime(local_path))
-                
-                file_size_mb = os.path.getsize(local_path) / (1024 * 1024)
-                logger.info(f"  Downloaded {file_size_mb:.1f} MB")
-                
-                return local_path
-            
-            except Exception as e:
-                logger.warning(f"  Download attempt {attempt + 1} failed: {e}")
-                if attempt == max_retries - 1:
-                    raise
-                time.sleep(2 ** attempt)  # Exponential backoff
+        # Cache it
+        self._grib_cache[cache_key] = (local_path, os.path.getmtime(local_path))
+        return local_path
+    
+    def _download_many_from_nomads(self, jobs: List[Tuple[str, str]]) -> Dict[str, Union[str, Exception]]:
+        """
+        Download several (url, cache_key) pairs concurrently.
         
-        raise RuntimeError(f"Failed to download after {max_retries} attempts")
+        Returns:
+            Mapping of cache_key -> local path, or the exception that stopped it
+        """
+        paths = {cache_key: str(self._cache_dir / f"{cache_key}.grib2") for _, cache_key in jobs}
+        results = get_downloader().download_many(
+            [(url, paths[cache_key]) for url, cache_key in jobs],
+            timeout=self.model_config.timeout,
+            max_retries=self.model_config.max_retries,
+            reuse_max_age=self._cache_max_age_seconds
+        )
+        
+        by_key = {}
+        for cache_key, local_path in paths.items():
+            result = results[local_path]
+            if not isinstance(result, Exception):
+                self._grib_cache[cache_key] = (local_path, os.path.getmtime(local_path))
+            by_key[cache_key] = result
+        return by_key
     
     def _open_grib_file(self, path: str, forecast_hour: int, raw_fields: Set[str], subset_region: bool) -> xr.Dataset:
         """
         Open GRIB file and extract needed variables.
         Shared logic for all NOMADS/GRIB2 models.
         
+        **PERFORMANCE**: Walks the file once with eccodes and decodes only the
+        requested messages. Falls back to the per-level cfgrib reader when
+        eccodes is unavailable or the grid is not a regular lat/lon grid.
+        """
+        try:
+            ds = self._open_grib_file_eccodes(path, raw_fields)
+        except Exception as e:
+            logger.warning(f"  eccodes reader failed, using cfgrib: {str(e)[:100]}")
+            ds = None
+        
+        if ds is not None:
+            return ds
+        return self._open_grib_file_cfgrib(path, forecast_hour, raw_fields, subset_region)
+    
+    def _build_grib_message_index(self, path: str) -> Dict[Tuple[str, str, int, str], dict]:
+        """
+        Scan GRIB message headers once and index them by
+        (shortName, typeOfLevel, level, stepType).
+        
+        Only header keys are read; data sections are not unpacked.
+        
+        Returns:
+            Mapping of message key -> {'offset', 'cfVarName'}
+        """
+        import eccodes
+        
+        index = {}
+        with open(path, 'rb') as f:
+            while True:
+                gid = eccodes.codes_grib_new_from_file(f, headers_only=True)
+                if gid is None:
+                    break
+                try:
+                    key = (
+                        eccodes.codes_get(gid, 'shortName'),
+                        eccodes.codes_get(gid, 'typeOfLevel'),
+                        int(eccodes.codes_get(gid, 'level')),
+                        eccodes.codes_get(gid, 'stepType'),
+                    )
+                    # First occurrence wins, matching cfgrib's behaviour on duplicates
+                    if key not in index:
+                        index[key] = {
+                            'offset': int(eccodes.codes_get(gid, 'offset')),
+                            'cfVarName': eccodes.codes_get(gid, 'cfVarName'),
+                        }
+                finally:
+                    eccodes.codes_release(gid)
+        return index
+    
+    @staticmethod
+    def _select_grib_messages(index: dict, raw_fields: Set[str]) -> Dict[str, Tuple[str, str, int, str]]:
+        """
+        Pick the message to decode for each requested output variable.
+        
+        Step types are tried in order accum -> instant -> anything else,
+        the same priority the cfgrib reader applies to surface fields.
+        
+        Returns:
+            Mapping of output variable name -> message key
+        """
+        step_priority = {'accum': 0, 'instant': 1}
+        selected = {}
+        for field in raw_fields:
+            for type_of_level, level, names, out_name in _ECCODES_FIELD_RULES.get(field, []):
+                candidates = [
+                    key for key, meta in index.items()
+                    if key[1] == type_of_level
+                    and (level is None or key[2] == level)
+                    and (key[0] in names or meta['cfVarName'] in names)
+                ]
+                if not candidates:
+                    continue
+                candidates.sort(key=lambda k: step_priority.get(k[3], 2))
+                key = candidates[0]
+                name = out_name or index[key]['cfVarName']
+                selected.setdefault(name, key)
+        return selected
+    
+    def _open_grib_file_eccodes(self, path: str, raw_fields: Set[str]) -> Optional[xr.Dataset]:
+        """
+        One-pass GRIB reader: index message headers, then decode only the
+        messages that map to requested fields, directly into the standard
+        variable names (tp, prate, crain, tmp2m, u10, prmsl, refc, gh_500, ...).
+        
+        Returns:
+            Subsetted dataset, or None if eccodes is unavailable, the grid is
+            not regular_ll, or none of the requested fields are present.
+        """
+        try:
+            import eccodes
+        except ImportError:
+            logger.info("eccodes not installed, using cfgrib reader")
+            return None
+        
+        logger.info("Indexing GRIB messages with eccodes...")
+        index = self._build_grib_message_index(path)
+        selected = self._select_grib_messages(index, raw_fields)
+        if not selected:
+            logger.info(f"  No requested fields among {len(index)} messages")
+            return None
+        
+        data_vars = {}
+        coords = None
+        grid_key = None
+        with open(path, 'rb') as f:
+            for name, key in selected.items():
+                f.seek(index[key]['offset'])
+                gid = eccodes.codes_grib_new_from_file(f)
+                try:
+                    if eccodes.codes_get(gid, 'gridType') != 'regular_ll':
+                        logger.info(f"  Grid type {eccodes.codes_get(gid, 'gridType')} not supported by eccodes reader")
+                        return None
+                    
+                    ni = int(eccodes.codes_get(gid, 'Ni'))
+                    nj = int(eccodes.codes_get(gid, 'Nj'))
+                    lat0 = eccodes.codes_get(gid, 'latitudeOfFirstGridPointInDegrees')
+                    lat1 = eccodes.codes_get(gid, 'latitudeOfLastGridPointInDegrees')
+                    lon0 = eccodes.codes_get(gid, 'longitudeOfFirstGridPointInDegrees')
+                    lon1 = eccodes.codes_get(gid, 'longitudeOfLastGridPointInDegrees')
+                    if lon1 < lon0:
+                        lon1 += 360.0
+                    
+                    this_grid = (ni, nj, lat0, lat1, lon0, lon1)
+                    if grid_key is None:
+                        grid_key = this_grid
+                        data_date = str(eccodes.codes_get(gid, 'dataDate'))
+                        data_time = int(eccodes.codes_get(gid, 'dataTime'))
+                        step = float(eccodes.codes_get(gid, 'endStep'))
+                        ref_time = np.datetime64(
+                            f"{data_date[:4]}-{data_date[4:6]}-{data_date[6:8]}"
+                            f"T{data_time // 100:02d}:{data_time % 100:02d}"
+                        )
+                        coords = {
+                            'latitude': ('latitude', np.linspace(lat0, lat1, nj)),
+                            'longitude': ('longitude', np.linspace(lon0, lon1, ni)),
+                            'time': ref_time,
+                            'step': step,
+                            'valid_time': ref_time + np.timedelta64(int(round(step * 3600)), 's'),
+                        }
+                    elif this_grid != grid_key:
+                        logger.info(f"  Mixed grids in file ({name}), using cfgrib reader")
+                        return None
+                    
+                    values = eccodes.codes_get_values(gid).astype(np.float32).reshape(nj, ni)
+                    if eccodes.codes_get(gid, 'bitmapPresent'):
+                        missing = eccodes.codes_get(gid, 'missingValue')
+                        values[values == missing] = np.nan
+                    
+                    data_vars[name] = xr.DataArray(
+                        values,
+                        dims=('latitude', 'longitude'),
+                        attrs={
+                            'GRIB_shortName': key[0],
+                            'GRIB_typeOfLevel': key[1],
+                            'GRIB_level': key[2],
+                            'GRIB_stepType': key[3],
+                            'GRIB_stepUnits': int(eccodes.codes_get(gid, 'stepUnits')),
+                            'units': eccodes.codes_get(gid, 'units'),
+                            'long_name': eccodes.codes_get(gid, 'name'),
+                        }
+                    )
+                finally:
+                    eccodes.codes_release(gid)
+        
+        ds = xr.Dataset(data_vars, coords=coords)
+        ds = self._subset_dataset(ds)
+        logger.info(f"Extracted variables ({len(index)} messages indexed): {list(ds.data_vars)}")
+        return ds
+    
+    def _open_grib_file_cfgrib(self, path: str, forecast_hour: int, raw_fields: Set[str], subset_region: bool) -> xr.Dataset:
+        """
+        Open GRIB file and extract needed variables with one cfgrib pass per level.
+        Fallback for files the eccodes reader cannot handle.
+        
         **PERFORMANCE**: Uses persistent cfgrib index files to avoid re-parsing.
         This is critical - cfgrib indexing can take 10-30 seconds per file!
         """
@@ -0,0 +1,301 @@
+"""Per-run point time-series cube behind the point forecast (meteogram) API.
+
+Station values used to be sampled only while drawing overlays and then
+discarded. The scheduler now samples every catalog station in the map
+region, plus a regular lattice of points covering it, at every forecast
+hour for the main fields, and stores them in one
+(point x forecast hour x field) float32 array per run.
+
+The array is a ``.npy`` file opened as a memory map: workers write their
+hour's column in place, and the API reads one point's contiguous
+(hour x field) block, so a full meteogram costs a few page reads and never
+touches GRIB data.
+
+Layout::
+
+    {storage_path}/../point_cubes/{model}/{run}/cube.npy
+    {storage_path}/../point_cubes/{model}/{run}/meta.json
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import xarray as xr
+
+from app.config import settings
+from app.services.download_coordinator import get_download_coordinator
+from app.services.field_export import resolve_field
+from app.services.station_catalog import StationCatalog
+from app.services.station_sampling import GridLocatorFactory
+from app.services.tile_renderer import tile_bounds
+
+logger = logging.getLogger(__name__)
+
+# Dataset field -> units as stored
+CUBE_FIELDS = {
+    'tmp2m': 'K',
+    'ugrd10m': 'm/s',
+    'vgrd10m': 'm/s',
+    'prmsl': 'Pa',
+    'prate': 'kg/m^2/s',
+    'tp_total': 'mm',
+    'tp_snow_total': 'in',
+    'refc': 'dBZ',
+}
+
+# Spacing of the lattice that answers arbitrary lat/lon queries (degrees)
+LATTICE_STEP_DEG = 0.25
+
+# Runs whose cube the reader keeps memory-mapped per process
+_OPEN_RUNS_KEPT = 4
+
+
+def _build_points() -> Dict[str, list]:
+    """Catalog stations inside the map region followed by the lattice points."""
+    bounds = tile_bounds()
+    catalog = StationCatalog.shared()
+    table = catalog.get_table()
+    rows = catalog.query_bbox((bounds["west"], bounds["south"], bounds["east"], bounds["north"]))
+
+    ids = [str(table.ids[i]) for i in rows]
+    names = [table.stations[i].name for i in rows]
+    lats = [float(table.lats[i]) for i in rows]
+    lons = [float(table.lons[i]) for i in rows]
+
+    grid_lats = np.arange(bounds["south"], bounds["north"] + 1e-9, LATTICE_STEP_DEG)
+    grid_lons = np.arange(bounds["west"], bounds["east"] + 1e-9, LATTICE_STEP_DEG)
+    for lat in grid_lats:
+        for lon in grid_lons:
+            ids.append(f"grid_{lat:.2f}_{lon:.2f}")
+            names.append("")
+            lats.append(round(float(lat), 4))
+            lons.append(round(float(lon), 4))
+
+    return {'ids': ids, 'names': names, 'lats': lats, 'lons': lons, 'stations': int(len(rows))}
+
+
+class PointCube:
+    """Writer/reader for the per-run cubes of one storage root."""
+
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Args:
+            root: Cube root directory (default: {storage_path}/../point_cubes)
+        """
+        self.root = Path(root or (Path(settings.storage_path).parent / "point_cubes"))
+        # run dir -> (cube mtime, meta, memmap, id -> row) for the reader,
+        # least recently used first
+        self._open: "OrderedDict[Path, Tuple[float, dict, np.ndarray, Dict[str, int]]]" = OrderedDict()
+
+    def run_dir(self, model: str, run_time: str) -> Path:
+        return self.root / model.lower() / run_time
+
+    def _create(self, model: str, run_time: str) -> None:
+        """Allocate a NaN-filled cube and its metadata (once per run, across processes)."""
+        run_dir = self.run_dir(model, run_time)
+        with get_download_coordinator().lock(f"point_cube_{model.lower()}_{run_time}"):
+            if (run_dir / "cube.npy").exists():
+                return
+            run_dir.mkdir(parents=True, exist_ok=True)
+            points = _build_points()
+            meta = {
+                'model': model.upper(),
+                'run_time': run_time,
+                'forecast_hours': settings.forecast_hours_for_model(model),
+                'fields': list(CUBE_FIELDS),
+                'units': CUBE_FIELDS,
+                **points,
+            }
+            shape = (len(points['ids']), len(meta['forecast_hours']), len(CUBE_FIELDS))
+
+            tmp_path = run_dir / f".cube.{os.getpid()}.tmp.npy"
+            cube = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=shape)
+            cube[:] = np.nan
+            cube.flush()
+            del cube
+            (run_dir / "meta.json").write_text(json.dumps(meta))
+            os.replace(tmp_path, run_dir / "cube.npy")
+            logger.info(f"Created point cube for {model} {run_time}: {shape[0]} points x "
+                        f"{shape[1]} hours x {shape[2]} fields")
+
+    def write_hour(self, ds: xr.Dataset, model: str, run_time: str, forecast_hour: int) -> int:
+        """
+        Sample every cube point for the fields present in ``ds`` and store them.
+
+        Fields are also found under their cfVarName aliases (``u10`` for
+        ``ugrd10m``, see field_export.FIELD_ALIASES). Fields missing from
+        ``ds`` keep whatever an earlier pass wrote.
+
+        Returns:
+            Number of fields written
+        """
+        run_dir = self.run_dir(model, run_time)
+        if not (run_dir / "cube.npy").exists():
+            self._create(model, run_time)
+
+        meta = json.loads((run_dir / "meta.json").read_text())
+        if forecast_hour not in meta['forecast_hours']:
+            return 0
+        h = meta['forecast_hours'].index(forecast_hour)
+        lats = np.asarray(meta['lats'], dtype=np.float64)
+        lons = np.asarray(meta['lons'], dtype=np.float64)
+
+        locator = GridLocatorFactory.from_dataset(ds)
+        cube = np.load(run_dir / "cube.npy", mmap_mode='r+')
+        written = 0
+        for f, field in enumerate(meta['fields']):
+            name = resolve_field(ds, field)
+            if name is None:
+                continue
+            try:
+                cube[:, h, f] = locator.sample_points(ds, name, lats, lons)
+                written += 1
+            except Exception as e:
+                logger.warning(f"Could not sample {field} f{forecast_hour:03d} into point cube: {e}")
+        cube.flush()
+        del cube
+        return written
+
+    def has_hour(self, model: str, run_time: str, forecast_hour: int) -> bool:
+        """Whether any value has been written for a forecast hour."""
+        run_dir = self.run_dir(model, run_time)
+        try:
+            meta = json.loads((run_dir / "meta.json").read_text())
+            if forecast_hour not in meta['forecast_hours']:
+                return True  # Not part of this run's cube: nothing to write
+            cube = np.load(run_dir / "cube.npy", mmap_mode='r')
+        except (OSError, ValueError):
+            return False
+        return not np.all(np.isnan(cube[:, meta['forecast_hours'].index(forecast_hour), :]))
+
+    def _load(self, model: str, run_time: str) -> Optional[Tuple[dict, np.ndarray, Dict[str, int]]]:
+        run_dir = self.run_dir(model, run_time)
+        try:
+            mtime = (run_dir / "cube.npy").stat().st_mtime
+        except OSError:
+            # Removed by cleanup (possibly in another process): unmap it
+            self._open.pop(run_dir, None)
+            return None
+        cached = self._open.get(run_dir)
+        if cached and cached[0] == mtime:
+            self._open.move_to_end(run_dir)
+            return cached[1:]
+        meta = json.loads((run_dir / "meta.json").read_text())
+        cube = np.load(run_dir / "cube.npy", mmap_mode='r')
+        rows = {point_id: i for i, point_id in enumerate(meta['ids'])}
+        self._open[run_dir] = (mtime, meta, cube, rows)
+        self._open.move_to_end(run_dir)
+        self._prune_open()
+        return meta, cube, rows
+
+    def _prune_open(self) -> None:
+        """Unmap cubes deleted on disk and all but the most recently used runs."""
+        for run_dir in [d for d in self._open if not (d / "cube.npy").exists()]:
+            del self._open[run_dir]
+        while len(self._open) > _OPEN_RUNS_KEPT:
+            self._open.popitem(last=False)
+
+    def latest_run(self, model: str) -> Optional[str]:
+        """Newest run with a cube for a model."""
+        model_dir = self.root / model.lower()
+        if not model_dir.exists():
+            return None
+        runs = sorted(p.name for p in model_dir.iterdir() if (p / "cube.npy").exists())
+        return runs[-1] if runs else None
+
+    def series(
+        self,
+        model: str,
+        run_time: str,
+        station_id: Optional[str] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None
+    ) -> Optional[dict]:
+        """
+        Time series of every field at a station or the nearest cube point.
+
+        Args:
+            station_id: Catalog station id (exact match)
+            lat, lon: Arbitrary location, answered by the nearest station or
+                      lattice point
+
+        Returns:
+            Dict with the point, forecast hours and per-field values (None for
+            hours not generated yet), or None if the run or station is unknown
+
+        Raises:
+            ValueError: If neither station_id nor lat/lon is given
+        """
+        loaded = self._load(model, run_time)
+        if loaded is None:
+            return None
+        meta, cube, rows = loaded
+
+        if station_id is not None:
+            row = rows.get(station_id)
+            if row is None:
+                return None
+            distance_km = 0.0
+        elif lat is not None and lon is not None:
+            lats = np.asarray(meta['lats'])
+            lons = np.asarray(meta['lons'])
+            dlat = np.radians(lats - lat)
+            dlon = np.radians(lons - lon) * np.cos(np.radians(lat))
+            dist = 6371.0 * np.hypot(dlat, dlon)
+            row = int(np.argmin(dist))
+            distance_km = round(float(dist[row]), 2)
+        else:
+            raise ValueError("Either station_id or lat and lon are required")
+
+        block = np.asarray(cube[row])  # (hours, fields)
+        filled = ~np.all(np.isnan(block), axis=1)
+        hours = [fh for fh, ok in zip(meta['forecast_hours'], filled) if ok]
+        block = block[filled]
+
+        series = {}
+        for f, field in enumerate(meta['fields']):
+            values = block[:, f]
+            if np.all(np.isnan(values)):
+                continue
+            series[field] = {
+                'units': meta['units'][field],
+                'values': [None if np.isnan(v) else round(float(v), 3) for v in values],
+            }
+
+        return {
+            'model': meta['model'],
+            'run_time': meta['run_time'],
+            'point': {
+                'id': meta['ids'][row],
+                'name': meta['names'][row] or None,
+                'lat': meta['lats'][row],
+                'lon': meta['lons'][row],
+                'is_station': row < meta['stations'],
+                'distance_km': distance_km,
+            },
+            'forecast_hours': hours,
+            'series': series,
+        }
+
+    def remove_run(self, model: str, run_time: str) -> None:
+        """Delete a run's cube (called by cleanup)."""
+        run_dir = self.run_dir(model, run_time)
+        self._open.pop(run_dir, None)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+_point_cube: Optional[PointCube] = None
+
+
+def get_point_cube() -> PointCube:
+    """Process-wide point cube store for the configured storage path."""
+    global _point_cube
+    root = Path(settings.storage_path).parent / "point_cubes"
+    if _point_cube is None or _point_cube.root != root:
+        _point_cube = PointCube(root)
+    return _point_cube
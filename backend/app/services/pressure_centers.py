@@ -0,0 +1,153 @@
+"""High/low pressure-centre detection for the MSLP map labels.
+
+The labelling used to run a 20-point maximum/minimum filter over the whole
+grid and then visit every cell in a Python double loop, drawing a label for
+each local extremum, so a flat ridge produced a row of identical "H"s and
+2D (HRRR) coordinates were indexed as if they were 1D axes.
+
+Centres are now found with array operations on the map region only:
+
+* the grid is cropped to the region plus one search window;
+* local extrema are cells equal to the max/min filter of a window sized in
+  kilometres (so GFS and HRRR find centres of the same scale);
+* candidates need a minimum prominence (depth below/above the lowest/highest
+  pressure in the window) and must lie on the right side of the reference
+  pressure;
+* candidates are taken strongest first, dropping any within the separation
+  distance of an accepted centre of the same kind, up to a label cap.
+"""
+from dataclasses import dataclass
+from typing import Dict, List
+import math
+
+import numpy as np
+
+# Standard sea-level pressure: highs must be above it, lows below (hPa)
+REFERENCE_HPA = 1013.0
+
+
+@dataclass(frozen=True)
+class PressureCenter:
+    kind: str  # 'H' or 'L'
+    lat: float
+    lon: float
+    value: float  # hPa
+    prominence: float  # hPa above/below the opposite extreme of its window
+
+
+def _grid_spacing_km(lat: np.ndarray, lon: np.ndarray) -> float:
+    """Typical distance between neighbouring grid points."""
+    if lat.ndim == 1:
+        dlat = float(np.nanmedian(np.abs(np.diff(lat))))
+        dlon = float(np.nanmedian(np.abs(np.diff(lon)))) * math.cos(math.radians(float(np.nanmean(lat))))
+        return 111.2 * max(min(dlat, dlon), 1e-6)
+    dy = np.hypot(np.diff(lat, axis=0), np.diff(lon, axis=0) * np.cos(np.radians(lat[:-1])))
+    return 111.2 * max(float(np.nanmedian(dy)), 1e-6)
+
+
+def _crop(values: np.ndarray, lat2d: np.ndarray, lon2d: np.ndarray, inside: np.ndarray, margin: int):
+    """Bounding index box of the region plus ``margin`` cells on every side."""
+    rows = np.flatnonzero(inside.any(axis=1))
+    cols = np.flatnonzero(inside.any(axis=0))
+    r0, r1 = max(rows[0] - margin, 0), min(rows[-1] + margin + 1, values.shape[0])
+    c0, c1 = max(cols[0] - margin, 0), min(cols[-1] + margin + 1, values.shape[1])
+    box = (slice(r0, r1), slice(c0, c1))
+    return values[box], lat2d[box], lon2d[box], inside[box]
+
+
+def find_pressure_centers(
+    values: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray,
+    bounds: Dict[str, float],
+    window_km: float = 500.0,
+    min_prominence: float = 2.0,
+    min_separation_km: float = 600.0,
+    max_per_kind: int = 4,
+    reference: float = REFERENCE_HPA
+) -> List[PressureCenter]:
+    """
+    High and low pressure centres inside a lon/lat box.
+
+    Args:
+        values: MSLP in hPa, (ny, nx)
+        lat, lon: 1D axes (ny,) / (nx,) or 2D arrays of the values' shape;
+                  longitudes in -180..180 or 0..360
+        bounds: Region {"west", "east", "south", "north"} in degrees
+        window_km: Extremum search window (about 20 GFS grid points)
+        min_prominence: Minimum hPa a centre stands out within its window
+        min_separation_km: Minimum distance between two centres of one kind
+        max_per_kind: Label cap for highs and for lows
+
+    Returns:
+        Centres, highs then lows, each strongest first
+    """
+    from scipy.ndimage import maximum_filter, minimum_filter
+
+    values = np.asarray(values, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    lon = np.where(lon > 180.0, lon - 360.0, lon)
+    if lat.ndim == 1:
+        lon2d, lat2d = np.meshgrid(lon, lat)
+    else:
+        lat2d, lon2d = lat, lon
+
+    inside = ((lon2d >= bounds["west"]) & (lon2d <= bounds["east"])
+              & (lat2d >= bounds["south"]) & (lat2d <= bounds["north"]))
+    if not inside.any():
+        return []
+
+    spacing = _grid_spacing_km(lat, lon)
+    size = max(3, int(round(window_km / spacing)) | 1)
+    values, lat2d, lon2d, inside = _crop(values, lat2d, lon2d, inside, size)
+
+    finite = np.isfinite(values)
+    # NaN never equals a filter result; fill so it cannot win a window either
+    filled_hi = np.where(finite, values, -np.inf)
+    filled_lo = np.where(finite, values, np.inf)
+    window_max = maximum_filter(filled_hi, size=size, mode='nearest')
+    window_min = minimum_filter(filled_lo, size=size, mode='nearest')
+
+    candidates = {
+        'H': inside & finite & (values == window_max) & (values > reference)
+             & (values - window_min >= min_prominence),
+        'L': inside & finite & (values == window_min) & (values < reference)
+             & (window_max - values >= min_prominence),
+    }
+
+    centers: List[PressureCenter] = []
+    for kind, mask in candidates.items():
+        rows, cols = np.nonzero(mask)
+        if rows.size == 0:
+            continue
+        vals = values[rows, cols]
+        prominence = (vals - window_min[rows, cols]) if kind == 'H' else (window_max[rows, cols] - vals)
+        strength = vals if kind == 'H' else -vals
+        order = np.lexsort((-prominence, -strength))
+        c_lat = np.radians(lat2d[rows, cols][order])
+        c_lon = np.radians(lon2d[rows, cols][order])
+
+        accepted: List[int] = []
+        for k in range(len(order)):
+            if accepted:
+                a = np.asarray(accepted)
+                # Haversine distance to the accepted centres
+                h = (np.sin((c_lat[a] - c_lat[k]) / 2) ** 2
+                     + np.cos(c_lat[k]) * np.cos(c_lat[a]) * np.sin((c_lon[a] - c_lon[k]) / 2) ** 2)
+                if np.any(2 * 6371.0 * np.arcsin(np.sqrt(np.minimum(h, 1.0))) < min_separation_km):
+                    continue
+            accepted.append(k)
+            if len(accepted) >= max_per_kind:
+                break
+
+        for k in accepted:
+            i = order[k]
+            centers.append(PressureCenter(
+                kind=kind,
+                lat=float(np.degrees(c_lat[k])),
+                lon=float(np.degrees(c_lon[k])),
+                value=float(vals[i]),
+                prominence=float(prominence[i]),
+            ))
+    return centers
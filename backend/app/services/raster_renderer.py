@@ -0,0 +1,181 @@
+"""NumPy raster rendering of filled-contour data layers.
+
+Temperature, total precipitation, snowfall and radar maps are a classified
+field under the basemap, and ``ax.contourf`` with a PlateCarree transform
+(contour tracing plus cartopy reprojecting every polygon into Lambert
+Conformal) is most of the CPU time of those maps. In raster mode the data
+layer is instead drawn as an RGBA image already in the axes projection:
+
+* each field is regridded to one value per axes pixel with the cached
+  bilinear weights of the reprojection module;
+* values are binned with ``np.searchsorted`` against the contour levels and
+  looked up in the same colour table the tile renderer uses, so colours
+  match ``contourf(levels, cmap, norm, extend)`` band for band.
+
+The raster is placed with ``imshow`` in the axes projection (no warping), so
+the cached basemap, borders, colorbars, title and station overlays are drawn
+exactly as before. The mslp_precip map's precipitation types are one rate
+field with a type index, classified against a stacked colour table in one
+pass.
+"""
+from typing import Callable, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+from app.services.reprojection import reproject_for_axes
+from app.services.tile_renderer import TileStyle, contour_lut
+
+logger = logging.getLogger(__name__)
+
+
+def classify(
+    sampled: np.ndarray,
+    style: TileStyle,
+    band_alpha: Optional[Callable[[float], float]] = None
+) -> np.ndarray:
+    """
+    Colour a sampled field with contourf's band colours.
+
+    Args:
+        sampled: Raster of values (NaN = no data, transparent)
+        style: Levels, colormap, norm and extend of the contourf call
+        band_alpha: Optional alpha per band from its lower level (the radar
+                    map's per-collection alpha); the "over" band stays opaque
+
+    Returns:
+        RGBA uint8 raster of the same shape
+    """
+    levels, table = contour_lut(style)
+    if band_alpha is not None:
+        table = table.copy()
+        for i, low in enumerate(levels[:-1]):
+            table[i + 1, 3] = int(round(255 * band_alpha(float(low))))
+        table[-1, 3] = 255
+    # Row 0 is "no data"
+    table = np.vstack([np.zeros((1, 4), dtype=np.uint8), table])
+    valid = ~np.isnan(sampled)
+    index = np.searchsorted(levels, np.where(valid, sampled, levels[0]), side='right') + 1
+    index[~valid] = 0
+    return table[index]
+
+
+def composite(layers: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Alpha-composite RGBA uint8 rasters, later layers painted over earlier ones.
+
+    Pixels only one layer covers are copied; precipitation-type layers barely
+    overlap, so few pixels need blending.
+    """
+    out = np.zeros(layers[0].shape, dtype=np.uint8)
+    for layer in layers:
+        covered = layer[..., 3] > 0
+        overlap = covered & (out[..., 3] > 0)
+        np.copyto(out, layer, where=(covered & ~overlap)[..., None])
+        if not overlap.any():
+            continue
+        src = layer[overlap].astype(np.float32) / 255.0
+        dst = out[overlap].astype(np.float32) / 255.0
+        a_src, a_dst = src[:, 3:], dst[:, 3:] * (1 - src[:, 3:])
+        alpha = a_src + a_dst
+        rgb = (src[:, :3] * a_src + dst[:, :3] * a_dst) / np.maximum(alpha, 1e-6)
+        out[overlap] = np.round(np.concatenate([rgb, alpha], axis=1) * 255).astype(np.uint8)
+    return out
+
+
+def render_layer(
+    ax,
+    layers: Sequence[Tuple[np.ndarray, TileStyle, Optional[Callable[[float], float]]]],
+    lat: np.ndarray,
+    lon: np.ndarray,
+    zorder: float = 1
+):
+    """
+    Draw one or more classified fields on a map axes as a single image.
+
+    Args:
+        layers: (values on the lat/lon grid, style, band_alpha) in painting
+                order; all on the same grid
+        lat, lon: Grid coordinates from reprojection.grid_coords
+
+    Returns:
+        The AxesImage
+    """
+    reprojector = reproject_for_axes(ax, lat, lon)
+    rasters = [classify(reprojector.scalar(values), style, band_alpha) for values, style, band_alpha in layers]
+    rgba = rasters[0] if len(rasters) == 1 else composite(rasters)
+    return ax.imshow(rgba, origin='lower', extent=ax.get_extent(), transform=ax.projection,
+                     interpolation='nearest', zorder=zorder)
+
+
+def classify_categories(
+    sampled: np.ndarray,
+    category: np.ndarray,
+    styles: Sequence[TileStyle]
+) -> np.ndarray:
+    """
+    Colour a field whose points each belong to one of several layers (the
+    precipitation types), with one stacked colour table and one lookup.
+
+    Args:
+        sampled: Raster of values (NaN = no data)
+        category: Index into ``styles`` per point, negative = no data
+        styles: Levels, colormap, norm and extend of each layer
+
+    Returns:
+        RGBA uint8 raster of the same shape
+    """
+    tables = [np.zeros((1, 4), dtype=np.uint8)]
+    index = np.zeros(sampled.shape, dtype=np.int32)
+    valid = ~np.isnan(sampled)
+    offset = 1
+    for k, style in enumerate(styles):
+        levels, table = contour_lut(style)
+        selected = valid & (category == k)
+        if selected.any():
+            index[selected] = offset + np.searchsorted(levels, sampled[selected], side='right')
+        tables.append(table)
+        offset += len(table)
+    return np.vstack(tables)[index]
+
+
+def render_categories(
+    ax,
+    values: np.ndarray,
+    category: np.ndarray,
+    styles: Sequence[TileStyle],
+    lat: np.ndarray,
+    lon: np.ndarray,
+    zorder: float = 1
+):
+    """
+    Draw a categorised field (see classify_categories) on a map axes as one image.
+
+    Values are regridded bilinearly, categories from the nearest source point.
+
+    Returns:
+        The AxesImage
+    """
+    reprojector = reproject_for_axes(ax, lat, lon)
+    rgba = classify_categories(reprojector.scalar(values), reprojector.nearest(category), styles)
+    return ax.imshow(rgba, origin='lower', extent=ax.get_extent(), transform=ax.projection,
+                     interpolation='nearest', zorder=zorder)
+
+
+def colorbar_proxy(ax, style: TileStyle):
+    """
+    Invisible filled-contour set carrying a layer's levels, colormap, norm and
+    extend, so ``plt.colorbar`` draws the same bar as for the contourf path.
+
+    It covers a sliver of the map in the axes projection (no reprojection)
+    and costs one tiny contour.
+    """
+    x0, x1, y0, y1 = ax.get_extent()
+    levels = np.asarray(style.levels, dtype=float)
+    xs = [x0, x0 + (x1 - x0) * 1e-3]
+    ys = [y0, y0 + (y1 - y0) * 1e-3]
+    z = [[levels[0], levels[-1]], [levels[0], levels[-1]]]
+    proxy = ax.contourf(xs, ys, z, levels=levels, cmap=style.cmap, norm=style.norm,
+                        extend=style.extend, transform=ax.projection, zorder=1)
+    proxy.set_visible(False)
+    return proxy
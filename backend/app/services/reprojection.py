@@ -0,0 +1,399 @@
+"""Cached lat/lon -> map-projection regridding.
+
+Every ``contourf``/``contour``/``streamplot`` call with
+``transform=ccrs.PlateCarree()`` makes cartopy reproject the source grid (or
+the traced polygons) into the Lambert Conformal map projection again, and
+HRRR's 2D curvilinear coordinates go through this on every map of every
+hour. Instead, the field is regridded once onto a regular grid in the axes
+projection and drawn with ``transform=ax.projection``, which cartopy passes
+straight through.
+
+The regridding of one source grid into one map (projection, extent and
+figure size) is computed once: for every destination point, the flat
+indices of its four source neighbours and their bilinear weights. Applying
+it to a field is a single gather plus a weighted sum. Wind components are
+rotated from east/north into the projection's x/y with per-point factors
+computed the same way.
+
+Weights are kept in memory per process and persisted as ``.npz`` so
+recycled workers and restarts skip the KD-tree / projection work::
+
+    {storage_path}/../reprojection/{key}.npz
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+import hashlib
+import logging
+import math
+import os
+import threading
+
+import numpy as np
+import xarray as xr
+
+from app.config import settings
+from app.services.tile_renderer import grid_fingerprint, regular_grid
+
+logger = logging.getLogger(__name__)
+
+# Reprojectors kept in memory per process (grids x regions x resolutions in use)
+_REPROJECTORS_KEPT = 8
+
+
+def grid_coords(data: xr.DataArray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (values, lat, lon) of a field with longitudes wrapped to -180..180.
+
+    1D grids are returned with ascending axes; 2D (curvilinear) grids keep
+    their native layout.
+    """
+    data = data.squeeze()
+    lon_name = 'longitude' if 'longitude' in data.coords else 'lon'
+    lat_name = 'latitude' if 'latitude' in data.coords else 'lat'
+    if data.coords[lon_name].ndim == 1:
+        return regular_grid(data)
+    lon = np.asarray(data.coords[lon_name].values, dtype=float)
+    lon = np.where(lon > 180.0, lon - 360.0, lon)
+    return (np.asarray(data.values, dtype=np.float32),
+            np.asarray(data.coords[lat_name].values, dtype=float), lon)
+
+
+def axes_raster(ax, step_px: int = 1) -> Tuple[Tuple[float, float, float, float], Tuple[int, int]]:
+    """
+    Projection extent of a map axes and the grid size covering it with one
+    point every ``step_px`` figure pixels.
+    """
+    x0, x1, y0, y1 = ax.get_extent()
+    fig = ax.get_figure()
+    width_in, height_in = fig.get_size_inches()
+    box = ax.get_position()
+    box_w = box.width * width_in * fig.dpi
+    box_h = box.height * height_in * fig.dpi
+    # Equal aspect: the map fills the box in one direction
+    scale = min(box_w / (x1 - x0), box_h / (y1 - y0)) / step_px
+    cols = max(int(round((x1 - x0) * scale)), 2)
+    rows = max(int(round((y1 - y0) * scale)), 2)
+    return (x0, x1, y0, y1), (rows, cols)
+
+
+def _destination_lonlat(projection, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    import cartopy.crs as ccrs
+
+    grid_x, grid_y = np.meshgrid(x, y)
+    lonlat = ccrs.PlateCarree().transform_points(projection, grid_x.ravel(), grid_y.ravel())
+    return lonlat[:, 0], lonlat[:, 1]
+
+
+def _fractional_axis(points: np.ndarray, axis: np.ndarray) -> np.ndarray:
+    """Fractional position of each point along an ascending axis (NaN outside)."""
+    return np.interp(points, axis, np.arange(len(axis), dtype=float), left=np.nan, right=np.nan)
+
+
+def _fractional_curvilinear(
+    px_lat: np.ndarray,
+    px_lon: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fractional (row, col) of each point in a 2D lat/lon grid (NaN outside).
+
+    Nearest grid point by KD-tree, then one linear step using the grid's
+    local lat/lon derivatives, which is exact for grids that are locally
+    affine in lat/lon (any conformal model grid at these spacings).
+    """
+    from scipy.spatial import cKDTree
+
+    ny, nx = lat.shape
+    scale = math.cos(math.radians(float(np.nanmean(lat))))
+    tree = cKDTree(np.column_stack([lat.ravel(), lon.ravel() * scale]))
+    dist, idx = tree.query(np.column_stack([px_lat, px_lon * scale]))
+    ii, jj = np.unravel_index(idx, lat.shape)
+
+    i_lo, i_hi = np.maximum(ii - 1, 0), np.minimum(ii + 1, ny - 1)
+    j_lo, j_hi = np.maximum(jj - 1, 0), np.minimum(jj + 1, nx - 1)
+    di_span = np.maximum(i_hi - i_lo, 1)
+    dj_span = np.maximum(j_hi - j_lo, 1)
+    # d(lon, lat) / d(col, row)
+    a = (lon[ii, j_hi] - lon[ii, j_lo]) / dj_span
+    b = (lon[i_hi, jj] - lon[i_lo, jj]) / di_span
+    c = (lat[ii, j_hi] - lat[ii, j_lo]) / dj_span
+    d = (lat[i_hi, jj] - lat[i_lo, jj]) / di_span
+    rx = px_lon - lon[ii, jj]
+    ry = px_lat - lat[ii, jj]
+    det = a * d - b * c
+    det = np.where(np.abs(det) > 1e-12, det, np.nan)
+    dj = np.clip((d * rx - b * ry) / det, -1.0, 1.0)
+    di = np.clip((a * ry - c * rx) / det, -1.0, 1.0)
+
+    row = ii + di
+    col = jj + dj
+    step = float(np.nanmedian(np.abs(np.diff(lat, axis=0))))
+    outside = (dist > 2 * step) | (row < 0) | (row > ny - 1) | (col < 0) | (col > nx - 1)
+    row[outside] = np.nan
+    col[outside] = np.nan
+    return row, col
+
+
+class Reprojector:
+    """Regridding of one source grid onto a regular grid in a map projection."""
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        grid_shape: Tuple[int, int],
+        lower_left: np.ndarray,
+        wi: np.ndarray,
+        wj: np.ndarray,
+        rotation: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            x, y: Destination grid axes in projection coordinates
+            grid_shape: Source grid (ny, nx)
+            lower_left: Flat source index of each destination point's lower-left
+                        neighbour, -1 outside the source grid
+            wi, wj: Weights towards the upper row / right column neighbour
+            rotation: Optional (N, 4) east/north -> x/y vector factors
+        """
+        self.x = x
+        self.y = y
+        self.grid_shape = tuple(grid_shape)
+        self.lower_left = lower_left
+        self.wi = wi
+        self.wj = wj
+        self.rotation = rotation
+
+        nx = self.grid_shape[1]
+        self.valid = lower_left >= 0
+        base = np.where(self.valid, lower_left, 0).astype(np.int64)
+        self.index = base[:, None] + np.array([0, 1, nx, nx + 1], dtype=np.int64)
+        wi = wi.astype(np.float32)[:, None]
+        wj = wj.astype(np.float32)[:, None]
+        self.weights = np.hstack([(1 - wi) * (1 - wj), (1 - wi) * wj, wi * (1 - wj), wi * wj])
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.y), len(self.x))
+
+    @classmethod
+    def build(
+        cls,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        projection,
+        extent: Sequence[float],
+        shape: Tuple[int, int]
+    ) -> "Reprojector":
+        """
+        Compute the regridding of a lat/lon grid onto a projection grid.
+
+        Args:
+            lat, lon: Source grid coordinates (1D ascending or 2D)
+            projection: Cartopy CRS of the destination (the axes projection)
+            extent: (x0, x1, y0, y1) in projection coordinates
+            shape: Destination (rows, cols); points sit at cell centres
+        """
+        rows, cols = shape
+        x0, x1, y0, y1 = extent
+        x = x0 + (np.arange(cols) + 0.5) * (x1 - x0) / cols
+        y = y0 + (np.arange(rows) + 0.5) * (y1 - y0) / rows
+        dst_lon, dst_lat = _destination_lonlat(projection, x, y)
+
+        if lat.ndim == 1:
+            grid_shape = (len(lat), len(lon))
+            row = _fractional_axis(dst_lat, lat)
+            col = _fractional_axis(dst_lon, lon)
+        else:
+            grid_shape = lat.shape
+            row, col = _fractional_curvilinear(dst_lat, dst_lon, lat, lon)
+
+        ny, nx = grid_shape
+        valid = ~(np.isnan(row) | np.isnan(col))
+        row = np.where(valid, row, 0.0)
+        col = np.where(valid, col, 0.0)
+        i0 = np.clip(np.floor(row).astype(np.int64), 0, max(ny - 2, 0))
+        j0 = np.clip(np.floor(col).astype(np.int64), 0, max(nx - 2, 0))
+        lower_left = np.where(valid, i0 * nx + j0, -1).astype(np.int32)
+        return cls(x, y, grid_shape, lower_left,
+                   (row - i0).astype(np.float16), (col - j0).astype(np.float16))
+
+    def scalar(self, values: np.ndarray) -> np.ndarray:
+        """
+        Regrid a field; NaN outside the source grid and next to missing data.
+
+        Returns:
+            (rows, cols) float32 array, row 0 at the bottom
+        """
+        if values.shape != self.grid_shape:
+            raise ValueError(f"Field shape {values.shape} does not match reprojection grid {self.grid_shape}")
+        flat = np.ascontiguousarray(values, dtype=np.float32).ravel()
+        out = np.einsum('ij,ij->i', flat[self.index], self.weights)
+        out[~self.valid] = np.nan
+        return out.reshape(self.shape)
+
+    def nearest(self, values: np.ndarray, fill=-1) -> np.ndarray:
+        """
+        Regrid a categorical field: each point takes the value of its most
+        heavily weighted neighbour; ``fill`` outside the source grid.
+
+        Returns:
+            (rows, cols) array of the values' dtype, row 0 at the bottom
+        """
+        if values.shape != self.grid_shape:
+            raise ValueError(f"Field shape {values.shape} does not match reprojection grid {self.grid_shape}")
+        flat = np.ascontiguousarray(values).ravel()
+        heaviest = np.argmax(self.weights, axis=1)
+        out = flat[self.index[np.arange(len(heaviest)), heaviest]]
+        out[~self.valid] = fill
+        return out.reshape(self.shape)
+
+    def _ensure_rotation(self, projection) -> None:
+        if self.rotation is not None:
+            return
+        import cartopy.crs as ccrs
+
+        lon, lat = _destination_lonlat(projection, self.x, self.y)
+        ones, zeros = np.ones_like(lon), np.zeros_like(lon)
+        east_x, east_y = projection.transform_vectors(ccrs.PlateCarree(), lon, lat, ones, zeros)
+        north_x, north_y = projection.transform_vectors(ccrs.PlateCarree(), lon, lat, zeros, ones)
+        self.rotation = np.column_stack([east_x, east_y, north_x, north_y]).astype(np.float32)
+
+    def vector(self, u: np.ndarray, v: np.ndarray, projection) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Regrid eastward/northward components and rotate them into the
+        projection's x/y directions (what cartopy's vector transform does).
+
+        Returns:
+            (u_x, v_y) arrays of the destination shape
+        """
+        self._ensure_rotation(projection)
+        u_dst = self.scalar(u).ravel()
+        v_dst = self.scalar(v).ravel()
+        r = self.rotation
+        u_x = u_dst * r[:, 0] + v_dst * r[:, 2]
+        v_y = u_dst * r[:, 1] + v_dst * r[:, 3]
+        return u_x.reshape(self.shape), v_y.reshape(self.shape)
+
+    def save(self, path: Path) -> None:
+        """Write as .npz (atomic; the compact form, not the expanded gather index)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = dict(x=self.x, y=self.y, grid_shape=np.asarray(self.grid_shape),
+                      lower_left=self.lower_left, wi=self.wi, wj=self.wj)
+        if self.rotation is not None:
+            arrays['rotation'] = self.rotation
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Reprojector":
+        with np.load(path) as f:
+            return cls(f['x'], f['y'], tuple(int(n) for n in f['grid_shape']), f['lower_left'],
+                       f['wi'], f['wj'], f['rotation'] if 'rotation' in f.files else None)
+
+
+class ReprojectionCache:
+    """Reprojectors per (grid, projection, extent, size), in memory and as .npz."""
+
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Args:
+            root: Directory of the .npz files (default: {storage_path}/../reprojection)
+        """
+        self.root = Path(root or (Path(settings.storage_path).parent / "reprojection"))
+        self._memory: "OrderedDict[str, Reprojector]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}.npz"
+
+    def get(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        projection,
+        extent: Sequence[float],
+        shape: Tuple[int, int]
+    ) -> Reprojector:
+        """Reprojector for a grid and destination, built and persisted on first use."""
+        key = hashlib.sha1(repr((
+            grid_fingerprint(lat, lon),
+            projection.proj4_init,
+            tuple(round(float(v), 3) for v in extent),
+            tuple(int(n) for n in shape),
+        )).encode()).hexdigest()[:24]
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                return cached
+
+        reprojector = None
+        path = self.path(key)
+        if path.exists():
+            try:
+                reprojector = Reprojector.load(path)
+            except Exception as e:
+                logger.warning(f"Could not load reprojection weights {path.name}, rebuilding: {e}")
+        if reprojector is None:
+            reprojector = Reprojector.build(lat, lon, projection, extent, shape)
+            self._save(reprojector, path)
+
+        with self._lock:
+            self._memory[key] = reprojector
+            while len(self._memory) > _REPROJECTORS_KEPT:
+                self._memory.popitem(last=False)
+        return reprojector
+
+    def save_rotation(self, reprojector: Reprojector) -> None:
+        """Persist a reprojector again once it has vector rotation factors."""
+        with self._lock:
+            key = next((k for k, r in self._memory.items() if r is reprojector), None)
+        if key is not None:
+            self._save(reprojector, self.path(key))
+
+    @staticmethod
+    def _save(reprojector: Reprojector, path: Path) -> None:
+        try:
+            reprojector.save(path)
+        except OSError as e:
+            logger.debug(f"Could not save reprojection weights {path.name}: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+_cache: Optional[ReprojectionCache] = None
+
+
+def get_reprojection_cache() -> ReprojectionCache:
+    """Process-wide reprojection cache for the configured storage path."""
+    global _cache
+    root = Path(settings.storage_path).parent / "reprojection"
+    if _cache is None or _cache.root != root:
+        _cache = ReprojectionCache(root)
+    return _cache
+
+
+def reproject_for_axes(
+    ax,
+    lat: np.ndarray,
+    lon: np.ndarray,
+    step_px: int = 1,
+    shape: Optional[Tuple[int, int]] = None
+) -> Reprojector:
+    """
+    Reprojector from a lat/lon grid onto a map axes.
+
+    Args:
+        step_px: Figure pixels between destination points
+        shape: Fixed destination (rows, cols) instead (e.g. streamplot's coarse grid)
+    """
+    extent, raster_shape = axes_raster(ax, step_px)
+    shape = shape or raster_shape
+    return get_reprojection_cache().get(lat, lon, ax.projection, extent, shape)
@@ -0,0 +1,181 @@
+"""Pre-serialised, pre-compressed /api/maps listings per (model, run).
+
+Once a run is rendered its map list never changes, yet every request used to
+rebuild MapInfo objects and re-serialise them. The scheduler publishes each
+(model, run) listing as it progresses: the JSON body plus gzip (and brotli
+when the ``brotli`` package is installed) variants and a strong ETag. The
+API resolves the latest run with the manifest's indexed MAX(run_time) and
+then serves a listing with one indexed query (to confirm it is current)
+and a file send.
+
+Layout::
+
+    {storage_path}/../api_cache/maps/{model}_{run}.json[.gz|.br]
+    {storage_path}/../api_cache/maps/{model}_{run}.meta.json
+
+A listing is rebuilt on demand whenever the manifest shows maps the
+published body does not include, so maps written outside the scheduler
+(manual scripts) never leave a stale listing behind.
+"""
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+from app.config import settings
+from app.models.schemas import MapInfo, MapListResponse
+from app.services.map_manifest import MapManifest, get_map_manifest
+
+logger = logging.getLogger(__name__)
+
+# Content-Encoding -> file suffix, in server preference order
+_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _compress_brotli(body: bytes) -> Optional[bytes]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(body, quality=9)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class MapListingCache:
+    """Published map listings shared by the scheduler (writer) and API (reader)."""
+
+    def __init__(self, root: Optional[Path] = None, manifest: Optional[MapManifest] = None):
+        self.root = root or (Path(settings.storage_path).parent / "api_cache" / "maps")
+        self.manifest = manifest
+        # (model, run) -> (meta file mtime, meta) so repeat requests skip JSON parsing
+        self._meta: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+
+    def _manifest(self) -> MapManifest:
+        return self.manifest or get_map_manifest()
+
+    def _base(self, model: str, run_time: str) -> Path:
+        return self.root / f"{model.lower()}_{run_time}"
+
+    def _signature(self, model: str, run_time: str) -> Optional[list]:
+        """(count, latest mtime) of a run in the manifest, or None if it has no maps."""
+        signature = self._manifest().run_signature(model, run_time)
+        return list(signature) if signature is not None else None
+
+    def publish(self, model: str, run_time: str) -> Optional[dict]:
+        """
+        Serialise, compress and atomically write the listing for one run.
+
+        Returns:
+            Listing metadata (etag, encodings, signature), or None if the run
+            has no maps
+        """
+        model = model.upper()
+        signature = self._signature(model, run_time)
+        if signature is None:
+            return None
+
+        rows = self._manifest().query(model=model, run_time=run_time)
+        listing = MapListResponse(maps=[
+            MapInfo(
+                id=row['id'],
+                model=row['model'],
+                run_time=row['run_time'],
+                forecast_hour=row['forecast_hour'],
+                variable=row['variable'],
+                image_url=f"/images/{row['filename']}",  # Static files mounted at root /images, not under /api
+                created_at=MapManifest.created_at(row)
+            )
+            for row in rows
+        ])
+        body = listing.model_dump_json().encode()
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        base = self._base(model, run_time)
+        self.root.mkdir(parents=True, exist_ok=True)
+        _write_atomic(base.with_suffix(".json"), body)
+        encodings = []
+        for encoding, suffix, data in (
+            ('br', '.br', _compress_brotli(body)),
+            ('gzip', '.gz', gzip.compress(body, compresslevel=9, mtime=0)),
+        ):
+            if data is not None:
+                _write_atomic(base.with_suffix(f".json{suffix}"), data)
+                encodings.append(encoding)
+
+        meta = {'etag': digest, 'encodings': encodings, 'signature': signature, 'count': len(rows)}
+        _write_atomic(base.with_suffix(".meta.json"), json.dumps(meta).encode())
+
+        logger.debug(f"Published {model} {run_time} listing ({len(rows)} maps, {len(body)} bytes)")
+        return meta
+
+    def _load_meta(self, model: str, run_time: str) -> Optional[dict]:
+        meta_path = self._base(model, run_time).with_suffix(".meta.json")
+        try:
+            mtime = meta_path.stat().st_mtime
+        except OSError:
+            return None
+        cached = self._meta.get((model, run_time))
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            meta = json.loads(meta_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        self._meta[(model, run_time)] = (mtime, meta)
+        return meta
+
+    def get(self, model: str, run_time: str, accept_encoding: str = "") -> Optional[Tuple[Path, dict, Optional[str]]]:
+        """
+        Current listing for one run, republishing it if the manifest moved on.
+
+        Returns:
+            (body path, meta, content encoding or None), or None if the run
+            has no maps
+        """
+        model = model.upper()
+        meta = self._load_meta(model, run_time)
+        signature = self._signature(model, run_time)
+        if signature is None:
+            return None
+        if meta is None or meta.get('signature') != signature:
+            meta = self.publish(model, run_time)
+            if meta is None:
+                return None
+
+        base = self._base(model, run_time)
+        accepted = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+        for encoding, suffix in _ENCODINGS:
+            if encoding in accepted and encoding in meta['encodings']:
+                return base.with_suffix(f".json{suffix}"), meta, encoding
+        return base.with_suffix(".json"), meta, None
+
+    def remove_run(self, model: str, run_time: str) -> None:
+        """Delete a run's published listing (called by cleanup)."""
+        base = self._base(model, run_time)
+        for suffix in (".json", ".json.gz", ".json.br", ".meta.json"):
+            try:
+                base.with_suffix(suffix).unlink()
+            except OSError:
+                pass
+        self._meta.pop((model.upper(), run_time), None)
+
+
+_listing_cache: Optional[MapListingCache] = None
+
+
+def get_map_listing_cache() -> MapListingCache:
+    """Process-wide listing cache for the configured storage path."""
+    global _listing_cache
+    root = Path(settings.storage_path).parent / "api_cache" / "maps"
+    if _listing_cache is None or _listing_cache.root != root:
+        _listing_cache = MapListingCache(root)
+    return _listing_cache
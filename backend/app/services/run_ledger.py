@@ -0,0 +1,298 @@
+"""Persistent per-map run state for the scheduler.
+
+Every (model, run, forecast hour, variable) the scheduler renders gets a row
+with its status, attempt count, render duration, PNG size and last error.
+Completeness checks become indexed queries instead of globbing the images
+directory and guessing with an 80% threshold, and a restarted scheduler
+resumes exactly where it stopped: finished maps are skipped, and maps that
+have already failed ``MAX_ATTEMPTS`` times are not retried forever.
+
+Finished maps also record two fingerprints: one of their GRIB inputs and one
+of their rendering style (colour tables, map settings, render version). A
+rerun re-renders only the maps whose fingerprints moved, so a colour-table
+tweak touches one product and a re-published GRIB touches the hours that
+read it.
+
+Stored in SQLite (WAL mode) next to the images directory so worker processes
+can write concurrently.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from app.config import settings
+from app.services.map_manifest import get_map_manifest
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    model TEXT NOT NULL,
+    run_time TEXT NOT NULL,
+    forecast_hour INTEGER NOT NULL,
+    variable TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    duration_s REAL,
+    bytes INTEGER,
+    error TEXT,
+    input_fingerprint TEXT,
+    style_fingerprint TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (model, run_time, forecast_hour, variable)
+);
+"""
+
+# Columns added after the first release, migrated in place on connect
+_ADDED_COLUMNS = (("input_fingerprint", "TEXT"), ("style_fingerprint", "TEXT"))
+
+
+class RunLedger:
+    """Status of every map of every run, shared by scheduler and workers."""
+
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    # A map that failed this many times is settled: it no longer blocks completion
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: SQLite file (default: {storage_path}/../run_ledger.sqlite3)
+        """
+        self.db_path = Path(db_path or (Path(settings.storage_path).parent / "run_ledger.sqlite3"))
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(entries)")}
+        for column, column_type in _ADDED_COLUMNS:
+            if column not in columns:
+                try:
+                    conn.execute(f"ALTER TABLE entries ADD COLUMN {column} {column_type}")
+                except sqlite3.OperationalError:
+                    pass  # Another process migrated it first
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    # ------------------------------------------------------------------ writes
+
+    def mark_running(self, model: str, run_time: str, forecast_hour: int, variable: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO entries (model, run_time, forecast_hour, variable, status, attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (model, run_time, forecast_hour, variable) DO UPDATE SET "
+                "status = excluded.status, attempts = attempts + 1, error = NULL, updated_at = excluded.updated_at",
+                (model.upper(), run_time, forecast_hour, variable, self.RUNNING, time.time())
+            )
+
+    def mark_done(
+        self,
+        model: str,
+        run_time: str,
+        forecast_hour: int,
+        variable: str,
+        duration_s: Optional[float] = None,
+        nbytes: Optional[int] = None,
+        input_fingerprint: Optional[str] = None,
+        style_fingerprint: Optional[str] = None
+    ) -> None:
+        self._finish(model, run_time, forecast_hour, variable, self.DONE, duration_s, nbytes, None,
+                     input_fingerprint, style_fingerprint)
+
+    def mark_failed(
+        self,
+        model: str,
+        run_time: str,
+        forecast_hour: int,
+        variable: str,
+        error: str,
+        duration_s: Optional[float] = None
+    ) -> None:
+        self._finish(model, run_time, forecast_hour, variable, self.FAILED, duration_s, None, error[:500])
+
+    def _finish(self, model, run_time, forecast_hour, variable, status, duration_s, nbytes, error,
+                input_fingerprint=None, style_fingerprint=None) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO entries (model, run_time, forecast_hour, variable, status, attempts, "
+                "duration_s, bytes, error, input_fingerprint, style_fingerprint, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (model, run_time, forecast_hour, variable) DO UPDATE SET "
+                "status = excluded.status, duration_s = excluded.duration_s, bytes = excluded.bytes, "
+                "error = excluded.error, input_fingerprint = excluded.input_fingerprint, "
+                "style_fingerprint = excluded.style_fingerprint, updated_at = excluded.updated_at",
+                (model.upper(), run_time, forecast_hour, variable, status,
+                 duration_s, nbytes, error, input_fingerprint, style_fingerprint, time.time())
+            )
+
+    def ensure_run(self, model: str, run_time: str) -> None:
+        """
+        Backfill a run with no ledger rows from the map manifest.
+
+        Covers maps rendered before the ledger existed (or by manual scripts),
+        so they are not re-rendered after an upgrade.
+        """
+        conn = self._connect()
+        model = model.upper()
+        if conn.execute(
+            "SELECT 1 FROM entries WHERE model = ? AND run_time = ? LIMIT 1", (model, run_time)
+        ).fetchone():
+            return
+
+        rows = get_map_manifest().query(model=model, run_time=run_time)
+        if not rows:
+            return
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO entries (model, run_time, forecast_hour, variable, status, "
+                "attempts, bytes, updated_at) VALUES (?, ?, ?, ?, ?, 1, ?, ?)",
+                [(model, run_time, row['forecast_hour'], row['variable'], self.DONE,
+                  row['file_size'], row['mtime']) for row in rows]
+            )
+        logger.info(f"Backfilled run ledger for {model} {run_time} from manifest ({len(rows)} maps)")
+
+    def remove_run(self, model: str, run_time: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM entries WHERE model = ? AND run_time = ?", (model.upper(), run_time))
+
+    # ------------------------------------------------------------------- reads
+
+    def done_variables(self, model: str, run_time: str, forecast_hour: int) -> Set[str]:
+        """Variables of one hour whose map is already rendered."""
+        rows = self._connect().execute(
+            "SELECT variable FROM entries WHERE model = ? AND run_time = ? AND forecast_hour = ? AND status = ?",
+            (model.upper(), run_time, forecast_hour, self.DONE)
+        ).fetchall()
+        return {row['variable'] for row in rows}
+
+    def done_fingerprints(
+        self,
+        model: str,
+        run_time: str,
+        forecast_hour: int
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        Rendered variables of one hour with the fingerprints they were rendered from.
+
+        Returns:
+            {variable: (input_fingerprint, style_fingerprint)}; either is None
+            for maps rendered before fingerprints were recorded
+        """
+        rows = self._connect().execute(
+            "SELECT variable, input_fingerprint, style_fingerprint FROM entries "
+            "WHERE model = ? AND run_time = ? AND forecast_hour = ? AND status = ?",
+            (model.upper(), run_time, forecast_hour, self.DONE)
+        ).fetchall()
+        return {row['variable']: (row['input_fingerprint'], row['style_fingerprint']) for row in rows}
+
+    def run_entries(self, model: str, run_time: str) -> Dict[int, Dict[str, sqlite3.Row]]:
+        """All rows of a run as {forecast_hour: {variable: row}} (one indexed query)."""
+        entries: Dict[int, Dict[str, sqlite3.Row]] = {}
+        for row in self._connect().execute(
+            "SELECT * FROM entries WHERE model = ? AND run_time = ?", (model.upper(), run_time)
+        ):
+            entries.setdefault(row['forecast_hour'], {})[row['variable']] = row
+        return entries
+
+    @staticmethod
+    def style_current(row: sqlite3.Row, style_fingerprint: Optional[str]) -> bool:
+        """
+        Whether a rendered map's style matches ``style_fingerprint``.
+
+        Maps without a recorded style (rendered before fingerprinting, or
+        backfilled from the manifest) count as current so an upgrade does not
+        re-render every stored run.
+        """
+        stored = row['style_fingerprint']
+        return style_fingerprint is None or stored is None or stored == style_fingerprint
+
+    def _settled(self, row: Optional[sqlite3.Row]) -> bool:
+        if row is None:
+            return False
+        return row['status'] == self.DONE or (
+            row['status'] == self.FAILED and row['attempts'] >= self.MAX_ATTEMPTS
+        )
+
+    def hour_progress(
+        self,
+        model: str,
+        run_time: str,
+        expected: Dict[int, Iterable[str]],
+        styles: Optional[Dict[str, str]] = None
+    ) -> Dict[int, Dict[str, List[str]]]:
+        """
+        Per-hour breakdown of expected variables.
+
+        Args:
+            expected: {forecast_hour: variables that should exist}
+            styles: Optional {variable: current style fingerprint}; rendered
+                    maps with a different recorded style count as missing
+
+        Returns:
+            {forecast_hour: {'done': [...], 'gave_up': [...], 'missing': [...]}}
+        """
+        styles = styles or {}
+        entries = self.run_entries(model, run_time)
+        progress = {}
+        for fh, variables in expected.items():
+            hour = entries.get(fh, {})
+            state = {'done': [], 'gave_up': [], 'missing': []}
+            for var in variables:
+                row = hour.get(var)
+                if row is not None and row['status'] == self.DONE:
+                    if self.style_current(row, styles.get(var)):
+                        state['done'].append(var)
+                    else:
+                        state['missing'].append(var)
+                elif self._settled(row):
+                    state['gave_up'].append(var)
+                else:
+                    state['missing'].append(var)
+            progress[fh] = state
+        return progress
+
+    def complete_hours(
+        self,
+        model: str,
+        run_time: str,
+        expected: Dict[int, Iterable[str]],
+        styles: Optional[Dict[str, str]] = None
+    ) -> Set[int]:
+        """Hours where every expected variable is rendered or has exhausted its retries."""
+        return {
+            fh for fh, state in self.hour_progress(model, run_time, expected, styles).items()
+            if not state['missing']
+        }
+
+
+_ledger: Optional[RunLedger] = None
+
+
+def get_run_ledger() -> RunLedger:
+    """Process-wide ledger for the configured storage path."""
+    global _ledger
+    db_path = Path(settings.storage_path).parent / "run_ledger.sqlite3"
+    if _ledger is None or _ledger.db_path != db_path:
+        _ledger = RunLedger(db_path)
+    return _ledger
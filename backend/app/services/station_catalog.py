@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,9 +30,66 @@ class Station:
             self.lon = self.lon - 360
 
 
+@dataclass(frozen=True)
+class StationTable:
+    """
+    Columnar view of a station list.
+    
+    Row i of every array describes stations[i], so vectorised consumers
+    (bbox queries, grid sampling) work on the arrays while renderers keep
+    using the Station objects.
+    """
+    ids: np.ndarray       # object (str)
+    lats: np.ndarray      # float64
+    lons: np.ndarray      # float64, -180 to 180
+    weights: np.ndarray   # float64 display_weight
+    stations: Tuple[Station, ...]
+    
+    @classmethod
+    def from_stations(cls, stations: List[Station]) -> 'StationTable':
+        return cls(
+            ids=np.array([s.id for s in stations], dtype=object),
+            lats=np.array([s.lat for s in stations], dtype=np.float64),
+            lons=np.array([s.lon for s in stations], dtype=np.float64),
+            weights=np.array([s.display_weight for s in stations], dtype=np.float64),
+            stations=tuple(stations)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.stations)
+    
+    def take(self, indices: np.ndarray) -> 'StationTable':
+        """Subset rows by index array (order preserved)."""
+        return StationTable(
+            ids=self.ids[indices],
+            lats=self.lats[indices],
+            lons=self.lons[indices],
+            weights=self.weights[indices],
+            stations=tuple(self.stations[i] for i in indices)
+        )
+
+
 class StationCatalog:
     """Manages loading and filtering of station catalog."""
     
+    # Spatial index cell size (degrees)
+    INDEX_CELL_DEG = 1.0
+    
+    # Process-wide instance (see shared())
+    _shared: Optional['StationCatalog'] = None
+    
+    @classmethod
+    def shared(cls) -> 'StationCatalog':
+        """
+        Process-wide catalog for the default cache and overrides files.
+        
+        The catalog, its columnar table, spatial index and declutter results
+        are built once per process and reused by every map a worker renders.
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
     def __init__(self, cache_path: Optional[Path] = None, overrides_path: Optional[Path] = None):
         """
         Initialize catalog.
@@ -50,6 +109,13 @@ class StationCatalog:
         self.overrides_path = overrides_path
         self._stations: Optional[List[Station]] = None
         self._overrides: Optional[Dict] = None
+        
+        # Overrides-applied columnar table and its spatial index (built lazily)
+        self._table: Optional[StationTable] = None
+        self._cell_index: Optional[Dict[Tuple[int, int], np.ndarray]] = None
+        
+        # Declutter memo: (region_id, min_px_spacing) -> selected stations
+        self._declutter_cache: Dict[Tuple[str, float], List[Station]] = {}
     
     def load_from_cache(self, force_reload: bool = False) -> List[Station]:
         """
@@ -78,6 +144,9 @@ class StationCatalog:
         
         station_dicts = data.get('stations', [])
         self._stations = [Station(**s) for s in station_dicts]
+        self._table = None
+        self._cell_index = None
+        self._declutter_cache.clear()
         
         logger.info(f"Loaded {len(self._stations)} stations from cache")
         return self._stations
@@ -164,6 +233,67 @@ class StationCatalog:
         logger.debug(f"Filtered {len(stations)} -> {len(filtered)} stations for bbox {bbox}")
         return filtered
     
+    def get_table(self) -> StationTable:
+        """
+        Get the columnar table of all stations with overrides applied.
+        
+        Built once (with its spatial index) and reused for every query.
+        
+        Returns:
+            StationTable in catalog order
+        """
+        if self._table is None:
+            stations = self.apply_overrides(self.load_from_cache())
+            self._table = StationTable.from_stations(stations)
+            self._cell_index = self._build_cell_index(self._table)
+            logger.debug(f"Indexed {len(self._table)} stations in {len(self._cell_index)} cells")
+        return self._table
+    
+    def _build_cell_index(self, table: StationTable) -> Dict[Tuple[int, int], np.ndarray]:
+        """Bucket station rows into INDEX_CELL_DEG x INDEX_CELL_DEG lon/lat cells."""
+        cells_x = np.floor(table.lons / self.INDEX_CELL_DEG).astype(np.int64)
+        cells_y = np.floor(table.lats / self.INDEX_CELL_DEG).astype(np.int64)
+        
+        order = np.lexsort((cells_y, cells_x))
+        keys = np.stack([cells_x[order], cells_y[order]], axis=1)
+        # Start of each run of identical (x, y) cells in sorted order
+        starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+        ends = np.r_[starts[1:], len(order)]
+        
+        return {
+            (int(keys[a, 0]), int(keys[a, 1])): np.sort(order[a:b])
+            for a, b in zip(starts, ends)
+        }
+    
+    def query_bbox(self, bbox: Tuple[float, float, float, float]) -> np.ndarray:
+        """
+        Find table rows inside a bbox using the spatial index.
+        
+        Args:
+            bbox: (west_lon, south_lat, east_lon, north_lat)
+        
+        Returns:
+            Sorted row indices into get_table()
+        """
+        table = self.get_table()
+        west, south, east, north = bbox
+        
+        x0, x1 = int(np.floor(west / self.INDEX_CELL_DEG)), int(np.floor(east / self.INDEX_CELL_DEG))
+        y0, y1 = int(np.floor(south / self.INDEX_CELL_DEG)), int(np.floor(north / self.INDEX_CELL_DEG))
+        
+        candidates = [
+            rows for (cx, cy), rows in self._cell_index.items()
+            if x0 <= cx <= x1 and y0 <= cy <= y1
+        ]
+        if not candidates:
+            return np.empty(0, dtype=np.int64)
+        
+        rows = np.sort(np.concatenate(candidates))
+        lons = table.lons[rows]
+        lats = table.lats[rows]
+        inside = (lons >= west) & (lons <= east) & (lats >= south) & (lats <= north)
+        return rows[inside]
+    
     def get_stations_for_region(self, region_id: str) -> List[Station]:
         """
         Get stations for a named region with overrides applied.
@@ -176,7 +306,32 @@ class StationCatalog:
         """
         from app.config.regions import get_region_bbox
         
-        stations = self.load_from_cache()
-        stations = self.apply_overrides(stations)  # Apply excludes and weight bumps
-        bbox = get_region_bbox(region_id)
-        return self.filter_by_bbox(stations, bbox)
+        table = self.get_table()
+        rows = self.query_bbox(get_region_bbox(region_id))
+        return [table.stations[i] for i in rows]
+    
+    def get_decluttered_stations(self, region_id: str, min_px_spacing: float) -> List[Station]:
+        """
+        Get the decluttered overlay stations for a region, memoised.
+        
+        The result only depends on the catalog, the region and the spacing,
+        so it is computed once per (region_id, min_px_spacing) per process.
+        
+        Args:
+            region_id: Region identifier
+            min_px_spacing: Minimum pixel spacing between stations
+        
+        Returns:
+            Selected stations (always_include first, then decluttered)
+        """
+        key = (region_id, float(min_px_spacing))
+        if key not in self._declutter_cache:
+            from app.config.regions import get_region_bbox
+            from app.services.station_selector import StationSelector
+            
+            stations = self.get_stations_for_region(region_id)
+            selector = StationSelector(get_region_bbox(region_id), grid_size_px=min_px_spacing)
+            self._declutter_cache[key] = selector.select_decluttered_stations(
+                stations, self.get_always_include_ids()
+            )
+        return self._declutter_cache[key]
@@ -1,16 +1,24 @@
 """Factory for creating appropriate grid locator strategies."""
 
 import logging
+from typing import Dict, Tuple
 import xarray as xr
 from .grid_locators import (
     GridLocator,
     LatLon1DLocator,
     ProjectedXYLocator,
-    CurvilinearKDTreeLocator
+    CurvilinearKDTreeLocator,
+    grid_fingerprint
 )
 
 logger = logging.getLogger(__name__)
 
+# Process-wide locator registry
+# Key: (locator class name, grid fingerprint) -> GridLocator
+# Locators hold per-grid state (KD-trees, pyproj transformers), so reusing one
+# instance per grid lets every map, forecast hour and run on that grid share it.
+_LOCATOR_REGISTRY: Dict[Tuple[str, str], GridLocator] = {}
+
 
 class GridLocatorFactory:
     """Factory for creating appropriate grid locator based on dataset structure."""
@@ -18,32 +26,43 @@ class GridLocatorFactory:
     @staticmethod
     def from_dataset(ds: xr.Dataset) -> GridLocator:
         """
-        Create appropriate grid locator for dataset.
+        Get the grid locator for a dataset's grid.
+        
+        Returns the same instance for every dataset on the same grid (by
+        grid fingerprint) for the life of the process.
         
         Args:
             ds: xarray Dataset to analyze
         
         Returns:
-            GridLocator instance appropriate for this dataset
+            GridLocator instance appropriate for this dataset (shared per grid)
         
         Raises:
             ValueError: If no suitable locator found
         """
         # Try in priority order (fastest to slowest)
         if LatLon1DLocator.can_handle(ds):
+            locator_cls = LatLon1DLocator
             logger.debug("Using LatLon1DLocator (regular grid)")
-            return LatLon1DLocator()
         
         elif CurvilinearKDTreeLocator.can_handle(ds):
+            locator_cls = CurvilinearKDTreeLocator
             logger.debug("Using CurvilinearKDTreeLocator (curvilinear)")
-            return CurvilinearKDTreeLocator()
         
         elif ProjectedXYLocator.can_handle(ds):
+            locator_cls = ProjectedXYLocator
             logger.debug("Using ProjectedXYLocator (projected rectilinear)")
-            return ProjectedXYLocator()
         
         else:
             raise ValueError(
                 "No suitable grid locator for dataset. "
                 "Dataset must have either: 1D lat/lon, 1D x/y, or 2D lat/lon coords."
             )
+        
+        key = (locator_cls.__name__, grid_fingerprint(ds))
+        locator = _LOCATOR_REGISTRY.get(key)
+        if locator is None:
+            locator = locator_cls()
+            _LOCATOR_REGISTRY[key] = locator
+            logger.debug(f"Registered {locator_cls.__name__} for grid {key[1][:12]}")
+        return locator
@@ -0,0 +1,451 @@
+"""Web-Mercator (XYZ / slippy-map) tile output for map data layers.
+
+A static map is one 1920x1080 PNG, so the viewer downloads the whole image
+for every frame and zoom. In tile mode the data layer of a map is also
+written as a 256px tile pyramid over the map region, and the land/ocean
+basemap and the coastline/border overlay are rendered once into separate
+tile sets that every frame shares. Clients then fetch only the tiles in
+their viewport.
+
+Layout::
+
+    {storage_path}/../tiles/{model}/{run}/{variable}/{fh:03d}/{z}/{x}/{y}.png
+    {storage_path}/../tiles/_base/{region}/{basemap|borders}/{z}/{x}/{y}.png
+
+Data tiles are colourised in NumPy (no matplotlib figure per tile): each
+tile's pixel centres are projected back to lon/lat, the field is sampled
+bilinearly and the contour bands are looked up in a colour table built from
+the same colormap/levels/norm the static map uses, and written as 8-bit
+palette PNGs. Tiles that would be fully transparent are not written; a
+missing tile means "no data here".
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+import hashlib
+import logging
+import math
+import os
+import shutil
+import threading
+
+import numpy as np
+import xarray as xr
+from matplotlib import colors
+
+from app.config import settings
+from app.services.download_coordinator import get_download_coordinator
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+
+# Web-Mercator latitude limit
+_MAX_LAT = 85.0511287798
+
+# Curvilinear -> regular nearest-neighbour maps kept per process (see regular_grid)
+_REGRID_MAPS_KEPT = 4
+_regrid_maps: "OrderedDict[tuple, tuple]" = OrderedDict()
+_regrid_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TileStyle:
+    """Colour mapping of a filled-contour data layer."""
+    cmap: colors.Colormap
+    levels: Sequence[float]
+    norm: Optional[colors.Normalize] = None
+    extend: str = 'both'
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+def tile_bounds() -> Dict[str, float]:
+    """Lon/lat box the pyramid covers (the configured map region)."""
+    return settings.map_region_bounds or {"west": -125.0, "east": -110.0, "south": 42.0, "north": 49.0}
+
+
+def lonlat_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    """Tile column/row containing a point."""
+    n = 2 ** zoom
+    lat = max(min(lat, _MAX_LAT), -_MAX_LAT)
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    return min(int(x), n - 1), min(int(y), n - 1)
+
+
+def tile_range(bounds: Dict[str, float], zoom: int) -> Tuple[range, range]:
+    """Tile columns and rows covering a lon/lat box at one zoom level."""
+    x0, y0 = lonlat_to_tile(bounds["west"], bounds["north"], zoom)
+    x1, y1 = lonlat_to_tile(bounds["east"], bounds["south"], zoom)
+    return range(x0, x1 + 1), range(y0, y1 + 1)
+
+
+def iter_tiles(bounds: Dict[str, float], min_zoom: int, max_zoom: int) -> Iterator[Tuple[int, int, int]]:
+    """Every (z, x, y) of the pyramid."""
+    for z in range(min_zoom, max_zoom + 1):
+        xs, ys = tile_range(bounds, z)
+        for x in xs:
+            for y in ys:
+                yield z, x, y
+
+
+def tile_pixel_lonlat(zoom: int, x: int, y: int, size: int = TILE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lon/lat of a tile's pixel centres.
+
+    Web-Mercator is separable: longitude depends only on the column and
+    latitude only on the row.
+
+    Returns:
+        (lon per column, lat per row), each of length ``size``
+    """
+    n = 2 ** zoom
+    offsets = (np.arange(size) + 0.5) / size
+    lon = (x + offsets) / n * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * (y + offsets) / n))))
+    return lon, lat
+
+
+def contour_lut(style: TileStyle) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Colour table reproducing ``contourf(levels=..., cmap=..., norm=...)``.
+
+    Band i (levels[i-1] <= v < levels[i]) takes the colour contourf gives the
+    band's midpoint; values outside the levels take the under/over colours
+    when the style extends that way and are transparent otherwise.
+
+    Returns:
+        (levels as float array, RGBA uint8 table of len(levels) + 1 rows)
+    """
+    levels = np.asarray(style.levels, dtype=float)
+    norm = style.norm or colors.Normalize(vmin=levels[0], vmax=levels[-1])
+    mids = 0.5 * (levels[:-1] + levels[1:])
+    inner = style.cmap(norm(mids))
+    transparent = (0.0, 0.0, 0.0, 0.0)
+    under = style.cmap.get_under() if style.extend in ('min', 'both') else transparent
+    over = style.cmap.get_over() if style.extend in ('max', 'both') else transparent
+    table = np.vstack([under, inner, over])
+    return levels, np.round(np.clip(table, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+def grid_fingerprint(lat: np.ndarray, lon: np.ndarray) -> str:
+    """Content hash of a grid's coordinates."""
+    digest = hashlib.sha1()
+    digest.update(str((lat.shape, lon.shape)).encode())
+    digest.update(np.ascontiguousarray(lat, dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(lon, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def regular_grid(data: xr.DataArray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (values, ascending lat, ascending lon) of a field on a regular lat/lon grid.
+
+    Longitudes are wrapped to -180..180. Curvilinear grids (HRRR) are
+    resampled once, nearest-neighbour, onto a regular grid at their native
+    spacing (covering the map region plus a 1 degree margin) so tiles can
+    sample them separably; the nearest-neighbour map is cached per grid.
+    """
+    lon_name = 'longitude' if 'longitude' in data.coords else 'lon'
+    lat_name = 'latitude' if 'latitude' in data.coords else 'lat'
+    lon = np.asarray(data.coords[lon_name].values, dtype=float)
+    lat = np.asarray(data.coords[lat_name].values, dtype=float)
+    values = np.asarray(data.values, dtype=np.float32)
+
+    lon = np.where(lon > 180.0, lon - 360.0, lon)
+
+    if lon.ndim == 1:
+        if np.any(np.diff(lon) < 0) and not np.all(np.diff(lon) < 0):
+            order = np.argsort(lon)
+            lon, values = lon[order], values[:, order]
+        if lat[0] > lat[-1]:
+            lat, values = lat[::-1], values[::-1, :]
+        if lon[0] > lon[-1]:
+            lon, values = lon[::-1], values[:, ::-1]
+        return values, lat, lon
+
+    idx, far, reg_lat, reg_lon = _regrid_map(lat, lon)
+    resampled = values.ravel()[idx].reshape(far.shape)
+    resampled[far] = np.nan
+    return resampled, reg_lat.copy(), reg_lon.copy()
+
+
+def _regrid_map(lat: np.ndarray, lon: np.ndarray) -> tuple:
+    """
+    Nearest source point of every regular-grid point for a curvilinear grid:
+    (flat source index, mask of points with no source within 2 steps,
+    regular lat, regular lon). Built with a KD-tree once per grid and map
+    region, then shared by every field of every hour on that grid.
+    """
+    bounds = tile_bounds()
+    key = (grid_fingerprint(lat, lon), tuple(bounds[k] for k in ("west", "east", "south", "north")))
+    with _regrid_lock:
+        cached = _regrid_maps.get(key)
+        if cached is not None:
+            _regrid_maps.move_to_end(key)
+            return cached
+
+    from scipy.spatial import cKDTree
+
+    step = float(np.nanmedian(np.abs(np.diff(lat, axis=0))))
+    reg_lat = np.arange(max(np.nanmin(lat), bounds["south"] - 1.0), min(np.nanmax(lat), bounds["north"] + 1.0), step)
+    reg_lon = np.arange(max(np.nanmin(lon), bounds["west"] - 1.0), min(np.nanmax(lon), bounds["east"] + 1.0), step)
+    scale = math.cos(math.radians(float(np.nanmean(lat))))
+    tree = cKDTree(np.column_stack([lat.ravel(), lon.ravel() * scale]))
+    grid_lon, grid_lat = np.meshgrid(reg_lon, reg_lat)
+    dist, idx = tree.query(np.column_stack([grid_lat.ravel(), grid_lon.ravel() * scale]))
+    far = (dist > 2 * step).reshape(grid_lat.shape)
+    regrid = (idx, far, reg_lat, reg_lon)
+    for array in regrid:
+        array.setflags(write=False)
+
+    with _regrid_lock:
+        _regrid_maps[key] = regrid
+        while len(_regrid_maps) > _REGRID_MAPS_KEPT:
+            _regrid_maps.popitem(last=False)
+    return regrid
+
+
+def _fractional_index(points: np.ndarray, axis: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lower neighbour, weight and validity of each point along an ascending axis."""
+    pos = np.interp(points, axis, np.arange(len(axis)), left=np.nan, right=np.nan)
+    valid = ~np.isnan(pos)
+    pos = np.where(valid, pos, 0.0)
+    lower = np.clip(np.floor(pos).astype(int), 0, max(len(axis) - 2, 0))
+    return lower, pos - lower, valid
+
+
+class TileRenderer:
+    """Writes data-layer tile pyramids for one field at a time."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        min_zoom: Optional[int] = None,
+        max_zoom: Optional[int] = None
+    ):
+        """
+        Args:
+            root: Tile root directory (default: {storage_path}/../tiles)
+            min_zoom: Lowest zoom rendered (default: settings.tile_min_zoom)
+            max_zoom: Highest zoom rendered (default: settings.tile_max_zoom)
+        """
+        self.root = Path(root or (Path(settings.storage_path).parent / "tiles"))
+        self.min_zoom = settings.tile_min_zoom if min_zoom is None else min_zoom
+        self.max_zoom = settings.tile_max_zoom if max_zoom is None else max_zoom
+
+    def data_dir(self, model: str, run_time: str, variable: str, forecast_hour: int) -> Path:
+        return self.root / model.lower() / run_time / variable / f"{forecast_hour:03d}"
+
+    def base_dir(self, region: str, layer: str) -> Path:
+        return self.root / "_base" / region / layer
+
+    def render_data_tiles(
+        self,
+        data: xr.DataArray,
+        style: TileStyle,
+        model: str,
+        run_time: str,
+        variable: str,
+        forecast_hour: int
+    ) -> int:
+        """
+        Write the tile pyramid of one map's data layer.
+
+        The pyramid is built in a temporary directory and swapped into place,
+        so clients never see a half-written frame.
+
+        Returns:
+            Number of tiles written (fully transparent tiles are skipped)
+        """
+        from PIL import Image
+
+        values, lat, lon = regular_grid(data.squeeze())
+        levels, table = contour_lut(style)
+        # Row 0 is "no data"; contour bands fit an 8-bit palette, which keeps
+        # tiles several times smaller than RGBA
+        table = np.vstack([np.zeros((1, 4), dtype=np.uint8), table])
+        opaque = table[:, 3] > 0
+        paletted = len(table) <= 256
+        palette = table[:, :3].ravel().tolist()
+        alpha = bytes(table[:, 3].tolist())
+
+        target = self.data_dir(model, run_time, variable, forecast_hour)
+        staging = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+
+        written = 0
+        for z, x, y in iter_tiles(tile_bounds(), self.min_zoom, self.max_zoom):
+            tile_lon, tile_lat = tile_pixel_lonlat(z, x, y)
+            j0, wj, vj = _fractional_index(tile_lon, lon)
+            i0, wi, vi = _fractional_index(tile_lat, lat)
+            if not vi.any() or not vj.any():
+                continue
+
+            i1 = np.minimum(i0 + 1, len(lat) - 1)
+            j1 = np.minimum(j0 + 1, len(lon) - 1)
+            wi, wj = wi[:, None], wj[None, :]
+            sampled = (
+                (1 - wi) * ((1 - wj) * values[np.ix_(i0, j0)] + wj * values[np.ix_(i0, j1)])
+                + wi * ((1 - wj) * values[np.ix_(i1, j0)] + wj * values[np.ix_(i1, j1)])
+            )
+            valid = vi[:, None] & vj[None, :] & ~np.isnan(sampled)
+
+            # Palette index: 0 = no data, 1 + band otherwise
+            index = np.searchsorted(levels, np.where(valid, sampled, levels[0]), side='right') + 1
+            index[~valid] = 0
+            if not opaque[index].any():
+                continue
+
+            path = staging / str(z) / str(x) / f"{y}.png"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if paletted:
+                image = Image.fromarray(index.astype(np.uint8), 'P')
+                image.putpalette(palette)
+                image.save(path, format='PNG', transparency=alpha, optimize=False)
+            else:
+                Image.fromarray(table[index], 'RGBA').save(path, format='PNG')
+            written += 1
+
+        # Move the old frame aside rather than deleting it first: the frame is
+        # only missing between two renames, not for a whole tree deletion
+        retired = target.with_name(f".{target.name}.{os.getpid()}.old")
+        shutil.rmtree(retired, ignore_errors=True)
+        if target.exists():
+            os.replace(target, retired)
+        if written:
+            os.replace(staging, target)
+        else:
+            shutil.rmtree(staging, ignore_errors=True)
+        shutil.rmtree(retired, ignore_errors=True)
+        return written
+
+    def remove_run(self, model: str, run_time: str) -> None:
+        """Delete every data tile of one run (called by cleanup)."""
+        shutil.rmtree(self.root / model.lower() / run_time, ignore_errors=True)
+
+    def render_base_tiles(
+        self,
+        region: str,
+        layer: str,
+        draw,
+        transparent: bool
+    ) -> int:
+        """
+        Render a shared basemap layer once per region and zoom range.
+
+        Each zoom level is drawn in blocks of up to 8x8 tiles on a single
+        Web-Mercator matplotlib figure and cut into tiles. A ``.complete``
+        marker records the zoom range, so later calls are free; the first
+        worker to get there renders while the others wait on a lock.
+
+        Args:
+            layer: Layer name ('basemap' or 'borders')
+            draw: Callable(ax) adding the layer's features to a GeoAxes
+            transparent: Whether the figure background is transparent
+
+        Returns:
+            Number of tiles written (0 if the layer was already cached)
+        """
+        base = self.base_dir(region, layer)
+        marker = base / ".complete"
+        zoom_key = f"{self.min_zoom}-{self.max_zoom}"
+        if marker.exists() and marker.read_text().strip() == zoom_key:
+            return 0
+
+        # One worker renders the pyramid; the others wait and find the marker
+        with get_download_coordinator().lock(f"base_tiles_{region}_{layer}"):
+            if marker.exists() and marker.read_text().strip() == zoom_key:
+                return 0
+            written = self._draw_base_tiles(base, draw, transparent)
+            _atomic_write_text(marker, zoom_key)
+        logger.info(f"Rendered {written} {layer} tiles for region '{region}' (z{zoom_key})")
+        return written
+
+    def _draw_base_tiles(self, base: Path, draw, transparent: bool) -> int:
+        """Draw a base layer's pyramid into ``base``, replacing each tile atomically."""
+        import cartopy.crs as ccrs
+        import matplotlib.pyplot as plt
+        from PIL import Image
+
+        block = 8
+        extent = 20037508.342789244  # Half the Web-Mercator world width in metres
+        written = 0
+        for z in range(self.min_zoom, self.max_zoom + 1):
+            xs, ys = tile_range(tile_bounds(), z)
+            tile_m = 2 * extent / 2 ** z
+            for bx in range(xs.start, xs.stop, block):
+                for by in range(ys.start, ys.stop, block):
+                    nx, ny = min(block, xs.stop - bx), min(block, ys.stop - by)
+                    fig = plt.figure(figsize=(nx * TILE_SIZE / 100, ny * TILE_SIZE / 100), dpi=100)
+                    try:
+                        ax = fig.add_axes([0, 0, 1, 1], projection=ccrs.Mercator.GOOGLE)
+                        ax.set_extent([
+                            -extent + bx * tile_m, -extent + (bx + nx) * tile_m,
+                            extent - (by + ny) * tile_m, extent - by * tile_m
+                        ], crs=ccrs.Mercator.GOOGLE)
+                        ax.axis('off')
+                        if transparent:
+                            fig.patch.set_alpha(0.0)
+                            ax.patch.set_alpha(0.0)
+                        draw(ax)
+                        fig.canvas.draw()
+                        image = np.asarray(fig.canvas.buffer_rgba())
+                    finally:
+                        plt.close(fig)
+
+                    for dx in range(nx):
+                        for dy in range(ny):
+                            tile = image[dy * TILE_SIZE:(dy + 1) * TILE_SIZE, dx * TILE_SIZE:(dx + 1) * TILE_SIZE]
+                            if transparent and not tile[..., 3].any():
+                                continue
+                            path = base / str(z) / str(bx + dx) / f"{by + dy}.png"
+                            path.parent.mkdir(parents=True, exist_ok=True)
+                            # Tiles are served from this directory: never expose a partial PNG
+                            tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.png")
+                            Image.fromarray(np.ascontiguousarray(tile), 'RGBA').save(tmp_path, format='PNG')
+                            os.replace(tmp_path, path)
+                            written += 1
+        return written
+
+    def tilejson(self, model: str, run_time: str, variable: str, forecast_hour: int,
+                 base_url: str = "/tiles") -> Optional[dict]:
+        """
+        TileJSON description of one frame plus its shared base layers.
+
+        Returns:
+            Dict, or None if the frame has no tiles
+        """
+        if not self.data_dir(model, run_time, variable, forecast_hour).exists():
+            return None
+        bounds = tile_bounds()
+        region = settings.map_region
+        return {
+            'tilejson': '2.2.0',
+            'scheme': 'xyz',
+            'minzoom': self.min_zoom,
+            'maxzoom': self.max_zoom,
+            'bounds': [bounds["west"], bounds["south"], bounds["east"], bounds["north"]],
+            'tiles': [f"{base_url}/{model.lower()}/{run_time}/{variable}/{forecast_hour:03d}/{{z}}/{{x}}/{{y}}.png"],
+            'basemap': f"{base_url}/_base/{region}/basemap/{{z}}/{{x}}/{{y}}.png",
+            'overlay': f"{base_url}/_base/{region}/borders/{{z}}/{{x}}/{{y}}.png",
+        }
+
+
+_tile_renderer: Optional[TileRenderer] = None
+
+
+def get_tile_renderer() -> TileRenderer:
+    """Process-wide tile renderer for the configured storage path."""
+    global _tile_renderer
+    root = Path(settings.storage_path).parent / "tiles"
+    if _tile_renderer is None or _tile_renderer.root != root:
+        _tile_renderer = TileRenderer(root)
+    return _tile_renderer
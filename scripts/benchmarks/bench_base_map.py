@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark base map setup: direct Natural Earth features vs cached geometry.
+
+Renders and saves an empty base map N times with each path and reports the
+per-map time. The first cached iteration includes building the cache.
+
+Usage:
+    python scripts/benchmarks/bench_base_map.py --iterations 5 --region pnw
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from app.config import settings
+from app.services.map_generator import MapGenerator
+
+
+def time_base_maps(map_generator: MapGenerator, region: str, iterations: int,
+                   use_cache: bool, out_dir: Path) -> list:
+    """Return wall-clock seconds for each setup+savefig iteration."""
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fig, ax = map_generator._setup_base_map(region=region, use_cache=use_cache)
+        fig.savefig(out_dir / f"base_{'cached' if use_cache else 'direct'}_{i}.png",
+                    dpi=settings.map_dpi, bbox_inches='tight')
+        plt.close(fig)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--region", default="pnw")
+    args = parser.parse_args()
+
+    map_generator = MapGenerator()
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        direct = time_base_maps(map_generator, args.region, args.iterations, False, out_dir)
+        cached = time_base_maps(map_generator, args.region, args.iterations, True, out_dir)
+
+    print(f"Base map setup + savefig, region={args.region}, {args.iterations} iterations")
+    print(f"  direct features : mean {statistics.mean(direct):.3f}s  min {min(direct):.3f}s")
+    print(f"  cached geometry : first {cached[0]:.3f}s (builds cache)")
+    if len(cached) > 1:
+        warm = cached[1:]
+        print(f"                    warm mean {statistics.mean(warm):.3f}s  min {min(warm):.3f}s")
+        print(f"  speedup (warm)  : {statistics.mean(direct) / statistics.mean(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark GRIB downloads: sequential bare requests.get vs the pooled HTTPDownloader.
+
+Runs a local HTTP/1.1 stand-in for NOMADS that serves synthetic GRIB-sized
+payloads. The server adds a fixed delay per new connection (TCP/TLS setup)
+and per request (filter CGI latency) so both keep-alive and concurrency show
+up in the timings.
+
+The baseline reproduces the previous _download_from_nomads: one
+requests.get per file, no session, 8 KB chunks, files fetched one at a time.
+
+Usage:
+    python scripts/benchmarks/bench_http_downloader.py --files 16 --size-mb 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import requests
+
+from app.services.http_downloader import HTTPDownloader
+
+
+def make_handler(payload: bytes, connect_delay: float, request_delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            time.sleep(connect_delay)
+            super().setup()
+
+        def do_GET(self):
+            time.sleep(request_delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def legacy_download(url: str, path: str) -> None:
+    response = requests.get(url, timeout=60, stream=True)
+    response.raise_for_status()
+    with open(path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=8192):
+            f.write(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--files", type=int, default=16, help="Number of files to download")
+    parser.add_argument("--size-mb", type=float, default=8.0, help="Size of each file in MB")
+    parser.add_argument("--connect-delay", type=float, default=0.05, help="Seconds per new connection")
+    parser.add_argument("--request-delay", type=float, default=0.25, help="Seconds per request")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent downloads per host")
+    args = parser.parse_args()
+
+    payload = os.urandom(int(args.size_mb * 1024 * 1024))
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(payload, args.connect_delay, args.request_delay)
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base_url}/gfs.t00z.pgrb2.0p25.f{i * 3:03d}" for i in range(args.files)]
+
+    print(f"{args.files} files x {args.size_mb:.1f} MB, "
+          f"{args.connect_delay * 1000:.0f} ms connect + {args.request_delay * 1000:.0f} ms request latency")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for i, url in enumerate(urls):
+            legacy_download(url, os.path.join(tmp, f"legacy_{i}.grib2"))
+        legacy_s = time.perf_counter() - t0
+
+        downloader = HTTPDownloader(max_connections_per_host=args.per_host)
+        jobs = [(url, os.path.join(tmp, f"pooled_{i}.grib2")) for i, url in enumerate(urls)]
+        t0 = time.perf_counter()
+        results = downloader.download_many(jobs)
+        pooled_s = time.perf_counter() - t0
+
+        failures = [r for r in results.values() if isinstance(r, Exception)]
+        sizes_ok = all(os.path.getsize(dest) == len(payload) for _, dest in jobs)
+        leftovers = [n for n in os.listdir(tmp) if n.endswith(".part")]
+
+    server.shutdown()
+
+    total_mb = args.files * args.size_mb
+    print(f"  legacy sequential : {legacy_s:6.2f} s ({total_mb / legacy_s:7.1f} MB/s)")
+    print(f"  pooled concurrent : {pooled_s:6.2f} s ({total_mb / pooled_s:7.1f} MB/s)  "
+          f"per-host={args.per_host}")
+    print(f"  speedup           : {legacy_s / pooled_s:6.2f}x")
+    print(f"  failures={len(failures)} sizes_ok={sizes_ok} partial_files_left={len(leftovers)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark filled-contour maps: matplotlib contourf vs the NumPy raster renderer.
+
+Renders the temp, precip, snowfall and radar maps through
+MapGenerator.generate_map with settings.raster_renderer off and on, on two
+synthetic grids:
+  - GFS-like 0.25 deg regular lat/lon grid (1D coords, 0-360 longitudes)
+  - HRRR-like 3 km Lambert Conformal grid with 2D lat/lon coords (curvilinear)
+
+Fields are smooth synthetic weather (fronts, precipitation cells, a rain/snow
+line) so contourf traces realistic polygon counts. Raster timings are
+reported cold (first map on the grid builds the index map) and warm. The
+outputs are compared pixel by pixel: "differing" counts pixels whose colour
+differs by more than --tolerance in any channel (band edges antialiased by
+contourf account for most of them).
+
+Usage:
+    python scripts/benchmarks/bench_raster_renderer.py
+    python scripts/benchmarks/bench_raster_renderer.py --grids hrrr --variables temp radar --iterations 3
+    python scripts/benchmarks/bench_raster_renderer.py --variables mslp_precip
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import numpy as np
+import xarray as xr
+from PIL import Image
+
+from app.config import settings
+from app.services.map_generator import MapGenerator
+
+
+def synthetic_fields(lat: np.ndarray, lon: np.ndarray, dims, coords) -> xr.Dataset:
+    """Smooth temperature, precipitation, snowfall, reflectivity, wind and MSLP on a grid."""
+    rng = np.random.default_rng(0)
+    lon180 = np.where(lon > 180, lon - 360, lon)
+    wave = np.sin(np.radians(lon180) * 9) * np.cos(np.radians(lat) * 7)
+    front = np.tanh((lat - 46 - 1.5 * np.sin(np.radians(lon180) * 20)) / 1.5)
+    tmp2m = 285 - 12 * front + 6 * wave + rng.normal(0, 0.05, lat.shape)
+
+    cells = np.zeros(lat.shape)
+    for _ in range(25):
+        clat, clon = rng.uniform(41, 50), rng.uniform(-126, -109)
+        r2 = ((lat - clat) / 0.8) ** 2 + ((lon180 - clon) / 1.1) ** 2
+        cells += rng.uniform(5, 40) * np.exp(-r2)
+    tp_total = np.clip(cells + 3 * wave, 0, None)
+    snow_line = tmp2m < 276
+    refc = np.where(cells > 2, 10 + 12 * np.log1p(cells), -10.0)
+    # A high offshore and a low over the interior (Pa)
+    prmsl = 100 * (1013 + 12 * np.exp(-((lat - 47) / 3) ** 2 - ((lon180 + 130) / 4) ** 2)
+                   - 15 * np.exp(-((lat - 44) / 2.5) ** 2 - ((lon180 + 113) / 3) ** 2) + 2 * wave)
+
+    def field(values):
+        return (dims, values.astype(np.float32))
+
+    return xr.Dataset(
+        {
+            'tmp2m': field(tmp2m),
+            'tp_total': field(tp_total),
+            'p6_rate_mmhr': field(tp_total / 6),
+            'tp_snow_total': field(np.where(snow_line, tp_total / 25.4 * 10, 0.0)),
+            'refc': field(refc),
+            'crain': field((~snow_line).astype(float)),
+            'csnow': field(snow_line.astype(float)),
+            'cicep': field(np.zeros(lat.shape)),
+            'cfrzr': field(((tmp2m > 275) & (tmp2m < 276.5)).astype(float)),
+            'tmp_850': field(tmp2m - 12),
+            'ugrd10m': field(8 * front + 4 * np.cos(np.radians(lon180) * 12)),
+            'vgrd10m': field(6 * wave),
+            'prmsl': field(prmsl),
+        },
+        coords=coords,
+    )
+
+
+def make_gfs() -> xr.Dataset:
+    lats = np.arange(90, -90.25, -0.25)
+    lons = np.arange(0, 360, 0.25)
+    lon2d, lat2d = np.meshgrid(lons, lats)
+    return synthetic_fields(lat2d, lon2d, ('latitude', 'longitude'), {'latitude': lats, 'longitude': lons})
+
+
+def make_hrrr() -> xr.Dataset:
+    import pyproj
+    ny, nx = 1059, 1799
+    lcc = pyproj.CRS.from_proj4("+proj=lcc +lat_1=38.5 +lat_2=38.5 +lat_0=38.5 "
+                                "+lon_0=-97.5 +R=6371229 +units=m +no_defs")
+    to_ll = pyproj.Transformer.from_crs(lcc, "EPSG:4326", always_xy=True)
+    x = -2697520.0 + 3000.0 * np.arange(nx)
+    y = -1587306.0 + 3000.0 * np.arange(ny)
+    xx, yy = np.meshgrid(x, y)
+    lon2d, lat2d = to_ll.transform(xx, yy)
+    lon2d = lon2d % 360
+    return synthetic_fields(lat2d, lon2d, ('y', 'x'),
+                            {'latitude': (('y', 'x'), lat2d), 'longitude': (('y', 'x'), lon2d)})
+
+
+def render(map_generator: MapGenerator, ds: xr.Dataset, model: str, variable: str,
+           raster: bool, iterations: int, out_dir: Path):
+    """Return (seconds per map, path of the last PNG)."""
+    settings.raster_renderer = raster
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        path = map_generator.generate_map(ds, variable, model=model, forecast_hour=12)
+        timings.append(time.perf_counter() - start)
+    target = out_dir / f"{model}_{variable}_{'raster' if raster else 'contourf'}.png"
+    path.replace(target)
+    return timings, target
+
+
+def compare(a: Path, b: Path, tolerance: int) -> str:
+    img_a = np.asarray(Image.open(a).convert('RGB'), dtype=np.int16)
+    img_b = np.asarray(Image.open(b).convert('RGB'), dtype=np.int16)
+    if img_a.shape != img_b.shape:
+        return f"size differs {img_a.shape[1]}x{img_a.shape[0]} vs {img_b.shape[1]}x{img_b.shape[0]}"
+    differing = (np.abs(img_a - img_b).max(axis=-1) > tolerance).mean()
+    return f"{differing:.2%} of pixels differ"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--grids", nargs="+", default=["gfs", "hrrr"], choices=["gfs", "hrrr"])
+    parser.add_argument("--variables", nargs="+", default=["temp", "precip", "snowfall", "radar"])
+    parser.add_argument("--iterations", type=int, default=2, help="Maps per variable and engine")
+    parser.add_argument("--tolerance", type=int, default=48, help="Per-channel colour difference counted as differing")
+    parser.add_argument("--keep", help="Copy the rendered PNGs into this directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(args.keep) if args.keep else Path(tmp)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        settings.storage_path = str(Path(tmp) / "images")
+        settings.station_overlays = False
+        map_generator = MapGenerator()
+        map_generator.warm_base_map_cache()
+
+        for grid in args.grids:
+            ds = make_gfs() if grid == "gfs" else make_hrrr()
+            model = grid.upper()
+            print(f"{model}: grid {dict(ds.sizes)}, {args.iterations} maps per variable and engine")
+            for variable in args.variables:
+                mpl, mpl_png = render(map_generator, ds, model, variable, False, args.iterations, out_dir)
+                raster, raster_png = render(map_generator, ds, model, variable, True, args.iterations + 1, out_dir)
+                warm = raster[1:]
+                print(f"  {variable:9s}: contourf {statistics.mean(mpl):6.2f}s   raster cold {raster[0]:6.2f}s "
+                      f"warm {statistics.mean(warm):6.2f}s   x{statistics.mean(mpl) / statistics.mean(warm):4.1f}   "
+                      f"{compare(mpl_png, raster_png, args.tolerance)}")
+            # The next grid starts cold
+            del ds
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark contour maps: cartopy PlateCarree transforms vs cached reprojection.
+
+Renders maps through MapGenerator.generate_map with settings.reproject_cache
+off (contourf/contour/streamplot with transform=PlateCarree, cartopy
+reprojects every call) and on (fields regridded into the map projection with
+cached weights, drawn with the axes projection), on the synthetic GFS and
+HRRR grids of bench_raster_renderer. Reprojected timings are reported cold
+(weights built and written as .npz), warm from disk (a fresh process would
+start here) and warm in memory.
+
+Usage:
+    python scripts/benchmarks/bench_reprojection.py
+    python scripts/benchmarks/bench_reprojection.py --grids hrrr --variables wind_speed 850mb
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_raster_renderer import compare, make_gfs, make_hrrr
+
+from app.config import settings
+from app.services.map_generator import MapGenerator
+from app.services.reprojection import get_reprojection_cache
+
+
+def render(map_generator: MapGenerator, ds, model: str, variable: str, out_dir: Path, tag: str):
+    """Return (seconds, path of the PNG)."""
+    start = time.perf_counter()
+    path = map_generator.generate_map(ds, variable, model=model, forecast_hour=12)
+    elapsed = time.perf_counter() - start
+    target = out_dir / f"{model}_{variable}_{tag}.png"
+    path.replace(target)
+    return elapsed, target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--grids", nargs="+", default=["gfs", "hrrr"], choices=["gfs", "hrrr"])
+    parser.add_argument("--variables", nargs="+", default=["temp", "wind_speed", "850mb", "radar"])
+    parser.add_argument("--iterations", type=int, default=2, help="Warm in-memory maps per variable")
+    parser.add_argument("--tolerance", type=int, default=48, help="Per-channel colour difference counted as differing")
+    parser.add_argument("--keep", help="Copy the rendered PNGs into this directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(args.keep) if args.keep else Path(tmp)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        settings.storage_path = str(Path(tmp) / "images")
+        settings.station_overlays = False
+        settings.raster_renderer = False
+        map_generator = MapGenerator()
+        cache = get_reprojection_cache()
+
+        for grid in args.grids:
+            ds = make_gfs() if grid == "gfs" else make_hrrr()
+            model = grid.upper()
+            print(f"{model}: grid {dict(ds.sizes)}")
+            for variable in args.variables:
+                settings.reproject_cache = False
+                direct, direct_png = render(map_generator, ds, model, variable, out_dir, "direct")
+
+                settings.reproject_cache = True
+                cold, _ = render(map_generator, ds, model, variable, out_dir, "cold")
+                cache.clear()
+                disk, _ = render(map_generator, ds, model, variable, out_dir, "disk")
+                warm = [render(map_generator, ds, model, variable, out_dir, "cached")
+                        for _ in range(args.iterations)]
+                print(f"  {variable:10s}: PlateCarree {direct:6.2f}s   cached cold {cold:6.2f}s "
+                      f"disk {disk:6.2f}s warm {statistics.mean(t for t, _ in warm):6.2f}s   "
+                      f"{compare(direct_png, warm[-1][1], args.tolerance)}")
+            del ds
+        npz = list(cache.root.glob("*.npz"))
+        print(f"{len(npz)} weight files, {sum(p.stat().st_size for p in npz) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
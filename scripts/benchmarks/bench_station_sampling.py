@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark station sampling: per-station lookups vs batched GridLocator sampling.
+
+Uses the full station catalog (~7k stations) against two synthetic grids:
+  - GFS-like 0.25 deg regular lat/lon grid (1D coords, 0-360 longitudes)
+  - HRRR-like 3 km Lambert Conformal grid with 2D lat/lon coords (curvilinear)
+
+The per-station baseline reproduces the previous implementation (one .sel()
+or KDTree query + isel per station). Batched timings are reported cold
+(index computed) and warm (index served from the per-grid cache).
+
+Usage:
+    python scripts/benchmarks/bench_station_sampling.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import numpy as np
+import xarray as xr
+
+from app.services.station_catalog import StationCatalog
+from app.services.grid_locators import LatLon1DLocator, CurvilinearKDTreeLocator
+
+
+def make_gfs_grid() -> xr.Dataset:
+    lats = np.arange(90, -90.25, -0.25)
+    lons = np.arange(0, 360, 0.25)
+    data = np.random.default_rng(0).normal(280, 10, (lats.size, lons.size)).astype(np.float32)
+    return xr.Dataset({'tmp2m': (('latitude', 'longitude'), data)},
+                      coords={'latitude': lats, 'longitude': lons})
+
+
+def make_hrrr_grid() -> xr.Dataset:
+    import pyproj
+    ny, nx = 1059, 1799
+    lcc = pyproj.CRS.from_proj4("+proj=lcc +lat_1=38.5 +lat_2=38.5 +lat_0=38.5 "
+                                "+lon_0=-97.5 +R=6371229 +units=m +no_defs")
+    to_ll = pyproj.Transformer.from_crs(lcc, "EPSG:4326", always_xy=True)
+    x = -2697520.0 + 3000.0 * np.arange(nx)
+    y = -1587306.0 + 3000.0 * np.arange(ny)
+    xx, yy = np.meshgrid(x, y)
+    lon2d, lat2d = to_ll.transform(xx, yy)
+    data = np.random.default_rng(1).normal(280, 10, (ny, nx)).astype(np.float32)
+    return xr.Dataset({'tmp2m': (('y', 'x'), data)},
+                      coords={'latitude': (('y', 'x'), lat2d), 'longitude': (('y', 'x'), lon2d % 360)})
+
+
+def legacy_latlon(ds, variable, stations):
+    values = {}
+    for s in stations:
+        lon = s.lon % 360 if s.lon < 0 else s.lon
+        values[s.id] = float(ds[variable].sel({'latitude': s.lat, 'longitude': lon}, method='nearest').values)
+    return values
+
+
+def legacy_kdtree(ds, variable, stations):
+    from scipy.spatial import cKDTree
+    lats = ds.coords['latitude'].values
+    lons = ds.coords['longitude'].values
+    tree = cKDTree(np.column_stack([lats.ravel(), lons.ravel()]))
+    values = {}
+    for s in stations:
+        lon = s.lon % 360 if s.lon < 0 else s.lon
+        _, idx = tree.query(np.array([[s.lat, lon]]), k=1)
+        iy, ix = np.unravel_index(idx[0], lats.shape)
+        values[s.id] = float(ds[variable].isel(y=iy, x=ix).values)
+    return values
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def run_case(name, ds, locator_cls, legacy_fn, stations):
+    t_legacy, legacy = timed(legacy_fn, ds, 'tmp2m', stations)
+
+    locator_cls._index_cache.clear()
+    t_cold, batch = timed(locator_cls().sample, ds, 'tmp2m', stations)
+    t_warm, _ = timed(locator_cls().sample, ds, 'tmp2m', stations)
+
+    mismatches = sum(1 for k, v in legacy.items() if batch.get(k) != v)
+    print(f"{name}: {len(stations)} stations")
+    print(f"  per-station : {t_legacy * 1000:9.1f} ms")
+    print(f"  batch cold  : {t_cold * 1000:9.1f} ms  ({t_legacy / t_cold:.0f}x)")
+    print(f"  batch warm  : {t_warm * 1000:9.1f} ms  ({t_legacy / t_warm:.0f}x)")
+    print(f"  mismatched values: {mismatches}")
+
+
+def main():
+    stations = list(StationCatalog.shared().get_table().stations)
+    run_case("GFS 0.25 deg (LatLon1DLocator)", make_gfs_grid(), LatLon1DLocator, legacy_latlon, stations)
+    run_case("HRRR 3 km (CurvilinearKDTreeLocator)", make_hrrr_grid(), CurvilinearKDTreeLocator, legacy_kdtree, stations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Replay a run's publish timeline against fixed and adaptive availability polling.
+
+Drives the scheduler's AvailabilityWatcher with a virtual clock: each forecast
+hour becomes visible at its recorded publish offset, hours found by a poll are
+rendered by a pool of workers taking a fixed time per hour, and the
+end-to-end latency from publish to PNG is measured per hour.
+
+Three policies are compared:
+  fixed     poll every --interval seconds (the previous behaviour)
+  cold      adaptive watcher with no learned latency (first run of a model)
+  learned   adaptive watcher after learning from one replay of the timeline
+
+The timeline is a JSON file {"model": "GFS", "hours": {"0": 12540, ...}} with
+publish offsets in seconds after run init. --record-s3 builds one from the
+LastModified times of a real run on the NOAA open-data bucket; without either
+option a GFS-like synthetic timeline is used.
+
+Usage:
+    python scripts/benchmarks/replay_availability.py
+    python scripts/benchmarks/replay_availability.py --record-s3 GFS:2026011600 --save gfs_00z.json
+    python scripts/benchmarks/replay_availability.py --timeline gfs_00z.json --render-s 45 --workers 4
+"""
+
+import argparse
+import heapq
+import json
+import random
+import re
+import statistics
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.services.availability import _S3_NS, run_listing
+from app.services.availability_watcher import AvailabilityWatcher, PublishLatency
+from app.services.http_downloader import get_downloader
+
+
+def synthetic_timeline(seed: int = 0) -> dict:
+    """GFS-like: f000 about 3 h 27 min after init, then roughly a minute per 3-hourly step."""
+    rng = random.Random(seed)
+    hours, t = {}, 3 * 3600 + 27 * 60
+    for fh in range(0, 385, 3):
+        if fh > 240 and fh % 12:
+            continue
+        hours[fh] = t
+        t += rng.uniform(40, 80) if fh < 120 else rng.uniform(60, 120)
+    return {"model": "GFS", "hours": hours}
+
+
+def record_s3(spec: str) -> dict:
+    """Timeline of a published run from its S3 LastModified times ("GFS:YYYYMMDDHH")."""
+    model_id, stamp = spec.split(":")
+    run_time = datetime.strptime(stamp, "%Y%m%d%H").replace(tzinfo=timezone.utc)
+    listing = run_listing(model_id, run_time)
+    if listing is None or listing.kind != "s3":
+        raise SystemExit(f"No S3 listing for {model_id}")
+
+    modified, params = {}, {"list-type": "2", "prefix": listing.prefix}
+    while True:
+        root = ET.fromstring(get_downloader().get_text(listing.url, params=params))
+        for item in root.iter(f"{_S3_NS}Contents"):
+            stamp = item.findtext(f"{_S3_NS}LastModified").replace("Z", "+00:00")
+            modified[item.findtext(f"{_S3_NS}Key")] = datetime.fromisoformat(stamp).timestamp()
+        token = root.findtext(f"{_S3_NS}NextContinuationToken")
+        if root.findtext(f"{_S3_NS}IsTruncated") != "true" or not token:
+            break
+        params = {**params, "continuation-token": token}
+
+    hours = {}
+    pattern = re.compile(listing.pattern)
+    for key, ts in modified.items():
+        match = pattern.match(key)
+        if match and f"{key}.idx" in modified:
+            # An hour is usable once both the data file and its index exist
+            hours[int(match.group(1))] = max(ts, modified[f"{key}.idx"]) - run_time.timestamp()
+    return {"model": model_id, "hours": dict(sorted(hours.items()))}
+
+
+def simulate(timeline: dict, interval_of, start: float, workers: int, render_s: float, watcher_factory=None):
+    """
+    Run one policy over the timeline.
+
+    Args:
+        interval_of: Callable(watcher) -> seconds until the next poll
+        start: Seconds after init when polling begins
+
+    Returns:
+        (publish -> PNG latencies, number of polls)
+    """
+    publish = {int(fh): float(t) for fh, t in timeline["hours"].items()}
+    now = [start]
+    run_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    run_ts = run_time.timestamp()
+
+    def probe(hours):
+        return {fh for fh in hours if publish[fh] <= now[0]}
+
+    watcher = watcher_factory(run_time, publish, probe, lambda: run_ts + now[0])
+    free_at = [start] * workers  # min-heap of worker free times
+    heapq.heapify(free_at)
+    waiting = set(publish)
+    done = {}
+    while waiting:
+        for fh in watcher.poll(sorted(waiting)):
+            begin = max(now[0], heapq.heappop(free_at))
+            heapq.heappush(free_at, begin + render_s)
+            done[fh] = begin + render_s
+            waiting.discard(fh)
+        if waiting:
+            now[0] += interval_of(watcher)
+    return [done[fh] - publish[fh] for fh in publish], watcher.polls
+
+
+def summarise(name: str, latencies, polls: int) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(f"  {name:8s}: mean {statistics.mean(latencies):6.1f} s  p95 {p95:6.1f} s  "
+          f"max {max(latencies):6.1f} s  polls {polls:4d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--timeline", help="Timeline JSON file")
+    parser.add_argument("--record-s3", metavar="MODEL:YYYYMMDDHH", help="Record a timeline from the NOAA bucket")
+    parser.add_argument("--save", help="Write the timeline used to this file")
+    parser.add_argument("--interval", type=float, default=60, help="Fixed poll interval / adaptive fallback (s)")
+    parser.add_argument("--min-interval", type=float, default=10, help="Adaptive poll interval once an hour is due (s)")
+    parser.add_argument("--max-interval", type=float, default=600, help="Longest adaptive sleep (s)")
+    parser.add_argument("--workers", type=int, default=4, help="Render workers")
+    parser.add_argument("--render-s", type=float, default=30, help="Seconds to build and render one hour")
+    parser.add_argument("--start-offset", type=float, default=3 * 3600, help="Polling starts this long after init (s)")
+    parser.add_argument("--jitter", type=float, default=30, help="Std-dev of publish jitter for the learned replay (s)")
+    args = parser.parse_args()
+
+    if args.record_s3:
+        timeline = record_s3(args.record_s3)
+    elif args.timeline:
+        timeline = json.loads(Path(args.timeline).read_text())
+    else:
+        timeline = synthetic_timeline()
+    if args.save:
+        Path(args.save).write_text(json.dumps(timeline, indent=1))
+
+    model_id = timeline["model"]
+    print(f"{model_id}: {len(timeline['hours'])} hours, {args.workers} workers x {args.render_s:.0f} s/hour, "
+          f"polling from +{args.start_offset / 60:.0f} min")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def factory(latency):
+            return lambda run_time, publish, probe, clock: AvailabilityWatcher(
+                model_id, run_time, publish, probe, args.interval, latency=latency,
+                min_interval=args.min_interval, max_interval=args.max_interval, clock=clock
+            )
+
+        fixed = simulate(timeline, lambda w: args.interval, args.start_offset, args.workers, args.render_s,
+                         factory(PublishLatency(Path(tmp) / "fixed.json")))
+        summarise("fixed", *fixed)
+
+        cold_latency = PublishLatency(Path(tmp) / "adaptive.json")
+        cold = simulate(timeline, lambda w: w.next_interval(), args.start_offset, args.workers, args.render_s,
+                        factory(cold_latency))
+        summarise("cold", *cold)
+
+        # Next run publishes on a similar but not identical schedule
+        rng = random.Random(1)
+        shifted = {"model": model_id,
+                   "hours": {fh: t + rng.gauss(0, args.jitter) for fh, t in timeline["hours"].items()}}
+        learned = simulate(shifted, lambda w: w.next_interval(), args.start_offset, args.workers, args.render_s,
+                           factory(cold_latency))
+        summarise("learned", *learned)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Round-trip check of the quantised field export encoding.
+
+Encodes synthetic values for every exported field with quantize() and
+decodes them with dequantize(): in-range values must come back within half
+a quantisation step, NaN must map to the nodata value and back, and values
+outside the representable range must clip to its ends (never to nodata).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+repo_root = Path(__file__).parents[2]
+sys.path.insert(0, str(repo_root / "backend"))
+
+from app.services.field_export import EXPORT_FIELDS, dequantize, quantize
+
+
+def check_field(field: str, dtype: str, offset: float, scale: float):
+    nodata = np.iinfo(dtype).max
+    low = offset
+    high = offset + scale * (nodata - 1)
+
+    # In range, including both representable ends
+    values = np.concatenate([np.linspace(low, high, 1001), [low, high]]).astype(np.float32)
+    q = quantize(values, dtype, offset, scale)
+    assert q.dtype == np.dtype(dtype).newbyteorder('<'), f"{field}: dtype {q.dtype}"
+    assert not np.any(q == nodata), f"{field}: in-range value encoded as nodata"
+    error = np.abs(dequantize(q, offset, scale) - values)
+    # Half a step plus float32 rounding of the decoded value
+    tolerance = 0.5 * scale + 1e-6 * max(abs(low), abs(high))
+    assert error.max() <= tolerance, f"{field}: round-trip error {error.max()} > {tolerance}"
+
+    # Nodata: NaN <-> dtype maximum
+    q = quantize(np.array([np.nan, low], dtype=np.float32), dtype, offset, scale)
+    assert q[0] == nodata and q[1] == 0, f"{field}: nodata encoded as {q.tolist()}"
+    decoded = dequantize(q, offset, scale)
+    assert np.isnan(decoded[0]) and not np.isnan(decoded[1]), f"{field}: nodata decoded as {decoded.tolist()}"
+
+    # Clip edges: out-of-range values clip to the range, not to nodata
+    q = quantize(np.array([low - 1000 * scale, high + 1000 * scale], dtype=np.float32), dtype, offset, scale)
+    assert q.tolist() == [0, nodata - 1], f"{field}: clipped to {q.tolist()}"
+    decoded = dequantize(q, offset, scale)
+    assert np.allclose(decoded, [low, high], rtol=1e-6, atol=scale), f"{field}: clip decoded as {decoded.tolist()}"
+
+    print(f"  ✓ {field:14s} {dtype:6s} range [{low:g}, {high:g}] step {scale:g}, max error {error.max():.3g}")
+
+
+def test_field_quantize():
+    """Round-trip every exported field's encoding."""
+    print("=" * 70)
+    print("TEST: Quantised field export round trip")
+    print("=" * 70)
+
+    for field, (dtype, offset, scale, _units) in EXPORT_FIELDS.items():
+        check_field(field, dtype, offset, scale)
+
+    print("✅ Success: all fields round-trip")
+
+
+if __name__ == "__main__":
+    test_field_quantize()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Synthetic checks of the H/L pressure-centre finder used by the MSLP maps.
+
+Runs every scenario on a 1D GFS-style 0.25 degree grid (0-360 longitudes)
+and on a 2D curvilinear HRRR-style ~3 km grid:
+
+- two centres: one high and one low are found where they were placed
+- prominence: a 1 hPa dip is dropped at the default threshold, kept below it
+- separation: of two lows closer than min_separation_km only the deeper is kept
+- label cap: max_per_kind keeps the strongest centres, strongest first
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+repo_root = Path(__file__).parents[2]
+sys.path.insert(0, str(repo_root / "backend"))
+
+from app.services.pressure_centers import REFERENCE_HPA, find_pressure_centers
+
+BOUNDS = {"west": -125.0, "east": -110.0, "south": 42.0, "north": 49.0}
+
+# Placed centres must be found within this many degrees
+TOLERANCE_DEG = 0.5
+
+
+def gfs_grid():
+    """1D axes, latitudes north to south and longitudes 0-360 like GFS GRIB."""
+    lat = np.arange(55.0, 35.0 - 0.01, -0.25)
+    lon = np.arange(220.0, 260.0 + 0.01, 0.25)
+    lon2d, lat2d = np.meshgrid(lon, lat)
+    return lat, lon, lat2d, np.where(lon2d > 180, lon2d - 360, lon2d)
+
+
+def hrrr_grid():
+    """2D curvilinear coordinates (rows and columns skewed against lat/lon)."""
+    i, j = np.meshgrid(np.arange(350), np.arange(650), indexing='ij')
+    lat2d = 38.0 + 0.03 * i + 0.004 * j
+    lon2d = -132.0 + 0.04 * j - 0.005 * i
+    return lat2d, lon2d, lat2d, lon2d
+
+
+def mslp(lat2d, lon2d, centres):
+    """Flat 1013 hPa plus Gaussian centres [(lat, lon, hPa anomaly, width in degrees)]."""
+    field = np.full(lat2d.shape, REFERENCE_HPA)
+    for lat0, lon0, anomaly, width in centres:
+        field += anomaly * np.exp(-((lat2d - lat0) / width) ** 2 - ((lon2d - lon0) / width) ** 2)
+    return field
+
+
+def found(centres, kind):
+    return [c for c in centres if c.kind == kind]
+
+
+def assert_near(centre, lat0, lon0, label):
+    assert abs(centre.lat - lat0) <= TOLERANCE_DEG and abs(centre.lon - lon0) <= TOLERANCE_DEG, \
+        f"{label}: found at ({centre.lat:.2f}, {centre.lon:.2f}), placed at ({lat0}, {lon0})"
+
+
+def check_grid(name, grid):
+    lat, lon, lat2d, lon2d = grid
+
+    # Two centres
+    values = mslp(lat2d, lon2d, [(46.0, -120.0, 12.0, 1.5), (44.0, -113.0, -15.0, 1.5)])
+    centres = find_pressure_centers(values, lat, lon, BOUNDS)
+    highs, lows = found(centres, 'H'), found(centres, 'L')
+    assert len(highs) == 1 and len(lows) == 1, f"{name} two centres: {centres}"
+    assert_near(highs[0], 46.0, -120.0, f"{name} high")
+    assert_near(lows[0], 44.0, -113.0, f"{name} low")
+    assert highs[0].value > 1024 and lows[0].value < 999, f"{name} values: {centres}"
+    print(f"  ✓ {name}: two centres H {highs[0].value:.1f} / L {lows[0].value:.1f} hPa")
+
+    # Prominence threshold
+    values = mslp(lat2d, lon2d, [(44.0, -122.0, -8.0, 1.0), (47.0, -112.0, -1.0, 1.0)])
+    lows = found(find_pressure_centers(values, lat, lon, BOUNDS), 'L')
+    assert len(lows) == 1, f"{name} prominence 2 hPa: {lows}"
+    assert_near(lows[0], 44.0, -122.0, f"{name} prominent low")
+    lows = found(find_pressure_centers(values, lat, lon, BOUNDS, min_prominence=0.5), 'L')
+    assert len(lows) == 2, f"{name} prominence 0.5 hPa: {lows}"
+    print(f"  ✓ {name}: 1 hPa dip dropped at 2 hPa prominence, kept at 0.5 hPa")
+
+    # Separation: lows about 310 km apart
+    values = mslp(lat2d, lon2d, [(45.0, -119.0, -10.0, 0.5), (45.0, -115.0, -8.0, 0.5)])
+    lows = found(find_pressure_centers(values, lat, lon, BOUNDS), 'L')
+    assert len(lows) == 1, f"{name} separation 600 km: {lows}"
+    assert_near(lows[0], 45.0, -119.0, f"{name} deeper low")
+    lows = found(find_pressure_centers(values, lat, lon, BOUNDS, min_separation_km=200.0), 'L')
+    assert len(lows) == 2, f"{name} separation 200 km: {lows}"
+    print(f"  ✓ {name}: lows 310 km apart merged at 600 km separation, both kept at 200 km")
+
+    # Label cap: four separated lows, strongest first
+    placed = [(43.0, -123.5, -12.0), (48.0, -123.5, -9.0), (43.0, -111.5, -6.0), (48.0, -111.5, -3.0)]
+    values = mslp(lat2d, lon2d, [(la, lo, anomaly, 0.8) for la, lo, anomaly in placed])
+    lows = found(find_pressure_centers(values, lat, lon, BOUNDS, min_separation_km=300.0), 'L')
+    assert len(lows) == 4, f"{name} uncapped: {lows}"
+    lows = found(find_pressure_centers(values, lat, lon, BOUNDS, min_separation_km=300.0, max_per_kind=2), 'L')
+    assert len(lows) == 2, f"{name} cap 2: {lows}"
+    assert_near(lows[0], 43.0, -123.5, f"{name} strongest low")
+    assert_near(lows[1], 48.0, -123.5, f"{name} second low")
+    print(f"  ✓ {name}: label cap keeps the 2 deepest of 4 lows, strongest first")
+
+
+def test_pressure_centers():
+    """Run the scenarios on both grid types."""
+    print("=" * 70)
+    print("TEST: H/L pressure-centre detection (GFS 1D and HRRR 2D grids)")
+    print("=" * 70)
+
+    check_grid("GFS 1D", gfs_grid())
+    check_grid("HRRR 2D", hrrr_grid())
+
+    print("✅ Success: pressure centres found on both grid types")
+
+
+if __name__ == "__main__":
+    test_pressure_centers()